@@ -0,0 +1,98 @@
+"""Benchmark long time series plotted via `ax.plot` and via `plot_decimated`.
+
+For each series length, a noisy signal is plotted into a single axes and saved
+as PDF and PNG, once with a plain `ax.plot` and once decimated to the output
+pixel budget with min-max and LTTB decimation. Wall time and file sizes are
+logged for all variants.
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.axes import Axes
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import plot_decimated
+from mpl_panel_builder.helpers.examples import get_logger
+
+logger = get_logger("bench_decimate")
+
+PlotFunction = Callable[[Axes, np.ndarray, np.ndarray], None]
+
+
+def _plot_full(ax: Axes, x: np.ndarray, y: np.ndarray) -> None:
+    """Plot all samples."""
+    ax.plot(x, y, linewidth=0.5)
+
+
+def _plot_minmax(ax: Axes, x: np.ndarray, y: np.ndarray) -> None:
+    """Plot samples decimated with min-max decimation."""
+    plot_decimated(ax, x, y, method="minmax", linewidth=0.5)
+
+
+def _plot_lttb(ax: Axes, x: np.ndarray, y: np.ndarray) -> None:
+    """Plot samples decimated with LTTB decimation."""
+    plot_decimated(ax, x, y, method="lttb", linewidth=0.5)
+
+
+def _run(
+    plot: PlotFunction, x: np.ndarray, y: np.ndarray, output_dir: Path
+) -> tuple[float, float, float]:
+    """Create, populate and save a panel as PDF and PNG.
+
+    Returns:
+        Tuple of (seconds, PDF size in MB, PNG size in MB).
+    """
+    start = time.perf_counter()
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    plot(axs[0][0], x, y)
+    sizes = []
+    for fmt in ["pdf", "png"]:
+        mpb.configure({"output": {"format": fmt}})
+        mpb.save_panel(fig, str(output_dir / "panel"))
+        sizes.append((output_dir / f"panel.{fmt}").stat().st_size / 1e6)
+    plt.close(fig)
+    seconds = time.perf_counter() - start
+    return seconds, sizes[0], sizes[1]
+
+
+def main() -> None:
+    """Run the benchmark for all requested series lengths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--n-samples", type=int, nargs="+", default=[10**6, 10**7],
+        help="Series lengths",
+    )
+    args = parser.parse_args()
+
+    mpb.configure({
+        "panel": {"dimensions": {"width_cm": 10, "height_cm": 6}},
+        "output": {"dpi": 600},
+    })
+    rng = np.random.default_rng(0)
+    variants: list[tuple[str, PlotFunction]] = [
+        ("ax.plot", _plot_full), ("minmax", _plot_minmax), ("lttb", _plot_lttb)
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_samples in args.n_samples:
+            x = np.arange(n_samples, dtype=float)
+            y = np.sin(x / n_samples * 40) + 0.3 * rng.standard_normal(n_samples)
+            for name, plot in variants:
+                seconds, pdf_mb, png_mb = _run(plot, x, y, Path(tmp_dir))
+                logger.info(
+                    f"{n_samples:>9} samples {name:>7}: {seconds:7.2f} s, "
+                    f"PDF {pdf_mb:7.2f} MB, PNG {png_mb:5.2f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark colormapped images drawn via `imshow` and via `add_lut_image`.
+
+For each image size, the same random float32 heatmap is shown with a colorbar
+and saved as PNG and PDF, once with a plain `imshow` and once with the uint8
+lookup table fast path. Wall time and the peak memory traced by `tracemalloc`
+are logged for both variants.
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.cm import ScalarMappable
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import add_colorbar, add_lut_image
+from mpl_panel_builder.helpers.examples import get_logger
+
+logger = get_logger("bench_lut_image")
+
+
+def _show_imshow(ax: Axes, data: np.ndarray) -> ScalarMappable:
+    """Show data with a plain imshow."""
+    return ax.imshow(data, cmap="viridis")
+
+
+def _show_lut(ax: Axes, data: np.ndarray) -> ScalarMappable:
+    """Show data through the uint8 lookup table fast path."""
+    _, mappable = add_lut_image(ax, data, cmap="viridis")
+    return mappable
+
+
+def _run(
+    show: Callable[[Axes, np.ndarray], ScalarMappable],
+    data: np.ndarray,
+    output_dir: Path,
+) -> tuple[float, float]:
+    """Create, populate and save a panel in PNG and PDF format.
+
+    Returns:
+        Tuple of (seconds, peak memory in MB).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    ax = axs[0][0]
+    mappable = show(ax, data)
+    add_colorbar(ax, mappable, "right")
+    for fmt in ["png", "pdf"]:
+        mpb.configure({"output": {"format": fmt}})
+        mpb.save_panel(fig, str(output_dir / "panel"))
+    plt.close(fig)
+
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6
+
+
+def main() -> None:
+    """Run the benchmark for all requested image sizes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[4096, 16384],
+        help="Image side lengths in pixels",
+    )
+    args = parser.parse_args()
+
+    mpb.configure({
+        "panel": {"dimensions": {"width_cm": 8, "height_cm": 6}},
+        "output": {"dpi": 300},
+    })
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            data = rng.random((size, size), dtype=np.float32)
+            for name, show in [("imshow", _show_imshow), ("lut", _show_lut)]:
+                seconds, peak_mb = _run(show, data, Path(tmp_dir))
+                logger.info(
+                    f"{size}x{size} {name:>6}: {seconds:7.2f} s, "
+                    f"peak memory {peak_mb:8.1f} MB"
+                )
+            del data
+
+
+if __name__ == "__main__":
+    main()
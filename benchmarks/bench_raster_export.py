@@ -0,0 +1,86 @@
+"""Benchmark raster export options on the panels of the repository's examples.
+
+The example scripts are run as they are, but each figure they save is
+instead rendered once and encoded from the RGBA buffer with each of the
+`output.raster` settings below, into memory. Total encoded size and encode
+time per setting are logged relative to the default PNG. The examples create
+their output directories under `outputs/`, but no panel files are written
+there.
+"""
+
+import argparse
+import io
+import runpy
+import time
+from typing import Any
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.helpers.examples import get_logger, get_repo_root
+from mpl_panel_builder.output import encode_raster
+
+logger = get_logger("bench_raster_export")
+
+# Name -> (format, encode_raster options)
+SETTINGS: dict[str, tuple[str, dict[str, Any]]] = {
+    "png (default)": ("png", {}),
+    "png truecolor": ("png", {"palette_max_colors": 0}),
+    "png quantized": ("png", {"palette_max_error": 16}),
+    "png rgb": ("png", {"alpha": False}),
+    "png level 1": ("png", {"compress_level": 1}),
+    "png level 9 optimize": ("png", {"compress_level": 9, "optimize": True}),
+    "webp lossless": ("webp", {"webp_lossless": True}),
+    "webp lossy q90": ("webp", {"quality": 90}),
+}
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dpi", type=float, default=600, help="Raster dpi")
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="Encodes per panel and setting"
+    )
+    args = parser.parse_args()
+
+    # Setting -> [bytes, seconds]
+    totals: dict[str, list[float]] = {name: [0, 0] for name in SETTINGS}
+
+    def encode_all(fig: Figure, *_: Any, **__: Any) -> None:
+        """Encode a panel of an example with each setting."""
+        rgba = mpb.render_panel_rgba(fig, dpi=args.dpi)
+        for name, (fmt, options) in SETTINGS.items():
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                buffer = io.BytesIO()
+                encode_raster(rgba, buffer, fmt, args.dpi, **options)
+            totals[name][0] += buffer.tell()
+            totals[name][1] += (time.perf_counter() - start) / args.repeats
+        plt.close(fig)
+
+    save_panel = mpb.save_panel
+    mpb.save_panel = encode_all
+    try:
+        for script in sorted(
+            (get_repo_root() / "examples").glob("*/create_panels.py")
+        ):
+            runpy.run_path(str(script), run_name="__main__")
+    finally:
+        mpb.save_panel = save_panel
+
+    base_size, base_seconds = totals["png (default)"]
+    for name, (size, seconds) in totals.items():
+        logger.info(
+            f"{name:<22} {size / 1e3:8.1f} kB ({size / base_size:5.2f}x) "
+            f"{seconds * 1e3:8.1f} ms ({seconds / base_seconds:5.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark saving dense panels as PDF with and without auto-rasterization.
+
+A 2 x 2 panel with a dense scatter plot, a long line and filled areas, plus
+titles and labels, is saved as PDF once as pure vector output and once with
+`output.rasterize_threshold` set. File size and save time are logged,
+together with the rasterized artists and their estimated vector size.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.helpers.examples import get_logger
+
+logger = get_logger("bench_rasterize")
+
+
+def _create_figure(n_points: int) -> Figure:
+    """Create a 2 x 2 panel with dense scatter, line and fill artists."""
+    rng = np.random.default_rng(0)
+    fig, axs = mpb.create_panel(rows=2, cols=2)
+    axs[0][0].scatter(
+        rng.standard_normal(n_points), rng.standard_normal(n_points), s=1
+    )
+    axs[0][1].plot(np.cumsum(rng.standard_normal(n_points)), linewidth=0.5)
+    x = np.arange(n_points // 10)
+    y = np.cumsum(rng.standard_normal(x.size))
+    axs[1][0].fill_between(x, y - 5, y + 5, alpha=0.5)
+    axs[1][1].plot([0, 1], [0, 1])
+    for row in axs:
+        for ax in row:
+            ax.set_title("Title", fontsize=6)
+            ax.set_xlabel("x")
+    return fig
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--n-points", type=int, default=500_000, help="Points per dense artist"
+    )
+    parser.add_argument(
+        "--threshold", type=int, default=10_000, help="Rasterize threshold"
+    )
+    args = parser.parse_args()
+
+    mpb.configure({
+        "panel": {"dimensions": {"width_cm": 18, "height_cm": 12}},
+        "output": {"format": "pdf", "dpi": 600},
+    })
+    fig = _create_figure(args.n_points)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {}
+        for threshold in [0, args.threshold]:
+            mpb.configure({"output": {"rasterize_threshold": threshold}})
+            path = Path(tmp_dir) / f"panel_{threshold}.pdf"
+            start = time.perf_counter()
+            report = mpb.save_panel(fig, str(path))
+            elapsed = time.perf_counter() - start
+            results[threshold] = (path.stat().st_size / 1e6, elapsed, report)
+    plt.close(fig)
+
+    for threshold, (size_mb, elapsed, report) in results.items():
+        logger.info(
+            f"threshold {threshold:>8}: {size_mb:8.2f} MB {elapsed:8.2f} s"
+        )
+        for entry in report["rasterized"]:
+            logger.info(
+                f"  {entry['label']:<40} {entry['elements']:>9} elements, "
+                f"~{entry['vector_bytes_estimate'] / 1e6:.1f} MB as vectors"
+            )
+
+
+if __name__ == "__main__":
+    main()
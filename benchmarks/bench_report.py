@@ -0,0 +1,98 @@
+"""Benchmark writing a many-page PDF report with PanelReport and PdfPages.
+
+The same small panel, with a line, scatter points, text and an image, is
+written as every page of a PDF report, once with matplotlib's `PdfPages` and
+once with `PanelReport`. Each run happens in a fresh process, whose peak
+resident memory is logged after the first tenth of the pages and at the end,
+together with the wall time (the memory is read with `resource`, so the
+benchmark runs on Unix only). `PdfPages` keeps every image until the file
+is closed, so its peak grows with the number of pages, while `PanelReport`
+writes the images of each page with the page.
+"""
+
+import argparse
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.helpers.examples import get_logger
+
+logger = get_logger("bench_report")
+
+
+def _create_figure(rng: np.random.Generator) -> Figure:
+    """Create a small panel with a line, points, text and an image."""
+    fig, axs = mpb.create_panel(rows=1, cols=2)
+    axs[0][0].plot(np.cumsum(rng.standard_normal(200)), linewidth=0.5)
+    axs[0][0].scatter(rng.random(20) * 200, rng.standard_normal(20), s=2)
+    axs[0][0].set_title("Recording", fontsize=6)
+    axs[0][1].imshow(rng.random((64, 64)))
+    return fig
+
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident memory of this process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def _run(writer: str, path: Path, n_pages: int) -> tuple[float, float, float]:
+    """Write n_pages pages, return the early and final peak memory and time."""
+    mpb.configure({"output": {"dpi": 150}})
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    early_peak = 0.0
+    if writer == "PdfPages":
+        with PdfPages(path) as pdf:
+            for page in range(n_pages):
+                fig = _create_figure(rng)
+                pdf.savefig(fig, dpi=150)
+                plt.close(fig)
+                if page + 1 == max(n_pages // 10, 1):
+                    early_peak = _peak_rss_mb()
+    else:
+        with mpb.PanelReport(path) as report:
+            for page in range(n_pages):
+                report.add(_create_figure(rng))
+                if page + 1 == max(n_pages // 10, 1):
+                    early_peak = _peak_rss_mb()
+    return early_peak, _peak_rss_mb(), time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--n-pages", type=int, default=10_000, help="Number of report pages"
+    )
+    args = parser.parse_args()
+
+    results: dict[str, tuple[float, float, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for writer in ["PdfPages", "PanelReport"]:
+            # A fresh process per writer, so that the peak memory is its own
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                results[writer] = executor.submit(
+                    _run, writer, Path(tmp_dir) / f"{writer}.pdf", args.n_pages
+                ).result()
+
+    logger.info(f"{args.n_pages} pages, peak memory after 10 % and 100 %")
+    for name, (early_peak, peak, elapsed) in results.items():
+        logger.info(
+            f"{name:<12} {early_peak:8.1f} MB {peak:8.1f} MB {elapsed:8.1f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark saving panels synchronously and with a background writer.
+
+Each panel needs some data preparation (a smoothed random walk per axes)
+before it is plotted and saved as PNG. The panels are saved once with
+`save_panel`, which blocks until the file is written, and once with
+`save_panel_async`, which saves them in a background thread while the next
+panel is prepared. The overlap is largest when the preparation releases the
+GIL, as numpy and file I/O do.
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.helpers.examples import get_logger
+
+logger = get_logger("bench_save_async")
+
+
+def _create_figure(rng: np.random.Generator, n_samples: int) -> Figure:
+    """Prepare the data of a 2 x 2 panel and plot it."""
+    fig, axs = mpb.create_panel(rows=2, cols=2)
+    kernel = np.hanning(501)
+    for row in axs:
+        for ax in row:
+            walk = np.cumsum(rng.standard_normal(n_samples))
+            smooth = np.convolve(walk, kernel / kernel.sum(), mode="same")
+            ax.plot(smooth[:: n_samples // 2000], linewidth=0.5)
+    return fig
+
+
+def _run(
+    n_panels: int, n_samples: int, save: Callable[[Figure, str], object]
+) -> float:
+    """Create and save n_panels panels and return the wall time."""
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(n_panels):
+            save(_create_figure(rng, n_samples), str(Path(tmp_dir) / f"p{i}"))
+        mpb.flush_async_saves()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--n-panels", type=int, default=20, help="Number of panels"
+    )
+    parser.add_argument(
+        "--n-samples", type=int, default=2_000_000, help="Samples per axes"
+    )
+    args = parser.parse_args()
+
+    mpb.configure({"output": {"format": "png", "dpi": 300}})
+
+    def save_sync(fig: Figure, filepath: str) -> None:
+        mpb.save_panel(fig, filepath)
+        plt.close(fig)
+
+    sync = _run(args.n_panels, args.n_samples, save_sync)
+    background = _run(args.n_panels, args.n_samples, mpb.save_panel_async)
+
+    logger.info(f"{args.n_panels} panels")
+    logger.info(f"save_panel:       {sync:6.2f} s")
+    logger.info(f"save_panel_async: {background:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark saving a panel in several formats with one or several calls.
+
+A grid of axes with lines, scatter points, text and an image is saved as PDF,
+SVG, PNG and JPEG, once with one `fig.savefig` call per format (as
+`save_panel` did before it accepted several formats) and once with a single
+`save_panel` call listing all formats. Wall time and the per-file timings of
+the single call are logged.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.helpers.examples import get_logger
+
+logger = get_logger("bench_save_formats")
+
+FORMATS = ["pdf", "svg", "png", "jpg"]
+
+
+def _create_figure(n_axes: int) -> Figure:
+    """Create an n_axes x n_axes panel with lines, points, text and images."""
+    rng = np.random.default_rng(0)
+    fig, axs = mpb.create_panel(rows=n_axes, cols=n_axes)
+    for row in axs:
+        for ax in row:
+            ax.plot(np.cumsum(rng.standard_normal(500)), linewidth=0.5)
+            ax.scatter(rng.random(200) * 500, rng.standard_normal(200) * 10, s=1)
+            ax.set_title("Title", fontsize=6)
+            ax.set_xlabel("Time (s)")
+    axs[0][0].imshow(rng.random((200, 200)), extent=(0, 500, -20, 20))
+    return fig
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--n-axes", type=int, default=4, help="Number of axes rows and columns"
+    )
+    args = parser.parse_args()
+
+    mpb.configure({
+        "panel": {"dimensions": {"width_cm": 18, "height_cm": 18}},
+        "output": {"dpi": 300},
+    })
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fig = _create_figure(args.n_axes)
+        start = time.perf_counter()
+        for fmt in FORMATS:
+            fig.savefig(Path(tmp_dir) / f"separate.{fmt}", dpi=300, format=fmt)
+        separate = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = mpb.save_panel(
+            fig, str(Path(tmp_dir) / "combined"), formats=FORMATS
+        )
+        combined = time.perf_counter() - start
+        plt.close(fig)
+
+    logger.info(f"fig.savefig per format: {separate:6.2f} s")
+    logger.info(f"save_panel for all:     {combined:6.2f} s")
+    for file, seconds in report["timings"].items():
+        logger.info(f"  {Path(file).suffix:>5}: {seconds:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark saving a poster-size PNG with and without tiled rendering.
+
+A poster panel with a grid of axes holding lines, scatter points, text and
+images is saved as PNG once from a full Agg render and once with
+`output.tile_height_px` set, i.e. rendered in strips by worker processes and
+streamed into the file. Each save happens in a fresh process, whose peak
+resident memory and that of its largest worker process are logged together
+with the wall time and file size (the memory is read with `resource`, so the
+benchmark runs on Unix only).
+"""
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+from matplotlib.figure import Figure
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.helpers.examples import get_logger
+
+logger = get_logger("bench_tiled")
+
+
+def _create_figure(width_cm: float, height_cm: float) -> Figure:
+    """Create a poster panel with a grid of lines, points and images."""
+    mpb.configure({
+        "panel": {"dimensions": {"width_cm": width_cm, "height_cm": height_cm}},
+    })
+    rng = np.random.default_rng(0)
+    fig, axs = mpb.create_panel(rows=4, cols=4)
+    for i, row in enumerate(axs):
+        for j, ax in enumerate(row):
+            if (i + j) % 2:
+                ax.imshow(rng.random((256, 256)))
+            else:
+                ax.plot(np.cumsum(rng.standard_normal(2000)), linewidth=0.5)
+                ax.scatter(rng.random(200) * 2000, rng.standard_normal(200) * 20)
+            ax.set_title(f"Panel {i}, {j}")
+            ax.set_xlabel("x")
+    return fig
+
+
+def _run(
+    path: Path, args: argparse.Namespace, tile_height_px: int
+) -> tuple[float, float, float, float]:
+    """Save the poster, return peak memory of saver and workers, time, size."""
+    fig = _create_figure(args.width_cm, args.height_cm)
+    mpb.configure({"output": {
+        "dpi": args.dpi,
+        "tile_height_px": tile_height_px,
+        "tile_workers": args.workers,
+    }})
+    start = time.perf_counter()
+    mpb.save_panel(fig, str(path), formats=["png"])
+    elapsed = time.perf_counter() - start
+    return (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1e3,
+        elapsed,
+        path.stat().st_size / 1e6,
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width-cm", type=float, default=100, help="Width")
+    parser.add_argument("--height-cm", type=float, default=80, help="Height")
+    parser.add_argument("--dpi", type=float, default=300, help="Raster dpi")
+    parser.add_argument(
+        "--tile-height-px", type=int, default=512, help="Rows per strip"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Worker processes",
+    )
+    args = parser.parse_args()
+
+    results: dict[str, tuple[float, float, float, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, tile_height_px in [
+            ("full", 0), ("tiled", args.tile_height_px)
+        ]:
+            # A fresh process per save, so that the peak memory is its own
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                results[name] = executor.submit(
+                    _run, Path(tmp_dir) / f"{name}.png", args, tile_height_px
+                ).result()
+
+    logger.info(
+        f"{args.width_cm:g} x {args.height_cm:g} cm at {args.dpi:g} dpi, "
+        f"{args.workers} workers, peak memory of saver and largest worker"
+    )
+    for name, (peak, worker_peak, elapsed, size_mb) in results.items():
+        logger.info(
+            f"{name:<6} {peak:8.1f} MB {worker_peak:8.1f} MB "
+            f"{elapsed:8.1f} s {size_mb:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark plotting many traces via `ax.plot` and via `plot_traces`.
+
+For each number of traces, random walks are plotted into a single axes and
+saved as PDF, once with one `ax.plot` call per trace and once as a single line
+collection with `plot_traces`. Wall time and PDF size are logged for both
+variants.
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.axes import Axes
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import plot_traces
+from mpl_panel_builder.helpers.examples import get_logger
+
+logger = get_logger("bench_traces")
+
+
+def _plot_loop(ax: Axes, data: np.ndarray) -> None:
+    """Plot one Line2D per trace."""
+    x = np.arange(data.shape[1])
+    for trace in data:
+        ax.plot(x, trace, color="C0", linewidth=0.5, alpha=0.2)
+
+
+def _plot_collection(ax: Axes, data: np.ndarray) -> None:
+    """Plot all traces as a single line collection."""
+    plot_traces(ax, data, colors="C0", linewidths=0.5, alpha=0.2)
+
+
+def _run(
+    plot: Callable[[Axes, np.ndarray], None], data: np.ndarray, path: Path
+) -> tuple[float, float]:
+    """Create, populate and save a panel as PDF.
+
+    Returns:
+        Tuple of (seconds, file size in MB).
+    """
+    start = time.perf_counter()
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    plot(axs[0][0], data)
+    mpb.save_panel(fig, str(path))
+    plt.close(fig)
+    seconds = time.perf_counter() - start
+    return seconds, path.stat().st_size / 1e6
+
+
+def main() -> None:
+    """Run the benchmark for all requested trace counts."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--n-traces", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+        help="Numbers of traces to plot",
+    )
+    parser.add_argument(
+        "--n-samples", type=int, default=200, help="Number of samples per trace"
+    )
+    parser.add_argument(
+        "--max-loop", type=int, default=10000,
+        help="Largest number of traces to also plot with one ax.plot per trace",
+    )
+    args = parser.parse_args()
+
+    mpb.configure({"output": {"format": "pdf"}})
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "panel.pdf"
+        for n_traces in args.n_traces:
+            data = np.cumsum(rng.standard_normal((n_traces, args.n_samples)), axis=1)
+            variants: list[tuple[str, Callable[[Axes, np.ndarray], None]]] = [
+                ("collection", _plot_collection)
+            ]
+            if n_traces <= args.max_loop:
+                variants.insert(0, ("ax.plot", _plot_loop))
+            for name, plot in variants:
+                seconds, size_mb = _run(plot, data, path)
+                logger.info(
+                    f"{n_traces:>6} traces {name:>10}: {seconds:7.2f} s, "
+                    f"{size_mb:7.2f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark vector slimming on the panels of the repository's examples.
+
+The example scripts are run as they are, but each figure they save is
+instead written as PDF and SVG to a temporary directory, once as is and once
+with `output.vector_tolerance_mm` set. Total file size and write time per
+format are logged. The examples create their output directories under
+`outputs/`, but no panel files are written there.
+"""
+
+import argparse
+import runpy
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.helpers.examples import get_logger, get_repo_root
+
+logger = get_logger("bench_vector_slimming")
+
+FORMATS = ["pdf", "svg"]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tolerance-mm", type=float, default=0.01, help="Vector tolerance in mm"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=10, help="Saves per panel and setting"
+    )
+    args = parser.parse_args()
+
+    # (tolerance, format) -> [bytes, seconds]
+    totals: dict[tuple[float, str], list[float]] = {
+        (tolerance, fmt): [0, 0]
+        for tolerance in [0, args.tolerance_mm] for fmt in FORMATS
+    }
+    save_panel = mpb.save_panel
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        def save_both(fig: Figure, filepath: str, *_: Any, **__: Any) -> None:
+            """Save a panel of an example with and without slimming."""
+            name = Path(filepath).stem
+            for tolerance in [0, args.tolerance_mm]:
+                mpb.configure({"output": {"vector_tolerance_mm": tolerance}})
+                for fmt in FORMATS:
+                    path = Path(tmp_dir) / f"{name}_{tolerance}"
+                    start = time.perf_counter()
+                    for _ in range(args.repeats):
+                        report = save_panel(fig, str(path), formats=[fmt])
+                    elapsed = (time.perf_counter() - start) / args.repeats
+                    totals[tolerance, fmt][0] += Path(
+                        report["files"][0]
+                    ).stat().st_size
+                    totals[tolerance, fmt][1] += elapsed
+            mpb.configure({"output": {"vector_tolerance_mm": 0}})
+            plt.close(fig)
+
+        mpb.save_panel = save_both
+        try:
+            for script in sorted(
+                (get_repo_root() / "examples").glob("*/create_panels.py")
+            ):
+                runpy.run_path(str(script), run_name="__main__")
+        finally:
+            mpb.save_panel = save_panel
+
+    for (tolerance, fmt), (size, seconds) in totals.items():
+        logger.info(
+            f"{fmt} tolerance {tolerance:5.3f} mm: {size / 1e3:8.1f} kB "
+            f"{seconds * 1e3:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,45 @@
 """MPL Panel Builder - Simplified function-based API."""
 
 from . import features
+from .cache import RenderCache
 from .config import (
     configure,
     get_config,
     print_template_config,
     reset_config,
 )
-from .panel import create_panel, create_stacked_panel, save_panel, set_rc_style
+from .facet import facet
+from .panel import (
+    PanelWriter,
+    create_panel,
+    create_stacked_panel,
+    flush_async_saves,
+    render_panel,
+    render_panel_rgba,
+    save_panel,
+    save_panel_async,
+    set_rc_style,
+)
+from .report import PanelReport
 
 __version__ = "2.0.0"
 
 __all__ = [
+    'PanelReport',
+    'PanelWriter',
+    'RenderCache',
     'configure',
     'create_panel',
     'create_stacked_panel',
+    'facet',
     'features',
+    'flush_async_saves',
     'get_config',
     'print_template_config',
+    'render_panel',
+    'render_panel_rgba',
     'reset_config',
     'save_panel',
+    'save_panel_async',
     'set_rc_style'
 ]
\ No newline at end of file
@@ -0,0 +1,356 @@
+"""Content-addressed cache of saved panels."""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+import uuid
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+
+from .config import get_config
+from .output import SaveReport, get_target_paths, write_if_changed
+from .panel import save_panel
+
+# Temporary entries older than this are left over by crashed processes
+_STALE_TMP_SECONDS = 3600
+
+
+class RenderCache:
+    """Local cache that skips re-rendering panels whose inputs are unchanged.
+
+    `save_panel` calls a plotting function that creates a figure, saves it
+    with `mpb.save_panel` and stores the files in the cache directory. The
+    files are stored under a key that combines:
+
+    - the current configuration, including `style.rc_params`,
+    - the versions of mpl-panel-builder and matplotlib,
+    - a fingerprint of the arguments of the plotting function,
+    - the source code of the plotting function,
+    - the save arguments (debug, formats, profile and metadata).
+
+    When a later call has the same key, the cached files are copied to the
+    requested path instead of calling the plotting function. Only the source
+    of the plotting function itself is part of the key, so changes to helper
+    functions it calls are not detected; clear the cache after such changes.
+
+    Entries are written to a temporary directory and renamed into place, so
+    several processes can share a cache directory. The least recently used
+    entries are removed when the cache exceeds `max_size_mb`.
+
+    Example:
+        cache = mpb.RenderCache(".panel_cache")
+
+        def plot_trace(trace):
+            fig, axs = mpb.create_panel()
+            axs[0][0].plot(trace)
+            return fig
+
+        cache.save_panel(plot_trace, "panels/trace", trace)
+    """
+
+    def __init__(self, directory: str | Path, max_size_mb: float = 1024) -> None:
+        """Opens or creates a cache directory.
+
+        Args:
+            directory: Directory holding the cache entries.
+            max_size_mb: Maximum total size of the entries in MB. Defaults
+                to 1024.
+
+        Raises:
+            OSError: If the directory cannot be created
+        """
+        self.directory = Path(directory)
+        self.max_size_mb = max_size_mb
+        self.hits = 0
+        self.misses = 0
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise OSError(
+                f"Could not create cache directory {self.directory}: {e}"
+            ) from e
+
+    def save_panel(
+        self,
+        plot: Callable[..., Figure],
+        filepath: str,
+        *args: Any,
+        debug: bool | None = None,
+        formats: Sequence[str | tuple[str, float]] | None = None,
+        profile: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> SaveReport:
+        """Saves the panel created by plot(*args, **kwargs), or its cached copy.
+
+        On a cache miss, the figure returned by `plot` is saved with
+        `mpb.save_panel`, closed and stored in the cache. On a hit, `plot`
+        is not called and the cached files are copied to the requested path.
+
+        Args:
+            plot: Function creating the figure of the panel.
+            filepath: Path of the saved panel, as for `mpb.save_panel`.
+            *args: Positional arguments of plot.
+            debug: Whether to include the debug gridlines, as for
+                `mpb.save_panel`.
+            formats: Formats to save, as for `mpb.save_panel`.
+            profile: Name of a profile in `output.profiles`, as for
+                `mpb.save_panel`.
+            metadata: Metadata of the saved files, as for `mpb.save_panel`.
+            **kwargs: Keyword arguments of plot.
+
+        Returns:
+            The report of `mpb.save_panel`. On a hit, the images are those of
+            the cached save, the timings are the time spent copying, and
+            files that already held the cached contents are listed as
+            unchanged.
+
+        Raises:
+            ValueError: If filepath contains parent directory references (..)
+            OSError: If file or directory operations fail
+        """
+        if '..' in filepath:
+            raise ValueError(
+                f"Path contains parent directory references ('..'): {filepath}. "
+                "This could be unsafe."
+            )
+        key = self.key(plot, args, kwargs, debug, formats, profile, metadata)
+        entry = self.directory / key
+        report = self._load(entry, Path(filepath))
+        if report is not None:
+            self.hits += 1
+            return report
+
+        self.misses += 1
+        fig = plot(*args, **kwargs)
+        try:
+            report = save_panel(
+                fig,
+                filepath,
+                debug=debug,
+                formats=formats,
+                profile=profile,
+                metadata=metadata,
+            )
+        finally:
+            plt.close(fig)
+        self._store(entry, report)
+        self._evict()
+        return report
+
+    def key(
+        self,
+        plot: Callable[..., Any],
+        args: Sequence[Any] = (),
+        kwargs: Mapping[str, Any] | None = None,
+        debug: bool | None = None,
+        formats: Sequence[str | tuple[str, float]] | None = None,
+        profile: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> str:
+        """Returns the cache key of a panel.
+
+        Args:
+            plot: Function creating the figure of the panel.
+            args: Positional arguments of plot. Defaults to ().
+            kwargs: Keyword arguments of plot. Defaults to None.
+            debug: The debug argument of `save_panel`. Defaults to None.
+            formats: The formats argument of `save_panel`. Defaults to None.
+            profile: The profile argument of `save_panel`. Defaults to None.
+            metadata: The metadata argument of `save_panel`. Defaults to
+                None.
+
+        Returns:
+            Hexadecimal SHA-256 digest.
+        """
+        from . import __version__
+
+        settings = json.dumps(
+            {
+                'config': get_config(),
+                'versions': [__version__, matplotlib.__version__],
+                'save': [debug, formats, profile, metadata],
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        digest = hashlib.sha256(settings.encode())
+        digest.update(fingerprint(list(args), dict(kwargs or {})).encode())
+        digest.update(_source(plot).encode())
+        return digest.hexdigest()
+
+    def clear(self) -> None:
+        """Removes all cache entries."""
+        for entry in self.directory.iterdir():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def _load(self, entry: Path, path: Path) -> SaveReport | None:
+        """Restores the files of a cache entry, or returns None on a miss.
+
+        As in `save_panel`, files already holding the cached contents are
+        not rewritten and are reported as unchanged.
+        """
+        try:
+            manifest = json.loads((entry / "manifest.json").read_text())
+            target_paths = get_target_paths(path, manifest['formats'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Entries of older versions may lack the later report fields
+            report: SaveReport = {
+                'files': [], 'images': manifest.get('images', []),
+                'rasterized': manifest.get('rasterized', []), 'timings': {},
+                'unchanged': [],
+            }
+            for i, (fmt, target_path) in enumerate(
+                zip(manifest['formats'], target_paths, strict=True)
+            ):
+                start = time.perf_counter()
+                data = (entry / f"{i}.{fmt}").read_bytes()
+                if not write_if_changed(target_path, data):
+                    report['unchanged'].append(str(target_path))
+                report['files'].append(str(target_path))
+                report['timings'][str(target_path)] = time.perf_counter() - start
+            # The modification time of the entry orders the LRU eviction
+            os.utime(entry)
+        except (OSError, ValueError, KeyError):
+            # Missing, incomplete or concurrently evicted entries are misses
+            return None
+        return report
+
+    def _store(self, entry: Path, report: SaveReport) -> None:
+        """Stores the saved files as a cache entry."""
+        tmp = self.directory / f".tmp-{uuid.uuid4().hex}"
+        try:
+            tmp.mkdir()
+            formats: list[str] = []
+            for i, file in enumerate(report['files']):
+                fmt = Path(file).suffix.lstrip('.').lower()
+                shutil.copyfile(file, tmp / f"{i}.{fmt}")
+                formats.append(fmt)
+            (tmp / "manifest.json").write_text(
+                json.dumps({
+                    'formats': formats,
+                    'images': report['images'],
+                    'rasterized': report['rasterized'],
+                })
+            )
+            try:
+                os.rename(tmp, entry)
+            except OSError:
+                # An entry stored by another process meanwhile is kept, but
+                # an invalid one, e.g. left incomplete, is replaced
+                if _is_valid(entry):
+                    raise
+                shutil.rmtree(entry, ignore_errors=True)
+                os.rename(tmp, entry)
+        except OSError:
+            # Caching is best effort, the panel itself is saved
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the cache fits."""
+        entries: list[tuple[float, int, Path]] = []
+        now = time.time()
+        for entry in self.directory.iterdir():
+            try:
+                mtime = entry.stat().st_mtime
+                if entry.name.startswith('.tmp-'):
+                    if now - mtime > _STALE_TMP_SECONDS:
+                        shutil.rmtree(entry, ignore_errors=True)
+                    continue
+                size = sum(file.stat().st_size for file in entry.iterdir())
+            except OSError:
+                continue
+            entries.append((mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size_mb * 1e6:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+def _is_valid(entry: Path) -> bool:
+    """Returns whether a cache entry has a manifest and all its files."""
+    try:
+        manifest = json.loads((entry / "manifest.json").read_text())
+        return all(
+            (entry / f"{i}.{fmt}").is_file()
+            for i, fmt in enumerate(manifest['formats'])
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def fingerprint(*objects: Any) -> str:
+    """Returns a hash of the contents of arrays, tables and other objects.
+
+    NumPy arrays are hashed from their raw buffer together with their dtype
+    and shape, which is fast also for large arrays. pandas DataFrames and
+    Series are hashed column by column from their arrays and index. Lists,
+    tuples and dicts are hashed recursively, and other objects by their
+    repr.
+
+    Args:
+        *objects: Objects to hash.
+
+    Returns:
+        Hexadecimal BLAKE2b digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for obj in objects:
+        _update(digest, obj)
+    return digest.hexdigest()
+
+
+def _update(digest: "hashlib.blake2b", obj: Any) -> None:
+    """Adds an object to a hash, see `fingerprint`."""
+    digest.update(type(obj).__name__.encode())
+    if isinstance(obj, np.ndarray):
+        array: np.ndarray[Any, Any] = obj
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        if array.dtype.hasobject:
+            for item in array.ravel():
+                _update(digest, item)
+        else:
+            digest.update(np.ascontiguousarray(array).data)
+    elif isinstance(obj, list | tuple):
+        for item in obj:  # pyright: ignore[reportUnknownVariableType]
+            _update(digest, item)
+    elif isinstance(obj, dict):
+        for item_key, item in sorted(
+            obj.items(),  # pyright: ignore[reportUnknownArgumentType]
+            key=lambda pair: repr(pair[0]),  # pyright: ignore[reportUnknownLambdaType]
+        ):
+            _update(digest, item_key)
+            _update(digest, item)
+    elif hasattr(obj, "columns") and hasattr(obj, "iloc"):
+        _update(digest, obj.index.to_numpy())
+        for column in obj.columns:
+            _update(digest, column)
+            _update(digest, obj[column].to_numpy())
+    elif hasattr(obj, "to_numpy") and hasattr(obj, "index"):
+        _update(digest, obj.index.to_numpy())
+        _update(digest, obj.to_numpy())
+    else:
+        digest.update(repr(obj).encode())
+
+
+def _source(func: Callable[..., Any]) -> str:
+    """Returns the source of a function, or its bytecode if unavailable."""
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        code = getattr(func, "__code__", None)
+        if code is None:
+            return repr(func)
+        return repr((code.co_code, code.co_consts, code.co_names))
@@ -1,5 +1,8 @@
 """Simple global configuration system."""
 
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
 from typing import Any, TypedDict, cast
 
 
@@ -36,6 +39,7 @@ class ScalebarConfig(TypedDict):
 class ColorbarConfig(TypedDict):
     width_cm: float
     separation_cm: float
+    raster_solids: bool
 
 class AnnotationConfig(TypedDict):
     margin_cm: float
@@ -51,6 +55,8 @@ class LabelConfig(TypedDict):
 
 class GridlinesConfig(TypedDict):
     resolution_cm: float
+    ruler: bool
+    ruler_major_cm: float
 
 class FeaturesConfig(TypedDict):
     scalebar: ScalebarConfig
@@ -59,9 +65,26 @@ class FeaturesConfig(TypedDict):
     label: LabelConfig
     gridlines: GridlinesConfig
 
+class RasterConfig(TypedDict):
+    alpha: bool
+    palette_max_colors: int
+    palette_max_error: int
+    compress_level: int
+    optimize: bool
+    webp_lossless: bool
+    quality: int
+
 class OutputConfig(TypedDict):
     format: str
     dpi: int
+    resample_images: str
+    rasterize_threshold: int
+    vector_tolerance_mm: float
+    deterministic: bool
+    raster: RasterConfig
+    tile_height_px: int
+    tile_workers: int
+    profiles: dict[str, list[dict[str, Any]]]
 
 class Config(TypedDict):
     panel: PanelConfig
@@ -85,21 +108,34 @@ _default_config = {
             'separation_cm': 0.2, 'offset_cm': 0.2, 'text_offset_cm': 0.1,
             'line_width_pt': 1.5
         },
-        'colorbar': {'width_cm': 0.3, 'separation_cm': 0.2},
+        'colorbar': {'width_cm': 0.3, 'separation_cm': 0.2, 'raster_solids': False},
         'annotation': {'margin_cm': 0.2},
         'label': {
             'x_cm': 0.5, 'y_cm': 0.5, 'bold': True, 'caps': True,
             'prefix': '', 'suffix': '', 'fontsize_pt': 10
         },
-        'gridlines': {'resolution_cm': 0.5}
+        'gridlines': {'resolution_cm': 0.5, 'ruler': False, 'ruler_major_cm': 1.0}
     },
     'output': {
         'format': 'pdf',
-        'dpi': 600
+        'dpi': 600,
+        'resample_images': 'none',
+        'rasterize_threshold': 0,
+        'vector_tolerance_mm': 0.0,
+        'deterministic': False,
+        'raster': {
+            'alpha': True, 'palette_max_colors': 256, 'palette_max_error': 0,
+            'compress_level': 6, 'optimize': False, 'webp_lossless': False,
+            'quality': 75
+        },
+        'tile_height_px': 0,
+        'tile_workers': 0,
+        'profiles': {}
     },
 }
 
 _config = _default_config.copy()
+_local = threading.local()
 
 def configure(config_dict: dict[str, Any]) -> None:
     """Configure the package with user settings.
@@ -118,7 +154,25 @@ def configure(config_dict: dict[str, Any]) -> None:
 
 def get_config() -> Config:
     """Get current configuration."""
-    return cast(Config, _config)
+    config = getattr(_local, "config", None)
+    return cast(Config, _config if config is None else config)
+
+@contextmanager
+def use_config(config: Config) -> Generator[None, None, None]:
+    """Use a configuration in the current thread only.
+
+    Background saves use this to work from the configuration as it was when
+    the figure was submitted, whatever the main thread configures meanwhile.
+
+    Args:
+        config: Configuration returned by `get_config`, typically a copy.
+    """
+    previous = getattr(_local, "config", None)
+    _local.config = config
+    try:
+        yield
+    finally:
+        _local.config = previous
 
 def reset_config() -> None:
     """Reset to default configuration."""
@@ -197,10 +251,11 @@ def _merge_config(base: dict[str, Any], updates: dict[str, Any]) -> Config:
             if key not in result:
                 raise KeyError(f"Configuration key '{key}' is not valid")
 
-            if key in ["rc_params"]:
-                # Special handling: merge rc_params without validation
-                # as we don't want to specify every possible rc_param
-                # and since rcParams validate keys at runtime.
+            if key in ["rc_params", "profiles"]:
+                # Special handling: merge rc_params and output profiles 
+                # without validation as we don't want to specify every 
+                # possible rc_param or profile name, and since rcParams 
+                # validate keys at runtime.
                 result[key].update(val)
             elif isinstance(val, dict) and isinstance(result[key], dict):
                 result[key] = _recursive_merge(result[key], val)
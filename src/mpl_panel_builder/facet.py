@@ -0,0 +1,118 @@
+"""Faceted panel creation from tabular data."""
+
+from collections.abc import Callable, Mapping
+from typing import Any
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from numpy.typing import NDArray
+
+from .panel import create_panel
+
+
+def facet(
+    data: Any,
+    row: str | None = None,
+    col: str | None = None,
+    plot: Callable[[Axes, Any, Any, Any], None] | None = None,
+) -> tuple[Figure, list[list[Axes]]]:
+    """Creates a panel with one axes per combination of facet keys.
+
+    The table is sorted once by the facet keys, after which the rows of each
+    cell are one contiguous slice. `plot` receives each non-empty cell as a
+    view of the sorted table, so faceting takes a single sort instead of one
+    boolean mask per cell. The grid is created with `create_panel`, with one
+    axes row per unique value of `row` and one axes column per unique value
+    of `col`, both in sorted order.
+
+    Args:
+        data: The table, as a NumPy structured array, a dict mapping column
+            names to equally long arrays, or a pandas DataFrame.
+        row: Column whose unique values define the axes rows. Defaults to
+            None, i.e. a single row.
+        col: Column whose unique values define the axes columns. Defaults to
+            None, i.e. a single column.
+        plot: Function called as `plot(ax, cell, row_value, col_value)` for
+            each non-empty cell, where cell has the same type as data (a
+            structured array, a dict of arrays, or a DataFrame) and the
+            values are None for unused keys. Defaults to None.
+
+    Returns:
+        Tuple of (figure, axes_grid)
+
+    Raises:
+        KeyError: If row or col is not a column of data.
+        ValueError: If the columns of a dict have different lengths.
+    """
+    n = _table_length(data)
+    row_values, row_codes = _factorize(data, row, n)
+    col_values, col_codes = _factorize(data, col, n)
+    n_cells = len(row_values) * len(col_values)
+    codes = row_codes * len(col_values) + col_codes
+    if n_cells <= np.iinfo(np.uint16).max:
+        # NumPy sorts 16-bit integers stably with a linear-time radix sort
+        codes = codes.astype(np.uint16)
+    order = np.argsort(codes, kind="stable")
+    # Start of each cell in the sorted table, plus the total length
+    bounds = np.searchsorted(
+        codes[order], np.arange(n_cells + 1)
+    )
+    sorted_data = _take(data, order)
+
+    fig, axs = create_panel(rows=len(row_values), cols=len(col_values))
+    if plot is not None:
+        for i, row_value in enumerate(row_values):
+            for j, col_value in enumerate(col_values):
+                cell = i * len(col_values) + j
+                start, stop = int(bounds[cell]), int(bounds[cell + 1])
+                if stop > start:
+                    plot(
+                        axs[i][j],
+                        _slice(sorted_data, start, stop),
+                        None if row is None else row_value,
+                        None if col is None else col_value,
+                    )
+    return fig, axs
+
+
+def _table_length(data: Any) -> int:
+    """Returns the number of rows of a structured array, dict, or DataFrame."""
+    if isinstance(data, Mapping):
+        lengths = {len(v) for v in data.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns must have the same length, got {lengths}")
+        return lengths.pop() if lengths else 0
+    return len(data)
+
+
+def _factorize(
+    data: Any, key: str | None, n: int
+) -> tuple[list[Any], NDArray[np.intp]]:
+    """Returns the sorted unique values of a column and each row's index."""
+    if key is None:
+        return [None], np.zeros(n, dtype=np.intp)
+    names = (data.dtype.names or ()) if isinstance(data, np.ndarray) else data
+    if key not in names:
+        raise KeyError(f"Facet key {key!r} is not a column of data")
+    values, codes = np.unique(np.asarray(data[key]), return_inverse=True)
+    return values.tolist(), codes.astype(np.intp).ravel()
+
+
+def _take(data: Any, order: NDArray[np.intp]) -> Any:
+    """Returns the table reordered by order, with the same type as data."""
+    if isinstance(data, np.ndarray):
+        return data[order]
+    if isinstance(data, Mapping):
+        return {k: np.asarray(v)[order] for k, v in data.items()}
+    # pandas.DataFrame, without importing pandas
+    return data.iloc[order]
+
+
+def _slice(data: Any, start: int, stop: int) -> Any:
+    """Returns a view of the rows [start, stop) of the sorted table."""
+    if isinstance(data, np.ndarray):
+        return data[start:stop]
+    if isinstance(data, dict):
+        return {k: v[start:stop] for k, v in data.items()}
+    return data.iloc[start:stop]
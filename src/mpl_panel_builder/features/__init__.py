@@ -1,16 +1,39 @@
 """Feature functions for panel building."""
 
 from .annotation import add_annotation
-from .colorbar import add_colorbar
+from .colorbar import add_colorbar, add_shared_colorbar
+from .decimate import plot_decimated
+from .density import plot_density_scatter
 from .gridlines import draw_gridlines
+from .histogram import plot_histograms
+from .image import add_lut_image
+from .image_pyramid import ImagePyramid, show_image_pyramid
 from .label import add_label
+from .legend import add_shared_legend
+from .matrix import annotate_matrix
+from .raster import plot_raster
 from .scalebar import draw_x_scale_bar, draw_y_scale_bar
+from .series_pyramid import MinMaxPyramid, plot_pyramid
+from .traces import plot_traces
 
 __all__ = [
+    'ImagePyramid',
+    'MinMaxPyramid',
     'add_annotation',
     'add_colorbar',
     'add_label',
+    'add_lut_image',
+    'add_shared_colorbar',
+    'add_shared_legend',
+    'annotate_matrix',
     'draw_gridlines',
     'draw_x_scale_bar',
-    'draw_y_scale_bar'
+    'draw_y_scale_bar',
+    'plot_decimated',
+    'plot_density_scatter',
+    'plot_histograms',
+    'plot_pyramid',
+    'plot_raster',
+    'plot_traces',
+    'show_image_pyramid',
 ]
\ No newline at end of file
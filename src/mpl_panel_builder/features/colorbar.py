@@ -1,10 +1,16 @@
 """Colorbar functionality."""
 
-from typing import Literal
+from collections.abc import Sequence
+from typing import Literal, cast
 
+import numpy as np
 from matplotlib.axes import Axes
 from matplotlib.cm import ScalarMappable
 from matplotlib.colorbar import Colorbar
+from matplotlib.colors import BoundaryNorm
+from matplotlib.contour import ContourSet
+from matplotlib.figure import Figure, SubFigure
+from matplotlib.transforms import Bbox
 
 from ..config import get_config
 from ..helpers.mpl import adjust_axes_size, cm_to_fig_rel
@@ -40,7 +46,30 @@ def calculate_colorbar_position(
     if fig is None:
         raise ValueError("Axes must be attached to a figure")
     
-    ax_pos = ax.get_position()
+    return _calculate_rect_next_to_bbox(
+        fig, ax.get_position(), position, width_cm, separation_cm
+    )
+
+def _calculate_rect_next_to_bbox(
+    fig: Figure | SubFigure,
+    bbox: Bbox,
+    position: Literal["left", "right", "bottom", "top"],
+    width_cm: float,
+    separation_cm: float
+) -> tuple[float, float, float, float]:
+    """Calculate a colorbar rectangle next to a bbox in figure coordinates.
+    
+    Args:
+        fig: The figure the bbox belongs to.
+        bbox: The bbox, in relative figure coordinates, to place the colorbar
+            next to.
+        position: The position of the colorbar relative to the bbox.
+        width_cm: The width of the colorbar in centimeters.
+        separation_cm: The separation between bbox and colorbar in centimeters.
+        
+    Returns:
+        Tuple of (x, y, width, height) in relative coordinates.
+    """
     is_vertical = position in ["left", "right"]
     dimension_type: Literal["width", "height"] = "width" if is_vertical else "height"
     
@@ -49,30 +78,30 @@ def calculate_colorbar_position(
     
     if position == "left":
         return (
-            ax_pos.x0 - sep_rel - width_rel,
-            ax_pos.y0,
+            bbox.x0 - sep_rel - width_rel,
+            bbox.y0,
             width_rel,
-            ax_pos.height
+            bbox.height
         )
     elif position == "right":
         return (
-            ax_pos.x0 + ax_pos.width + sep_rel,
-            ax_pos.y0,
+            bbox.x0 + bbox.width + sep_rel,
+            bbox.y0,
             width_rel,
-            ax_pos.height
+            bbox.height
         )
     elif position == "bottom":
         return (
-            ax_pos.x0,
-            ax_pos.y0 - sep_rel - width_rel,
-            ax_pos.width,
+            bbox.x0,
+            bbox.y0 - sep_rel - width_rel,
+            bbox.width,
             width_rel
         )
-    elif position == "top":
+    else:  # "top"
         return (
-            ax_pos.x0,
-            ax_pos.y0 + ax_pos.height + sep_rel,
-            ax_pos.width,
+            bbox.x0,
+            bbox.y0 + bbox.height + sep_rel,
+            bbox.width,
             width_rel
         )
 
@@ -80,7 +109,8 @@ def add_colorbar(
     ax: Axes,
     mappable: ScalarMappable, 
     position: Literal["left", "right", "bottom", "top"],
-    shrink_axes: bool = True
+    shrink_axes: bool = True,
+    raster_solids: bool | None = None,
 ) -> Colorbar:
     """Add a colorbar adjacent to the given axes.
 
@@ -94,6 +124,9 @@ def add_colorbar(
         position: The position of the colorbar relative to the axes.
         shrink_axes: Whether to shrink the original axes to make room for
             the colorbar. Defaults to True.
+        raster_solids: Whether to draw the color gradient as one image at the
+            output dpi in vector files, see `_create_colorbar`. Defaults to
+            `features.colorbar.raster_solids` from the config.
 
     Returns:
         The created colorbar object.
@@ -125,6 +158,179 @@ def add_colorbar(
         colorbar_config['separation_cm']
     )
     
+    if raster_solids is None:
+        raster_solids = colorbar_config['raster_solids']
+    return _create_colorbar(
+        fig, mappable, position_rect, position, raster_solids
+    )
+
+def add_shared_colorbar(
+    axs: Sequence[Axes],
+    position: Literal["left", "right", "bottom", "top"],
+    mappables: ScalarMappable | Sequence[ScalarMappable] | None = None,
+    raster_solids: bool | None = None,
+) -> Colorbar:
+    """Add one colorbar shared by several axes, e.g. a row, column or grid.
+
+    The colorbar spans the bounding box of all given axes. The host axes are 
+    never resized, so the space for the colorbar should be reserved up front 
+    by creating the panel with a colorbar position, e.g. 
+    `create_panel(rows, cols, colorbar="right")`. Mappables with identical 
+    colormap and norm are deduplicated into a single colorbar.
+
+    Args:
+        axs: The axes sharing the colorbar, e.g. `axs[0]` for the first row, 
+            `[row[0] for row in axs]` for the first column, or all axes of 
+            the grid.
+        position: The position of the colorbar relative to the axes.
+        mappables: The mappable(s) to create the colorbar for. Defaults to 
+            all images and colormapped collections found in `axs`.
+        raster_solids: Whether to draw the color gradient as one image at the
+            output dpi in vector files. Defaults to 
+            `features.colorbar.raster_solids` from the config.
+
+    Returns:
+        The created colorbar object.
+
+    Raises:
+        ValueError: If position is not one of "left", "right", "bottom", "top",
+            if no axes or mappables are given, or if the mappables do not share 
+            the same colormap and norm.
+    """
+    valid_positions = ["left", "right", "bottom", "top"]
+    if position not in valid_positions:
+        raise ValueError(
+            f"Invalid position: {position!r}. Must be one of: {valid_positions!r}."
+        )
+    if len(axs) == 0:
+        raise ValueError("At least one axes must be given")
+    
+    fig = axs[0].get_figure()
+    if fig is None:
+        raise ValueError("Axes must be attached to a figure")
+    
+    if mappables is None:
+        mappables = [
+            mappable for ax in axs for mappable in _get_axes_mappables(ax)
+        ]
+    elif isinstance(mappables, ScalarMappable):
+        mappables = [mappables]
+    
+    unique_mappables = deduplicate_mappables(mappables)
+    if len(unique_mappables) == 0:
+        raise ValueError("No mappables found to create a colorbar for")
+    if len(unique_mappables) > 1:
+        raise ValueError(
+            f"Found {len(unique_mappables)} different colormap and norm "
+            "combinations. A shared colorbar requires that all mappables use "
+            "the same colormap and norm."
+        )
+    
+    config = get_config()
+    colorbar_config = config['features']['colorbar']
+    
+    bbox = Bbox.union([ax.get_position() for ax in axs])
+    position_rect = _calculate_rect_next_to_bbox(
+        fig,
+        bbox,
+        position,
+        colorbar_config['width_cm'],
+        colorbar_config['separation_cm']
+    )
+    
+    if raster_solids is None:
+        raster_solids = colorbar_config['raster_solids']
+    return _create_colorbar(
+        fig, unique_mappables[0], position_rect, position, raster_solids
+    )
+
+def deduplicate_mappables(
+    mappables: Sequence[ScalarMappable]
+) -> list[ScalarMappable]:
+    """Return one mappable per unique colormap and norm combination.
+
+    Two mappables are considered identical if they use equal colormaps and 
+    norms of the same type that map a set of sample values identically.
+
+    Args:
+        mappables: The mappables to deduplicate.
+
+    Returns:
+        The first mappable of each unique colormap and norm combination, in 
+        the order they were given.
+    """
+    unique_mappables: list[ScalarMappable] = []
+    for mappable in mappables:
+        if not any(
+            _same_color_mapping(mappable, unique) for unique in unique_mappables
+        ):
+            unique_mappables.append(mappable)
+    return unique_mappables
+
+def _same_color_mapping(a: ScalarMappable, b: ScalarMappable) -> bool:
+    """Check whether two mappables map data values to the same colors."""
+    if a.cmap is not b.cmap and a.cmap != b.cmap:
+        return False
+    if a.norm is b.norm:
+        return True
+    if type(a.norm) is not type(b.norm):
+        return False
+    
+    a.autoscale_None()
+    b.autoscale_None()
+    if (a.norm.vmin, a.norm.vmax) != (b.norm.vmin, b.norm.vmax):
+        return False
+    if isinstance(a.norm, BoundaryNorm) and isinstance(b.norm, BoundaryNorm):
+        return np.array_equal(a.norm.boundaries, b.norm.boundaries)
+    
+    # Compare the norms on sample values to also capture norm parameters 
+    # such as gamma or linthresh
+    vmin, vmax = cast(float, a.norm.vmin), cast(float, a.norm.vmax)
+    samples = np.linspace(vmin, vmax, 17)
+    return bool(np.allclose(
+        np.ma.filled(a.norm(samples), np.nan),
+        np.ma.filled(b.norm(samples), np.nan),
+        equal_nan=True,
+    ))
+
+def _get_axes_mappables(ax: Axes) -> list[ScalarMappable]:
+    """Return all images and colormapped collections of an axes."""
+    mappables: list[ScalarMappable] = list(ax.images)
+    mappables.extend(
+        collection for collection in ax.collections
+        if collection.get_array() is not None
+    )
+    return mappables
+
+def _create_colorbar(
+    fig: Figure | SubFigure,
+    mappable: ScalarMappable,
+    position_rect: tuple[float, float, float, float],
+    position: Literal["left", "right", "bottom", "top"],
+    raster_solids: bool = False,
+) -> Colorbar:
+    """Create a colorbar in the given rectangle with position-based ticks.
+
+    Matplotlib rasterizes the solids of colorbars with at least 
+    `Colorbar.n_rasterize` color steps and draws one vector patch per step 
+    otherwise. With raster_solids, the solids of continuous norms are always 
+    rasterized, also after the colorbar is updated, so vector files embed the 
+    gradient as one image at the savefig dpi. The solids of discrete 
+    colorbars (BoundaryNorm, filled contours, or explicit boundaries) are 
+    instead always kept as vector patches to keep their edges exact. The 
+    outline, ticks and labels stay vector in both cases.
+
+    Args:
+        fig: The figure to add the colorbar axes to.
+        mappable: The mappable to create the colorbar for.
+        position_rect: Tuple of (x, y, width, height) in relative coordinates.
+        position: The position of the colorbar relative to its axes.
+        raster_solids: Whether to control the rasterization of the solids as 
+            described above. Defaults to False, i.e. the Matplotlib default.
+
+    Returns:
+        The created colorbar object.
+    """
     cbar_ax = fig.add_axes(position_rect)
     
     # Determine orientation based on position
@@ -133,6 +339,17 @@ def add_colorbar(
     # Create the colorbar
     cbar = fig.colorbar(mappable, cax=cbar_ax, orientation=orientation)
     
+    if raster_solids:
+        discrete = (
+            isinstance(cbar.norm, BoundaryNorm)
+            or isinstance(mappable, ContourSet)
+            or cbar.boundaries is not None
+        )
+        # Applies whenever the colorbar recreates its solids
+        cbar.n_rasterize = np.iinfo(np.int64).max if discrete else 0
+        if cbar.solids is not None:
+            cbar.solids.set_rasterized(not discrete)
+    
     # Configure colorbar based on position
     if position == "left":
         # Move ticks and labels to the left
@@ -0,0 +1,160 @@
+"""Decimated line plot functionality for long time series."""
+
+from typing import Any, Literal
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.lines import Line2D
+from numpy.typing import ArrayLike, NDArray
+
+from ..config import get_config
+from ..helpers.mpl import axes_size_px
+
+
+def plot_decimated(
+    ax: Axes,
+    x: ArrayLike,
+    y: ArrayLike,
+    method: Literal["minmax", "lttb"] = "minmax",
+    **kwargs: Any,
+) -> Line2D:
+    """Plot a long time series decimated to the output pixel budget.
+
+    The pixel budget is the axes width in output pixels, which follows from
+    the axes width in cm and the configured `output.dpi`. With "minmax", the
+    samples of each pixel column are reduced to their minimum and maximum,
+    which looks the same as plotting all samples. With "lttb", the series is
+    reduced to two points per pixel column with the
+    Largest-Triangle-Three-Buckets algorithm, which keeps the visual shape
+    while producing fewer vertices.
+
+    The line is decimated again for the visible range whenever the x limits
+    change, e.g. after a later `ax.set_xlim` or an interactive zoom.
+
+    Args:
+        ax: The axes to plot in.
+        x: The sample positions, sorted in ascending order. Regular sampling
+            is assumed when assigning samples to pixel columns.
+        y: The sample values.
+        method: The decimation method, "minmax" or "lttb". Defaults to
+            "minmax".
+        **kwargs: Additional keyword arguments passed to `ax.plot`.
+
+    Returns:
+        The line showing the decimated series.
+
+    Raises:
+        ValueError: If method is not "minmax" or "lttb", or if x and y have
+            different shapes.
+    """
+    valid_methods = ["minmax", "lttb"]
+    if method not in valid_methods:
+        raise ValueError(
+            f"Invalid method: {method!r}. Must be one of: {valid_methods!r}."
+        )
+    x = np.asanyarray(x)
+    y = np.asanyarray(y)
+    if x.ndim != 1 or x.shape != y.shape:
+        raise ValueError(
+            f"x and y must be 1D with the same shape, got {x.shape} and {y.shape}"
+        )
+
+    config = get_config()
+    n_px = axes_size_px(ax, config['output']['dpi'])[0]
+
+    def _decimate(i0: int, i1: int) -> tuple[NDArray[Any], NDArray[Any]]:
+        """Decimate the samples in [i0, i1) to the pixel budget."""
+        x_window, y_window = np.asarray(x[i0:i1]), np.asarray(y[i0:i1])
+        if method == "minmax":
+            return decimate_minmax(x_window, y_window, n_px)
+        return decimate_lttb(x_window, y_window, 2 * n_px)
+
+    (line,) = ax.plot(*_decimate(0, len(x)), **kwargs)
+
+    def _on_xlim_changed(changed_ax: Axes) -> None:
+        """Decimate the visible range, keeping one sample beyond each side."""
+        x0, x1 = sorted(changed_ax.get_xlim())
+        i0 = max(int(np.searchsorted(x, x0, side="left")) - 1, 0)
+        i1 = min(int(np.searchsorted(x, x1, side="right")) + 1, len(x))
+        line.set_data(*_decimate(i0, i1))
+
+    ax.callbacks.connect("xlim_changed", _on_xlim_changed)
+    return line
+
+
+def decimate_minmax(
+    x: NDArray[Any], y: NDArray[Any], n_bins: int
+) -> tuple[NDArray[Any], NDArray[Any]]:
+    """Reduce a series to the minimum and maximum sample of each bin.
+
+    The samples are split into `n_bins` bins of equal sample count. The first
+    and last sample are always kept, and the kept samples stay in order.
+
+    Args:
+        x: The sample positions.
+        y: The sample values.
+        n_bins: The number of bins, e.g. the number of pixel columns.
+
+    Returns:
+        Tuple of (x, y) with at most 2 * n_bins + 2 samples.
+    """
+    n = len(y)
+    if n <= 2 * n_bins + 2:
+        return x, y
+
+    bin_size = n // n_bins
+    n_binned = bin_size * n_bins
+    bins = y[:n_binned].reshape(n_bins, bin_size)
+    starts = np.arange(n_bins) * bin_size
+    indices = [
+        np.array([0]),
+        np.sort(np.column_stack((
+            starts + bins.argmin(axis=1), starts + bins.argmax(axis=1)
+        )), axis=1).ravel(),
+    ]
+    if n_binned < n:
+        # Remaining samples form one additional, shorter bin
+        rest = y[n_binned:]
+        indices.append(np.sort(n_binned + np.array([rest.argmin(), rest.argmax()])))
+    indices.append(np.array([n - 1]))
+    keep = np.unique(np.concatenate(indices))
+    return x[keep], y[keep]
+
+
+def decimate_lttb(
+    x: NDArray[Any], y: NDArray[Any], n_out: int
+) -> tuple[NDArray[Any], NDArray[Any]]:
+    """Reduce a series with the Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+        x: The sample positions.
+        y: The sample values.
+        n_out: The number of samples to keep, at least 3.
+
+    Returns:
+        Tuple of (x, y) with n_out samples, or the input if it is shorter.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    x_float = x.astype(float)
+    y_float = y.astype(float)
+    # Bucket edges for the n - 2 inner samples split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # The average of the next bucket is the third triangle vertex
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        c_x = x_float[stop:next_stop].mean()
+        c_y = y_float[stop:next_stop].mean()
+        areas = np.abs(
+            (x_float[a] - c_x) * (y_float[start:stop] - y_float[a])
+            - (x_float[a] - x_float[start:stop]) * (c_y - y_float[a])
+        )
+        a = start + int(areas.argmax())
+        keep[i + 1] = a
+    return x[keep], y[keep]
@@ -0,0 +1,152 @@
+"""Density scatter plot functionality."""
+
+from typing import Any
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import PathCollection
+from matplotlib.colors import Colormap, Normalize
+from matplotlib.image import AxesImage
+from numpy.typing import ArrayLike, NDArray
+
+from ..config import get_config
+from ..helpers.mpl import axes_size_px
+
+
+def plot_density_scatter(
+    ax: Axes,
+    x: ArrayLike,
+    y: ArrayLike,
+    threshold: int = 100_000,
+    xlim: tuple[float, float] | None = None,
+    ylim: tuple[float, float] | None = None,
+    cmap: str | Colormap = "viridis",
+    norm: Normalize | None = None,
+    chunk_size: int = 2**22,
+    **kwargs: Any,
+) -> AxesImage | PathCollection:
+    """Plot a scatter plot as a point density image at the output resolution.
+
+    The points are binned directly to the axes' pixel grid, which follows from
+    the axes size and the configured `output.dpi`, and rendered as one image
+    in which each pixel shows the number of points falling into it. Empty
+    pixels are transparent. The points are processed `chunk_size` at a time
+    to bound memory, so memory-mapped inputs are streamed.
+
+    Below `threshold` points, the exact points are plotted with `ax.scatter`
+    instead.
+
+    Args:
+        ax: The axes to plot in.
+        x: The x coordinates of the points.
+        y: The y coordinates of the points.
+        threshold: Minimum number of points for which a density image is
+            rendered. Defaults to 100,000.
+        xlim: The x range to show. Defaults to the range of x.
+        ylim: The y range to show. Defaults to the range of y.
+        cmap: The colormap for the point counts. Defaults to "viridis".
+        norm: The norm for the point counts, e.g. a LogNorm. Defaults to a
+            linear norm spanning the counts.
+        chunk_size: Number of points to bin at a time. Defaults to 2**22.
+        **kwargs: Additional keyword arguments passed to `ax.imshow`, or to
+            `ax.scatter` below the threshold.
+
+    Returns:
+        The density image, usable as mappable for `add_colorbar`, or the
+        scatter collection below the threshold.
+
+    Raises:
+        ValueError: If x and y have different shapes.
+    """
+    x = np.asanyarray(x).ravel()
+    y = np.asanyarray(y).ravel()
+    if x.shape != y.shape:
+        raise ValueError(
+            f"x and y must have the same shape, got {x.shape} and {y.shape}"
+        )
+
+    if len(x) < threshold:
+        return ax.scatter(x, y, **kwargs)
+
+    if xlim is None:
+        xlim = _finite_range(x, chunk_size)
+    if ylim is None:
+        ylim = _finite_range(y, chunk_size)
+
+    config = get_config()
+    width_px, height_px = axes_size_px(ax, config['output']['dpi'])
+    counts = bin_points(
+        x, y, xlim, ylim, (height_px, width_px), chunk_size
+    )
+
+    image = ax.imshow(
+        np.ma.masked_equal(counts, 0),
+        extent=(xlim[0], xlim[1], ylim[0], ylim[1]),
+        origin="lower",
+        aspect="auto",
+        interpolation="none",
+        cmap=cmap,
+        norm=norm,
+        **kwargs,
+    )
+    ax.set(xlim=xlim, ylim=ylim)
+    return image
+
+
+def bin_points(
+    x: NDArray[Any],
+    y: NDArray[Any],
+    xlim: tuple[float, float],
+    ylim: tuple[float, float],
+    shape: tuple[int, int],
+    chunk_size: int = 2**22,
+) -> NDArray[np.int64]:
+    """Count points per cell of a regular grid, processing them in chunks.
+
+    Points outside the limits or with non-finite coordinates are ignored.
+    Points on the upper limits are counted in the last cell.
+
+    Args:
+        x: The x coordinates of the points.
+        y: The y coordinates of the points.
+        xlim: The x range covered by the grid.
+        ylim: The y range covered by the grid.
+        shape: The grid shape as (rows, columns), rows along y.
+        chunk_size: Number of points to bin at a time. Defaults to 2**22.
+
+    Returns:
+        Array of point counts with the given shape, row 0 at ylim[0].
+    """
+    n_rows, n_cols = shape
+    counts = np.zeros(n_rows * n_cols, dtype=np.int64)
+    x_scale = n_cols / (xlim[1] - xlim[0])
+    y_scale = n_rows / (ylim[1] - ylim[0])
+    for start in range(0, len(x), chunk_size):
+        chunk_x = np.asarray(x[start:start + chunk_size], dtype=float)
+        chunk_y = np.asarray(y[start:start + chunk_size], dtype=float)
+        valid = (
+            (chunk_x >= xlim[0]) & (chunk_x <= xlim[1])
+            & (chunk_y >= ylim[0]) & (chunk_y <= ylim[1])
+        )
+        col = ((chunk_x[valid] - xlim[0]) * x_scale).astype(np.intp)
+        row = ((chunk_y[valid] - ylim[0]) * y_scale).astype(np.intp)
+        np.minimum(col, n_cols - 1, out=col)
+        np.minimum(row, n_rows - 1, out=row)
+        counts += np.bincount(row * n_cols + col, minlength=len(counts))
+    return counts.reshape(shape)
+
+
+def _finite_range(values: NDArray[Any], chunk_size: int) -> tuple[float, float]:
+    """Return the min and max of the finite values, processed in chunks."""
+    vmin, vmax = np.inf, -np.inf
+    for start in range(0, len(values), chunk_size):
+        chunk = np.asarray(values[start:start + chunk_size], dtype=float)
+        finite = chunk[np.isfinite(chunk)]
+        if finite.size:
+            vmin = min(vmin, float(finite.min()))
+            vmax = max(vmax, float(finite.max()))
+    if vmin >= vmax:
+        # No finite values or all values equal
+        center = 0.0 if vmin > vmax else vmin
+        return center - 0.5, center + 0.5
+    return vmin, vmax
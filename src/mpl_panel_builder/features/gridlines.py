@@ -1,48 +1,209 @@
 """Debug gridlines functionality."""
 
+from collections.abc import Generator
+from contextlib import contextmanager
+
+import matplotlib as mpl
 import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
+from matplotlib.transforms import Affine2D, Transform
+from numpy.typing import NDArray
 
 from ..config import get_config
+from ..helpers.mpl import OVERLAY_AXES_LABEL, cm_to_inches, get_overlay_axes
+
+# Group id used to tag all debug artists so that they can be toggled at save time
+DEBUG_GID = "mpl_panel_builder_debug"
 
 
 def draw_gridlines(fig: Figure) -> None:
     """Draw debug gridlines on figure.
-    
+
+    The gridlines are drawn as a single line collection in centimeter
+    coordinates on the shared overlay axes. If enabled in the config, a ruler
+    with minor and major ticks and centimeter labels is drawn along the bottom
+    and left edges of the figure. All debug artists can be hidden or shown at
+    save time via `save_panel(..., debug=...)`.
+
     Args:
         fig: Matplotlib figure to draw gridlines on
     """
     config = get_config()
     gridlines_config = config['features']['gridlines']
-    
-    # Create a transparent axes covering the entire figure
-    ax = fig.add_axes(
-        (0.0, 0.0, 1.0, 1.0), 
-        frameon=False, 
-        aspect="auto", 
-        facecolor="none",
-        zorder=-10
-    )
-    
-    # Set the axes limits to the figure dimensions from the config
+
     fig_width_cm = config['panel']['dimensions']['width_cm']
     fig_height_cm = config['panel']['dimensions']['height_cm']
-    ax.set_xlim(0, fig_width_cm)
-    ax.set_ylim(0, fig_height_cm)
-    
+    cm_transform = _get_cm_transform(fig)
+    overlay_ax = get_overlay_axes(fig)
+
     # Draw gridlines at every resolution_cm cm
     delta = gridlines_config['resolution_cm']
-    ax.set_xticks(np.arange(0, fig_width_cm, delta))
-    ax.set_yticks(np.arange(0, fig_height_cm, delta))
-    ax.grid(True, linestyle=":", color='gray', linewidth=0.5, alpha=1)
+    x_cm = np.arange(0, fig_width_cm, delta)
+    y_cm = np.arange(0, fig_height_cm, delta)
+    segments = np.concatenate([
+        _vertical_segments(x_cm, 0, fig_height_cm),
+        _horizontal_segments(y_cm, 0, fig_width_cm),
+    ])
+    gridlines = LineCollection(
+        list(segments),
+        colors='gray',
+        linestyles=':',
+        linewidths=0.5,
+        transform=cm_transform,
+        zorder=-10,
+    )
+    gridlines.set_gid(DEBUG_GID)
+    overlay_ax.add_collection(gridlines, autolim=False)
+
+    if gridlines_config['ruler']:
+        _draw_ruler(
+            fig, delta, gridlines_config['ruler_major_cm'], cm_transform
+        )
+
+
+def get_debug_artists(fig: Figure) -> list[Artist]:
+    """Return all debug artists drawn on the figure's shared overlay axes.
+
+    Args:
+        fig: Matplotlib figure to search for debug artists.
+
+    Returns:
+        List of artists tagged as debug artists.
+    """
+    debug_artists: list[Artist] = []
+    for ax in fig.axes:
+        if ax.get_label() != OVERLAY_AXES_LABEL:
+            continue
+        debug_artists.extend(
+            artist for artist in ax.get_children()
+            if artist.get_gid() == DEBUG_GID
+        )
+    return debug_artists
+
+
+@contextmanager
+def debug_visibility(fig: Figure, debug: bool | None) -> Generator[None, None, None]:
+    """Temporarily show or hide the debug artists of a figure.
+
+    Args:
+        fig: Matplotlib figure whose debug artists to toggle.
+        debug: True to show the debug gridlines (drawing them if the figure
+            has none), False to hide them, and None to leave the figure as is.
+
+    Yields:
+        None. The original state is restored when the context exits.
+    """
+    if debug is None:
+        yield
+        return
+
+    debug_artists = get_debug_artists(fig)
+    original_visibility = [artist.get_visible() for artist in debug_artists]
+    # Drawing gridlines may create the overlay axes, which is removed again
+    had_overlay = any(ax.get_label() == OVERLAY_AXES_LABEL for ax in fig.axes)
+    added_artists: list[Artist] = []
+    try:
+        if debug and not debug_artists:
+            draw_gridlines(fig)
+            added_artists = get_debug_artists(fig)
+        for artist in debug_artists:
+            artist.set_visible(debug)
+        yield
+    finally:
+        for artist, visible in zip(debug_artists, original_visibility, strict=True):
+            artist.set_visible(visible)
+        for artist in added_artists:
+            artist.remove()
+        if not had_overlay:
+            for ax in fig.axes:
+                if ax.get_label() == OVERLAY_AXES_LABEL:
+                    ax.remove()
+
+
+def _get_cm_transform(fig: Figure) -> Transform:
+    """Return a transform from figure centimeters to display coordinates."""
+    return Affine2D().scale(cm_to_inches(1.0)) + fig.dpi_scale_trans
 
-    # Hide spines
-    for spine in ax.spines.values():
-        spine.set_visible(False)
 
-    # Hide tick marks
-    ax.tick_params(left=False, bottom=False)
+def _vertical_segments(
+    x: NDArray[np.float64], y0: float, y1: float
+) -> NDArray[np.float64]:
+    """Return (n, 2, 2) array of vertical segments from y0 to y1 at each x."""
+    segments = np.empty((len(x), 2, 2))
+    segments[:, :, 0] = x[:, np.newaxis]
+    segments[:, 0, 1] = y0
+    segments[:, 1, 1] = y1
+    return segments
 
-    # Hide tick labels
-    ax.set_xticklabels([])
-    ax.set_yticklabels([])
\ No newline at end of file
+
+def _horizontal_segments(
+    y: NDArray[np.float64], x0: float, x1: float
+) -> NDArray[np.float64]:
+    """Return (n, 2, 2) array of horizontal segments from x0 to x1 at each y."""
+    return _vertical_segments(y, x0, x1)[:, :, ::-1]
+
+
+def _draw_ruler(
+    fig: Figure, minor_cm: float, major_cm: float, cm_transform: Transform
+) -> None:
+    """Draw a ruler with cm labels along the bottom and left figure edges.
+
+    Args:
+        fig: Matplotlib figure to draw the ruler on.
+        minor_cm: Distance between minor ticks in centimeters.
+        major_cm: Distance between major (labelled) ticks in centimeters.
+        cm_transform: Transform from figure centimeters to display coordinates.
+    """
+    config = get_config()
+    fig_width_cm = config['panel']['dimensions']['width_cm']
+    fig_height_cm = config['panel']['dimensions']['height_cm']
+    overlay_ax = get_overlay_axes(fig)
+
+    minor_length_cm = 0.15
+    major_length_cm = 2 * minor_length_cm
+    font_size_pt = mpl.rcParams['font.size']
+
+    segments: list[NDArray[np.float64]] = []
+    for extent_cm, orientation in [(fig_width_cm, "x"), (fig_height_cm, "y")]:
+        ticks_cm = np.arange(0, extent_cm, minor_cm)
+        is_major = np.isclose(
+            (ticks_cm + major_cm / 2) % major_cm, major_cm / 2
+        )
+        lengths = np.where(is_major, major_length_cm, minor_length_cm)
+        tick_segments = np.zeros((len(ticks_cm), 2, 2))
+        tick_segments[:, :, 0] = ticks_cm[:, np.newaxis]
+        tick_segments[:, 1, 1] = lengths
+        if orientation == "y":
+            tick_segments = tick_segments[:, :, ::-1]
+        segments.append(tick_segments)
+
+        for tick_cm in ticks_cm[is_major]:
+            label = f"{tick_cm:g}"
+            if orientation == "x":
+                xy = (tick_cm, major_length_cm)
+                ha, va = "center", "bottom"
+            else:
+                xy = (major_length_cm, tick_cm)
+                ha, va = "left", "center"
+            text = overlay_ax.text(
+                *xy,
+                label,
+                transform=cm_transform,
+                fontsize=font_size_pt,
+                color='gray',
+                ha=ha,
+                va=va,
+            )
+            text.set_gid(DEBUG_GID)
+
+    ruler = LineCollection(
+        list(np.concatenate(segments)),
+        colors='gray',
+        linewidths=0.5,
+        transform=cm_transform,
+        zorder=-10,
+    )
+    ruler.set_gid(DEBUG_GID)
+    overlay_ax.add_collection(ruler, autolim=False)
@@ -0,0 +1,149 @@
+"""Batched histogram functionality."""
+
+from collections.abc import Sequence
+from typing import Any
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.patches import StepPatch
+from numpy.typing import ArrayLike, NDArray
+
+
+def plot_histograms(
+    axs: Sequence[Axes] | Sequence[Sequence[Axes]],
+    data: ArrayLike,
+    offsets: ArrayLike,
+    bins: int | ArrayLike = 10,
+    range: tuple[float, float] | None = None,  # noqa: A002
+    weights: ArrayLike | None = None,
+    density: bool = False,
+    sharey: bool = True,
+    **kwargs: Any,
+) -> list[StepPatch]:
+    """Plot one histogram per axes for many groups in one vectorized pass.
+
+    The values of group i are `data[offsets[i]:offsets[i + 1]]` and are drawn
+    in the i-th axes, counting axes grids row by row. All groups share the
+    same bin edges, and all histograms are computed together with
+    `histogram_groups`. Each histogram is drawn as a single step patch
+    instead of one rectangle per bar.
+
+    Args:
+        axs: The axes to plot in, e.g. the axes grid from `create_panel`.
+        data: Flat array with the values of all groups concatenated.
+        offsets: Start index of each group in data plus the total number of
+            values, i.e. an array of n_groups + 1 increasing integers starting
+            at 0.
+        bins: The number of bins or the bin edges. Defaults to 10.
+        range: The range spanned by the bins if bins is a number. Defaults to
+            the range of the finite values of all groups.
+        weights: Flat array with a weight per value. Defaults to None, i.e.
+            every value counts once.
+        density: Whether to normalize each histogram to unit area. Defaults
+            to False.
+        sharey: Whether to give all axes the same y limits, from 0 to the
+            largest count. Defaults to True.
+        **kwargs: Additional keyword arguments passed to `ax.stairs`, e.g.
+            `fill=True` or `color`.
+
+    Returns:
+        The step patch of each histogram.
+
+    Raises:
+        ValueError: If offsets do not match data, or there are fewer axes
+            than groups.
+    """
+    flat_axs = [
+        ax for row in axs for ax in (row if isinstance(row, Sequence) else [row])
+    ]
+    counts, edges = histogram_groups(data, offsets, bins, range, weights, density)
+    if len(flat_axs) < len(counts):
+        raise ValueError(
+            f"Got {len(counts)} groups but only {len(flat_axs)} axes"
+        )
+
+    patches = [
+        ax.stairs(group_counts, edges, **kwargs)
+        for ax, group_counts in zip(flat_axs, counts, strict=False)
+    ]
+    if sharey and counts.size:
+        top = float(counts.max()) * (1 + mpl.rcParams["axes.ymargin"])
+        for ax in flat_axs[:len(counts)]:
+            ax.set_ylim(0, top if top > 0 else 1)
+    return patches
+
+
+def histogram_groups(
+    data: ArrayLike,
+    offsets: ArrayLike,
+    bins: int | ArrayLike = 10,
+    range: tuple[float, float] | None = None,  # noqa: A002
+    weights: ArrayLike | None = None,
+    density: bool = False,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Compute histograms of many groups with shared bin edges.
+
+    The bin of every value is found with one `np.searchsorted` over the
+    concatenated data, and all counts with one `np.bincount` keyed by group
+    and bin. As for `np.histogram`, all bins but the last are half-open and
+    values outside the bins or not finite are ignored.
+
+    Args:
+        data: Flat array with the values of all groups concatenated.
+        offsets: Start index of each group in data plus the total number of
+            values.
+        bins: The number of bins or the bin edges. Defaults to 10.
+        range: The range spanned by the bins if bins is a number. Defaults to
+            the range of the finite values.
+        weights: Flat array with a weight per value. Defaults to None.
+        density: Whether to normalize each histogram to unit area. Defaults
+            to False.
+
+    Returns:
+        Tuple of (counts, edges), where counts has shape (n_groups, n_bins).
+
+    Raises:
+        ValueError: If offsets do not match data, or weights do not match
+            data.
+    """
+    values = np.asarray(data, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if (
+        values.ndim != 1 or offsets.ndim != 1 or len(offsets) < 1
+        or offsets[0] != 0 or offsets[-1] != len(values)
+        or np.any(np.diff(offsets) < 0)
+    ):
+        raise ValueError(
+            "offsets must be increasing integers starting at 0 and ending at "
+            f"the data length {len(values)}"
+        )
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != values.shape:
+            raise ValueError(
+                f"weights must have the same shape as data {values.shape}, "
+                f"got {weights.shape}"
+            )
+
+    finite = np.isfinite(values)
+    edges = np.histogram_bin_edges(values[finite], bins=bins, range=range)
+    n_groups, n_bins = len(offsets) - 1, len(edges) - 1
+
+    bin_index = np.searchsorted(edges, values, side="right") - 1
+    # The last bin includes its right edge
+    bin_index[values == edges[-1]] = n_bins - 1
+    valid = finite & (bin_index >= 0) & (bin_index < n_bins)
+    group_index = np.repeat(np.arange(n_groups), np.diff(offsets))
+    keys = group_index[valid] * n_bins + bin_index[valid]
+    counts = np.bincount(
+        keys,
+        weights=None if weights is None else weights[valid],
+        minlength=n_groups * n_bins,
+    ).astype(float).reshape(n_groups, n_bins)
+
+    if density:
+        totals = counts.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            counts = np.nan_to_num(counts / totals / np.diff(edges))
+    return counts, edges
@@ -0,0 +1,201 @@
+"""Colormapped image functionality with a precomputed uint8 lookup table."""
+
+import copy
+from functools import lru_cache
+from typing import Any, cast
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import (
+    Colormap,
+    ListedColormap,
+    NoNorm,
+    Normalize,
+    to_rgba,
+)
+from matplotlib.image import AxesImage
+from numpy.typing import ArrayLike, NDArray
+
+# Number of entries in the lookup table, i.e. the number of uint8 levels
+LUT_SIZE = 256
+
+
+def add_lut_image(
+    ax: Axes,
+    data: ArrayLike,
+    cmap: str | Colormap = "viridis",
+    norm: Normalize | None = None,
+    chunk_rows: int = 1024,
+    **imshow_kwargs: Any,
+) -> tuple[AxesImage, ScalarMappable]:
+    """Show a colormapped image through a precomputed uint8 lookup table.
+
+    The data is normalized and quantized once into uint8 indices, processing
+    `chunk_rows` rows at a time to bound memory. The image is then
+    rendered through a cached 256-entry RGBA lookup table, so drawing and
+    saving never normalize or colormap the full-resolution data again, and
+    vector backends reuse the same cached RGBA buffer for every format.
+
+    Because the image itself shows lookup table indices, a separate
+    ScalarMappable with the original colormap and norm is returned for use
+    with `add_colorbar`.
+
+    Args:
+        ax: The axes to show the image in.
+        data: 2D array of scalar data, e.g. a `np.memmap`. Values the norm 
+            cannot map, such as NaN and inf, are shown using the colormap's 
+            "bad" color.
+        cmap: The colormap or registered colormap name. Defaults to "viridis".
+        norm: The norm mapping data to [0, 1]. Defaults to a linear norm
+            spanning the finite data range. Unset vmin/vmax are autoscaled.
+        chunk_rows: Number of rows to normalize at a time. Defaults to 1024.
+        **imshow_kwargs: Additional keyword arguments passed to `ax.imshow`,
+            e.g. `extent` or `origin`.
+
+    Returns:
+        Tuple of (image, mappable) where mappable carries the original
+        colormap and norm for colorbar creation.
+
+    Raises:
+        ValueError: If data is not 2D.
+    """
+    lut_cmap = get_lut_colormap(cmap)
+    if isinstance(cmap, str):
+        cmap = mpl.colormaps[cmap]
+    if norm is None:
+        norm = Normalize()
+
+    indices = quantize_to_uint8(data, norm, chunk_rows)
+
+    # Resampling the indices before the lookup keeps all per-draw work at the
+    # output resolution
+    imshow_kwargs.setdefault("interpolation_stage", "data")
+    image = ax.imshow(indices, cmap=lut_cmap, norm=NoNorm(), **imshow_kwargs)
+    mappable = ScalarMappable(norm=norm, cmap=cmap)
+    return image, mappable
+
+
+def quantize_to_uint8(
+    data: ArrayLike, norm: Normalize, chunk_rows: int = 1024
+) -> NDArray[np.uint8] | np.ma.MaskedArray[Any, np.dtype[np.uint8]]:
+    """Quantize 2D data into uint8 lookup table indices under a norm.
+
+    The norm is autoscaled to the valid data range if vmin or vmax is unset.
+    Values outside the norm range are clipped to the first or last index.
+    Data is normalized in float64, or in its own dtype if wider, so that a
+    small range on a large offset keeps its resolution.
+
+    Args:
+        data: 2D array of scalar data, e.g. a `np.memmap`.
+        norm: The norm mapping data to [0, 1].
+        chunk_rows: Number of rows to normalize at a time. Defaults to 1024.
+
+    Returns:
+        Array of uint8 indices with the same shape as data. If data contains
+        values the norm cannot map, such as NaN and inf, a masked array 
+        masking these values is returned.
+
+    Raises:
+        ValueError: If data is not 2D.
+    """
+    data = np.asanyarray(data)
+    if data.ndim != 2:
+        raise ValueError(f"Data must be 2D, got shape {data.shape}")
+
+    if norm.vmin is None or norm.vmax is None:
+        vmin, vmax = _autoscale_range(data, norm, chunk_rows)
+        if norm.vmin is None:
+            norm.vmin = vmin
+        if norm.vmax is None:
+            norm.vmax = vmax
+
+    dtype = _float_dtype(data)
+    indices = np.empty(data.shape, dtype=np.uint8)
+    mask: NDArray[np.bool_] | None = None
+    for start in range(0, data.shape[0], chunk_rows):
+        chunk = np.asarray(data[start:start + chunk_rows], dtype=dtype)
+        normed = norm(chunk)
+        scaled = np.multiply(
+            np.ma.getdata(normed), LUT_SIZE - 1, dtype=np.float32
+        )
+        # Non-finite data and values the norm cannot map (e.g. negative values
+        # under a LogNorm) are masked
+        invalid = np.ma.getmaskarray(normed) | ~np.isfinite(scaled)
+        scaled[invalid] = 0
+        np.clip(scaled, 0, LUT_SIZE - 1, out=scaled)
+        np.rint(scaled, out=scaled)
+        indices[start:start + chunk_rows] = scaled
+
+        if invalid.any():
+            if mask is None:
+                mask = np.zeros(data.shape, dtype=bool)
+            mask[start:start + chunk_rows] = invalid
+
+    if mask is not None:
+        return np.ma.masked_array(indices, mask)
+    return indices
+
+
+def get_lut_colormap(cmap: str | Colormap) -> ListedColormap:
+    """Return a cached 256-entry colormap for indexing with uint8 values.
+
+    Args:
+        cmap: The colormap or registered colormap name.
+
+    Returns:
+        A ListedColormap with one entry per uint8 index. The "bad" color of
+        the original colormap is preserved.
+    """
+    if isinstance(cmap, str):
+        return _get_named_lut_colormap(cmap)
+    return _create_lut_colormap(cmap)
+
+
+@lru_cache(maxsize=32)
+def _get_named_lut_colormap(name: str) -> ListedColormap:
+    """Return the lookup table colormap of a registered colormap."""
+    return _create_lut_colormap(mpl.colormaps[name])
+
+
+def _create_lut_colormap(cmap: Colormap) -> ListedColormap:
+    """Sample a colormap at 256 evenly spaced values."""
+    colors = cmap(np.linspace(0, 1, LUT_SIZE))
+    lut_cmap = ListedColormap(colors, name=f"{cmap.name}_lut")
+    return cast(
+        ListedColormap, lut_cmap.with_extremes(bad=to_rgba(tuple(cmap.get_bad())))
+    )
+
+
+def _float_dtype(data: NDArray[Any]) -> np.dtype[np.floating[Any]]:
+    """Return float64, or the float dtype of data if it is wider."""
+    if np.issubdtype(data.dtype, np.floating) and data.dtype.itemsize > 8:
+        return data.dtype
+    return np.dtype(np.float64)
+
+
+def _autoscale_range(
+    data: NDArray[Any], norm: Normalize, chunk_rows: int
+) -> tuple[float, float]:
+    """Return the autoscaled vmin and vmax of a norm for 2D data, in chunks.
+
+    Each chunk is autoscaled with an unset copy of the norm, so that values
+    outside the norm's domain (e.g. non-positive values for a LogNorm) are
+    ignored the same way as in `Normalize.autoscale_None`.
+    """
+    dtype = _float_dtype(data)
+    vmin, vmax = np.inf, -np.inf
+    for start in range(0, data.shape[0], chunk_rows):
+        chunk = np.asarray(data[start:start + chunk_rows], dtype=dtype)
+        chunk_norm = copy.deepcopy(norm)
+        chunk_norm.vmin = None
+        chunk_norm.vmax = None
+        chunk_norm.autoscale_None(np.ma.masked_invalid(chunk))
+        if chunk_norm.vmin is None or np.ma.is_masked(chunk_norm.vmin):
+            continue
+        vmin = min(vmin, float(chunk_norm.vmin))  # type: ignore[arg-type]
+        vmax = max(vmax, float(chunk_norm.vmax))  # type: ignore[arg-type]
+    if vmin > vmax:
+        return 0.0, 1.0
+    return vmin, vmax
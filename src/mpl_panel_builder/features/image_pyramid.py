@@ -0,0 +1,264 @@
+"""Out-of-core images backed by memory-mapped multi-resolution pyramids."""
+
+import json
+import math
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.image import AxesImage
+from numpy.typing import NDArray
+
+from ..config import get_config
+from ..helpers.mpl import axes_size_px
+
+
+class ImagePyramid:
+    """Tiled multi-resolution pyramid of a memory-mapped image.
+
+    Level 0 is the image itself, and each following level halves the width
+    and height by averaging 2 x 2 pixel blocks. The levels are built once,
+    streaming over the previous level in bands of rows, and stored as `.npy`
+    files in a sidecar directory next to the image, where later instances
+    reuse them. Reads are split into square tiles, and recently read tiles
+    are cached, so panning and zooming only read tiles not seen before.
+
+    Attributes:
+        levels: The memory-mapped levels, `levels[0]` being the image. Each
+            level is an array of shape (rows, columns) or (rows, columns,
+            channels).
+        tile_size: The tile width and height in pixels.
+    """
+
+    def __init__(
+        self,
+        source: str | Path | np.memmap[Any, Any],
+        tile_size: int = 512,
+        sidecar: str | Path | None = None,
+        min_size: int = 512,
+        cache_tiles: int = 256,
+    ) -> None:
+        """Open the image and open or build its pyramid sidecar.
+
+        Args:
+            source: Path to a `.npy` file, or a `np.memmap`, of shape (rows,
+                columns) or (rows, columns, channels).
+            tile_size: The tile width and height in pixels. Defaults to 512.
+            sidecar: Directory to store the pyramid in. Defaults to the source
+                path with a `.pyramid` suffix appended.
+            min_size: Levels are added until the larger image dimension is at
+                most min_size pixels. Defaults to 512.
+            cache_tiles: Maximum number of tiles kept in memory. Defaults to
+                256.
+
+        Raises:
+            ValueError: If the image is not 2D or 3D, or no sidecar directory
+                can be derived from the source.
+        """
+        if isinstance(source, np.memmap):
+            image: NDArray[Any] = source
+            source_path = Path(source.filename) if source.filename else None
+        else:
+            source_path = Path(source)
+            image = np.load(source_path, mmap_mode="r")
+        if image.ndim not in [2, 3]:
+            raise ValueError(f"Image must be 2D or 3D, got shape {image.shape}")
+
+        if sidecar is None:
+            if source_path is None:
+                raise ValueError("sidecar must be given for anonymous memmaps")
+            sidecar = source_path.with_name(source_path.name + ".pyramid")
+        self.sidecar = Path(sidecar)
+        self.tile_size = tile_size
+        self.cache_tiles = cache_tiles
+        self._tiles: OrderedDict[tuple[int, int, int], NDArray[Any]] = (
+            OrderedDict()
+        )
+
+        n_levels = 1
+        size = max(image.shape[:2])
+        while size > min_size:
+            size = -(-size // 2)
+            n_levels += 1
+        metadata: dict[str, Any] = {
+            "shape": list(image.shape),
+            "dtype": str(image.dtype),
+            "n_levels": n_levels,
+        }
+        if source_path is not None and source_path.exists():
+            stat = source_path.stat()
+            metadata["source_size"] = stat.st_size
+            metadata["source_mtime_ns"] = stat.st_mtime_ns
+
+        metadata_path = self.sidecar / "pyramid.json"
+        if (
+            not metadata_path.exists()
+            or json.loads(metadata_path.read_text()) != metadata
+        ):
+            self._build(image, n_levels)
+            metadata_path.write_text(json.dumps(metadata))
+        self.levels = [image] + [
+            np.load(self.sidecar / f"level_{k}.npy", mmap_mode="r")
+            for k in range(1, n_levels)
+        ]
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """The shape of the full resolution image."""
+        return self.levels[0].shape
+
+    def read(
+        self,
+        rows: tuple[float, float],
+        cols: tuple[float, float],
+        out_shape: tuple[int, int],
+    ) -> tuple[NDArray[Any], tuple[int, int, int, int]]:
+        """Read a window at the level matching the output resolution.
+
+        The coarsest level that still has at least one pixel per output
+        pixel is used, and only the tiles overlapping the window are read.
+
+        Args:
+            rows: The first and last row of the window in level 0 pixels.
+            cols: The first and last column of the window in level 0 pixels.
+            out_shape: The window size in output pixels as (rows, columns).
+
+        Returns:
+            Tuple of (pixels, bounds) where bounds are the (row_start,
+            row_stop, col_start, col_stop) covered by the pixels in level 0
+            pixels, aligned to tiles and clipped to the image.
+        """
+        n_rows, n_cols = self.shape[:2]
+        r0, r1 = max(math.floor(min(rows)), 0), min(math.ceil(max(rows)), n_rows)
+        c0, c1 = max(math.floor(min(cols)), 0), min(math.ceil(max(cols)), n_cols)
+        r1, c1 = max(r1, r0 + 1), max(c1, c0 + 1)
+
+        scale = min((r1 - r0) / max(out_shape[0], 1), (c1 - c0) / max(out_shape[1], 1))
+        level = min(int(math.log2(max(scale, 1))), len(self.levels) - 1)
+        step = 2**level
+        tile_span = self.tile_size * step
+
+        tile_rows = range(r0 // tile_span, -(-r1 // tile_span))
+        tile_cols = range(c0 // tile_span, -(-c1 // tile_span))
+        pixels = np.concatenate([
+            np.concatenate([self._tile(level, i, j) for j in tile_cols], axis=1)
+            for i in tile_rows
+        ], axis=0)
+        bounds = (
+            tile_rows.start * tile_span,
+            min(tile_rows.stop * tile_span, n_rows),
+            tile_cols.start * tile_span,
+            min(tile_cols.stop * tile_span, n_cols),
+        )
+        return pixels, bounds
+
+    def _tile(self, level: int, i: int, j: int) -> NDArray[Any]:
+        """Return tile (i, j) of a level, reading it if it is not cached."""
+        key = (level, i, j)
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+        size = self.tile_size
+        tile = np.array(
+            self.levels[level][i * size:(i + 1) * size, j * size:(j + 1) * size]
+        )
+        self._tiles[key] = tile
+        if len(self._tiles) > self.cache_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _build(self, image: NDArray[Any], n_levels: int) -> None:
+        """Build all pyramid levels, streaming over the previous level."""
+        self.sidecar.mkdir(parents=True, exist_ok=True)
+        band = 2 * self.tile_size
+
+        previous = image
+        for k in range(1, n_levels):
+            shape = (
+                -(-previous.shape[0] // 2), -(-previous.shape[1] // 2),
+                *previous.shape[2:],
+            )
+            level = np.lib.format.open_memmap(
+                self.sidecar / f"level_{k}.npy",
+                mode="w+",
+                dtype=image.dtype,
+                shape=shape,
+            )
+            for start in range(0, previous.shape[0], band):
+                chunk = np.asarray(previous[start:start + band], dtype=np.float32)
+                # Pad odd rows and columns by repeating the last one
+                pad = [(0, chunk.shape[0] % 2), (0, chunk.shape[1] % 2)]
+                chunk = np.pad(chunk, pad + [(0, 0)] * (chunk.ndim - 2), mode="edge")
+                pooled = chunk.reshape(
+                    chunk.shape[0] // 2, 2, chunk.shape[1] // 2, 2, *chunk.shape[2:]
+                ).mean(axis=(1, 3))
+                if np.issubdtype(image.dtype, np.integer):
+                    pooled = np.rint(pooled)
+                level[start // 2:start // 2 + len(pooled)] = pooled
+            level.flush()
+            previous = level
+
+
+def show_image_pyramid(
+    ax: Axes,
+    pyramid: ImagePyramid,
+    pixel_size: float = 1.0,
+    **kwargs: Any,
+) -> AxesImage:
+    """Show a pyramid-backed image, reading only what the axes can show.
+
+    Pixel (i, j) of the full resolution image covers x from `j * pixel_size`
+    to `(j + 1) * pixel_size` and y from `i * pixel_size` to `(i + 1) *
+    pixel_size`, with y increasing downwards as for `imshow`. Whenever the
+    limits change, the level matching the axes size in output pixels (from
+    the cm layout and `output.dpi`) is read for the visible window, so memory
+    and time scale with the output resolution and not with the image size.
+    Scale bars drawn with `draw_x_scale_bar` are in units of pixel_size.
+
+    Args:
+        ax: The axes to show the image in.
+        pyramid: The pyramid of the image to show.
+        pixel_size: The size of a full resolution pixel in data units, e.g.
+            micrometers. Defaults to 1.
+        **kwargs: Additional keyword arguments passed to `ax.imshow`.
+
+    Returns:
+        The image showing the visible window.
+    """
+    config = get_config()
+    width_px, height_px = axes_size_px(ax, config['output']['dpi'])
+    n_rows, n_cols = pyramid.shape[:2]
+
+    def _read() -> tuple[NDArray[Any], tuple[float, float, float, float]]:
+        """Read the visible window and return it with its extent."""
+        x0, x1 = ax.get_xlim()
+        y0, y1 = ax.get_ylim()
+        pixels, (r0, r1, c0, c1) = pyramid.read(
+            (y0 / pixel_size, y1 / pixel_size),
+            (x0 / pixel_size, x1 / pixel_size),
+            (height_px, width_px),
+        )
+        extent = (
+            c0 * pixel_size, c1 * pixel_size, r1 * pixel_size, r0 * pixel_size
+        )
+        return pixels, extent
+
+    ax.set_xlim(0, n_cols * pixel_size)
+    ax.set_ylim(n_rows * pixel_size, 0)
+    pixels, extent = _read()
+    kwargs.setdefault("origin", "upper")
+    image = ax.imshow(pixels, extent=extent, **kwargs)
+    # Keep the limits when the extent is updated to the visible window
+    ax.set_autoscale_on(False)
+
+    def _on_lim_changed(_: Axes) -> None:
+        """Read the window matching the new limits."""
+        pixels, extent = _read()
+        image.set_data(pixels)
+        image.set_extent(extent)
+
+    ax.callbacks.connect("xlim_changed", _on_lim_changed)
+    ax.callbacks.connect("ylim_changed", _on_lim_changed)
+    return image
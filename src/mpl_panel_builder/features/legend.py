@@ -0,0 +1,127 @@
+"""Shared legend functionality."""
+
+from collections.abc import Sequence
+from typing import Any, Literal
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure, SubFigure
+from matplotlib.legend import Legend
+
+from ..config import get_config
+from ..helpers.mpl import cm_to_fig_rel
+
+# Getters whose values distinguish the style of legend handles
+_STYLE_GETTERS = [
+    "get_color", "get_linestyle", "get_linewidth", "get_marker",
+    "get_facecolor", "get_edgecolor", "get_hatch",
+]
+
+
+def add_shared_legend(
+    axs: Sequence[Axes] | Sequence[Sequence[Axes]],
+    position: Literal["left", "right", "bottom", "top"]
+    | tuple[float, float] = "right",
+    **kwargs: Any,
+) -> Legend:
+    """Add one figure legend with the unique entries of several axes.
+
+    The handles and labels of all axes are collected once, and entries with
+    the same label and style are shown only once, so a series shown in every
+    axes of a grid gets a single legend entry. Legends already attached to
+    the axes are removed.
+
+    With a side as position, the legend is centered in the corresponding
+    figure margin from `panel.margins`, along the plot region. With a tuple,
+    it is the position of the upper left corner of the legend in cm from the
+    top-left corner of the figure.
+
+    Args:
+        axs: The axes to collect entries from, e.g. the axes grid from
+            `create_panel`.
+        position: "left", "right", "bottom", "top", or a (x_cm, y_cm) tuple.
+            Defaults to "right".
+        **kwargs: Additional keyword arguments passed to `fig.legend`, e.g.
+            `ncols` or `frameon`.
+
+    Returns:
+        The figure legend.
+
+    Raises:
+        ValueError: If position is invalid or axs is empty.
+    """
+    flat_axs = [
+        ax for row in axs for ax in (row if isinstance(row, Sequence) else [row])
+    ]
+    if not flat_axs:
+        raise ValueError("axs must contain at least one axes")
+    fig = flat_axs[0].get_figure()
+    if fig is None:
+        raise ValueError("Axes must be attached to a figure")
+
+    handles: list[Artist] = []
+    labels: list[str] = []
+    seen: set[tuple[str, ...]] = set()
+    for ax in flat_axs:
+        legend = ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        for handle, label in zip(*ax.get_legend_handles_labels(), strict=True):
+            key = (label, *_style_key(handle))
+            if key not in seen:
+                seen.add(key)
+                handles.append(handle)
+                labels.append(label)
+
+    if isinstance(position, tuple):
+        x_cm, y_cm = position
+        anchor = (
+            cm_to_fig_rel(fig, x_cm, "width"),
+            1 - cm_to_fig_rel(fig, y_cm, "height"),
+        )
+        loc = "upper left"
+        # Place the legend box exactly at the given position
+        kwargs.setdefault("borderaxespad", 0.0)
+    else:
+        anchor = _margin_center(fig, position)
+        loc = "center"
+    kwargs.setdefault("loc", loc)
+    return fig.legend(
+        handles, labels, bbox_to_anchor=anchor, bbox_transform=fig.transFigure,
+        **kwargs,
+    )
+
+
+def _style_key(handle: Artist) -> tuple[str, ...]:
+    """Return a hashable description of the style of a legend handle."""
+    key = [type(handle).__name__]
+    for getter in _STYLE_GETTERS:
+        if hasattr(handle, getter):
+            value = getattr(handle, getter)()
+            key.append(repr(np.asarray(value, dtype=object).tolist()))
+    return tuple(key)
+
+
+def _margin_center(fig: Figure | SubFigure, side: str) -> tuple[float, float]:
+    """Return the figure-relative center of a margin along the plot region."""
+    valid_positions = ["left", "right", "bottom", "top"]
+    if side not in valid_positions:
+        raise ValueError(
+            f"Invalid position: {side!r}. Must be one of: {valid_positions!r} "
+            "or a (x_cm, y_cm) tuple."
+        )
+    config = get_config()
+    margins = config['panel']['margins']
+    left = cm_to_fig_rel(fig, margins['left_cm'], "width")
+    right = 1 - cm_to_fig_rel(fig, margins['right_cm'], "width")
+    bottom = cm_to_fig_rel(fig, margins['bottom_cm'], "height")
+    top = 1 - cm_to_fig_rel(fig, margins['top_cm'], "height")
+
+    if side == "left":
+        return left / 2, (bottom + top) / 2
+    if side == "right":
+        return (right + 1) / 2, (bottom + top) / 2
+    if side == "bottom":
+        return (left + right) / 2, bottom / 2
+    return (left + right) / 2, (top + 1) / 2
@@ -0,0 +1,158 @@
+"""Annotated matrix functionality."""
+
+from functools import lru_cache
+from typing import Any
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import PathCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath, text_to_path
+from matplotlib.transforms import Affine2D, Transform
+from matplotlib.typing import ColorType
+from numpy.typing import ArrayLike, NDArray
+
+
+def annotate_matrix(
+    ax: Axes,
+    values: ArrayLike,
+    fmt: str = "%.2f",
+    color: ColorType = (0, 0, 0),
+    **kwargs: Any,
+) -> list[PathCollection]:
+    """Write the value of every matrix cell at its center as path collections.
+
+    The values are formatted in one vectorized call and drawn from a glyph
+    atlas: each distinct character is one path collection in points,
+    stamped at every (cell, character position) showing it, instead of
+    creating one Text artist per cell. The number of artists is thus
+    bounded by the characters used, e.g. the digits, sign and decimal
+    point, however many distinct values there are, and vector backends
+    write each glyph outline once and reuse it. The cells are centered at
+    (column, row) as for `ax.imshow` with the default extent. Masked and NaN
+    cells are left empty.
+
+    As for `add_annotation`, the text uses rcParams["font.size"] and is black
+    unless a color is given. Glyphs are placed by their advance widths
+    without kerning, which matches normal text for digits.
+
+    Args:
+        ax: The axes holding the matrix, e.g. after `ax.imshow(values)`.
+        values: 2D array of the values to write.
+        fmt: printf-style format of the values. Defaults to "%.2f".
+        color: Text color. Defaults to black.
+        **kwargs: Additional keyword arguments passed to `PathCollection`.
+
+    Returns:
+        One collection per distinct character, holding it for all cells.
+
+    Raises:
+        ValueError: If values is not 2D.
+    """
+    masked = np.ma.masked_invalid(np.ma.asarray(values, dtype=float))
+    if masked.ndim != 2:
+        raise ValueError(f"values must be 2D, got shape {masked.shape}")
+    rows, cols = np.nonzero(~np.ma.getmaskarray(masked))
+    strings = np.char.mod(fmt, masked.data[rows, cols])
+    unique_strings, inverse = np.unique(strings, return_inverse=True)
+
+    fig = ax.get_figure()
+    if fig is None:
+        raise ValueError("Axes must be attached to a figure")
+    font_size_pt = mpl.rcParams["font.size"]
+    prop = FontProperties(size=font_size_pt)
+
+    # The cells showing each distinct string
+    order = np.argsort(inverse.ravel(), kind="stable")
+    bounds = np.searchsorted(
+        inverse.ravel()[order], np.arange(len(unique_strings) + 1)
+    )
+    # Per character, the cells and horizontal positions, in units of the
+    # font size, of its stamps, with each string centered on its advance
+    stamps: dict[str, tuple[list[NDArray[np.intp]], list[float]]] = {}
+    for i, text in enumerate(unique_strings):
+        advances = [_glyph(char, prop)[1] for char in str(text)]
+        x = -sum(advances) / 2
+        for char, advance in zip(str(text), advances, strict=True):
+            cells, positions = stamps.setdefault(char, ([], []))
+            cells.append(order[bounds[i]:bounds[i + 1]])
+            positions.append(x)
+            x += advance
+
+    # Glyphs are in units of the font size, scaled to points and pixels
+    transform = Affine2D().scale(font_size_pt / 72) + fig.dpi_scale_trans
+    centers = np.column_stack((cols, rows)).astype(float)
+    digit_height = _glyph("0", prop)[0].get_extents().y1
+    collections: list[PathCollection] = []
+    for char, (cells, positions) in stamps.items():
+        path = _glyph(char, prop)[0]
+        if not path.vertices.size:
+            continue
+        counts = [len(cell) for cell in cells]
+        indices = np.concatenate(cells)
+        shifts_pt = np.zeros((len(indices), 2))
+        shifts_pt[:, 0] = np.repeat(positions, counts) * font_size_pt
+        collection = PathCollection(
+            [path.transformed(Affine2D().translate(0, -digit_height / 2))],
+            offsets=centers[indices],
+            offset_transform=_ShiftedOffsets(
+                ax.transData, fig.dpi_scale_trans, shifts_pt
+            ),
+            facecolors=color,
+            edgecolors="none",
+            linewidths=0,
+            **kwargs,
+        )
+        collection.set_transform(transform)
+        ax.add_collection(collection, autolim=False)
+        collections.append(collection)
+    return collections
+
+
+class _ShiftedOffsets(Transform):
+    """Offset transform of a collection that shifts each offset on the page.
+
+    The offsets are transformed by `base`, and the i-th of them is then
+    moved by the i-th row of `shifts_pt`, in points, so that the stamps of
+    a glyph keep their place within their string whatever the data limits,
+    axes size or dpi. It applies only to the offsets it was made for.
+    """
+
+    @property
+    def input_dims(self) -> int:
+        return 2
+
+    @property
+    def output_dims(self) -> int:
+        return 2
+
+    @property
+    def is_affine(self) -> bool:
+        return False
+
+    def __init__(
+        self,
+        base: Transform,
+        dpi_scale_trans: Transform,
+        shifts_pt: NDArray[np.float64],
+    ) -> None:
+        super().__init__()
+        self._base = base
+        self._dpi_scale_trans = dpi_scale_trans
+        self._shifts_pt = shifts_pt
+        self.set_children(base, dpi_scale_trans)
+
+    def transform_non_affine(self, values: ArrayLike) -> NDArray[np.float64]:
+        shifts = self._dpi_scale_trans.transform(self._shifts_pt / 72)
+        return self._base.transform(values) + shifts
+
+
+@lru_cache(maxsize=1024)
+def _glyph(char: str, prop: FontProperties) -> tuple[Path, float]:
+    """Return the outline and advance width of a character at unit size."""
+    size = prop.get_size_in_points()
+    width = text_to_path.get_text_width_height_descent(char, prop, ismath=False)[0]
+    text_path = TextPath((0, 0), char, size=1, prop=prop)
+    return Path(text_path.vertices, text_path.codes), width / size
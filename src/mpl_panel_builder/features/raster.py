@@ -0,0 +1,147 @@
+"""Event raster plot functionality."""
+
+from typing import Any
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
+from matplotlib.typing import ColorType
+from numpy.typing import ArrayLike, NDArray
+
+from ..config import get_config
+from ..helpers.mpl import axes_size_px, get_default_colors
+
+
+def plot_raster(
+    ax: Axes,
+    events: ArrayLike,
+    offsets: ArrayLike,
+    xlim: tuple[float, float] | None = None,
+    line_length: float = 0.8,
+    color: ColorType | None = None,
+    linewidth: float | None = None,
+    decimate: bool = True,
+    chunk_size: int = 2**20,
+    **kwargs: Any,
+) -> LineCollection:
+    """Plot an event raster from CSR-style ragged arrays.
+
+    The events of row i are `events[offsets[i]:offsets[i + 1]]`, plotted as
+    vertical ticks centered at y = i. All ticks are drawn as one vectorized
+    line collection. When decimating, only one tick is kept per row and output
+    pixel, where the pixel grid follows from the axes width and the configured
+    `output.dpi`, so the result looks the same as the full raster.
+
+    The events are processed `chunk_size` at a time, so memory-mapped inputs
+    (e.g. `np.load(path, mmap_mode="r")`) are streamed and only the decimated
+    ticks are held in memory.
+
+    Args:
+        ax: The axes to plot the raster in.
+        events: Flat array with the event times of all rows concatenated.
+        offsets: Start index of each row in events plus the total number of
+            events, i.e. an array of n_rows + 1 increasing integers starting
+            at 0.
+        xlim: The x range to show. Events outside the range are dropped.
+            Defaults to the range of the events.
+        line_length: The length of each tick in row units. Defaults to 0.8.
+        color: The tick color. Defaults to the first color of the property
+            cycle.
+        linewidth: The tick width in points. Defaults to
+            rcParams["lines.linewidth"].
+        decimate: Whether to keep only one tick per row and output pixel.
+            Defaults to True.
+        chunk_size: Number of events to process at a time. Defaults to 2**20.
+        **kwargs: Additional keyword arguments passed to `LineCollection`.
+
+    Returns:
+        The line collection holding all ticks.
+
+    Raises:
+        ValueError: If offsets do not match events.
+    """
+    events = np.asanyarray(events)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if (
+        events.ndim != 1 or offsets.ndim != 1 or len(offsets) < 1
+        or offsets[0] != 0 or offsets[-1] != len(events)
+        or np.any(np.diff(offsets) < 0)
+    ):
+        raise ValueError(
+            "offsets must be increasing integers starting at 0 and ending at "
+            f"the number of events {len(events)}"
+        )
+    n_rows = len(offsets) - 1
+
+    if xlim is None:
+        xlim = _event_range(events, chunk_size)
+    x0, x1 = xlim
+    if decimate:
+        config = get_config()
+        n_px = axes_size_px(ax, config['output']['dpi'])[0]
+        px_width = (x1 - x0) / n_px
+    else:
+        n_px, px_width = 0, 0.0
+
+    xs: list[NDArray[np.float64]] = []
+    rows: list[NDArray[np.int64]] = []
+    keys: list[NDArray[np.int64]] = []
+    for start in range(0, len(events), chunk_size):
+        chunk = np.asarray(events[start:start + chunk_size], dtype=float)
+        chunk_rows = np.searchsorted(
+            offsets, np.arange(start, start + len(chunk)), side="right"
+        ) - 1
+        in_range = (chunk >= x0) & (chunk <= x1)
+        chunk, chunk_rows = chunk[in_range], chunk_rows[in_range]
+        if decimate:
+            # One key per row and output pixel, duplicates are dropped
+            px = np.minimum(((chunk - x0) / px_width).astype(np.int64), n_px - 1)
+            keys.append(np.unique(chunk_rows * n_px + px))
+        else:
+            xs.append(chunk)
+            rows.append(chunk_rows)
+
+    if decimate:
+        # Pixels can be shared by consecutive chunks, so deduplicate once more
+        unique_keys = np.unique(np.concatenate(keys)) if keys else np.empty(0, int)
+        pixel_rows, px = np.divmod(unique_keys, n_px)
+        x = x0 + (px + 0.5) * px_width
+        y = pixel_rows.astype(float)
+    else:
+        x = np.concatenate(xs) if xs else np.empty(0)
+        y = np.concatenate(rows).astype(float) if rows else np.empty(0)
+
+    segments = np.empty((len(x), 2, 2))
+    segments[:, :, 0] = x[:, np.newaxis]
+    segments[:, 0, 1] = y - line_length / 2
+    segments[:, 1, 1] = y + line_length / 2
+
+    if color is None:
+        color = get_default_colors()[0]
+    if linewidth is None:
+        linewidth = mpl.rcParams["lines.linewidth"]
+    collection = LineCollection(
+        list(segments), colors=color, linewidths=linewidth, **kwargs
+    )
+    ax.add_collection(collection, autolim=False)
+    ax.set_xlim(x0, x1)
+    ax.set_ylim(-0.5, n_rows - 0.5)
+    return collection
+
+
+def _event_range(
+    events: NDArray[Any], chunk_size: int
+) -> tuple[float, float]:
+    """Return the min and max of the events, processed in chunks."""
+    x0, x1 = np.inf, -np.inf
+    for start in range(0, len(events), chunk_size):
+        chunk = np.asarray(events[start:start + chunk_size], dtype=float)
+        if chunk.size:
+            x0 = min(x0, float(chunk.min()))
+            x1 = max(x1, float(chunk.max()))
+    if x0 >= x1:
+        # No events or all events at the same time
+        center = 0.0 if x0 > x1 else x0
+        return center - 0.5, center + 0.5
+    return x0, x1
@@ -3,14 +3,15 @@
 from matplotlib.axes import Axes
 
 from ..config import get_config
-from ..helpers.mpl import cm_to_fig_rel, create_full_figure_axes, pt_to_cm
+from ..helpers.mpl import cm_to_fig_rel, get_overlay_axes, pt_to_cm
 
 
 def draw_x_scale_bar(ax: Axes, length: float, label: str) -> None:
     """Draws a horizontal scale bar for the given axes.
 
-    The scale bar is drawn on a new axes covering the entire figure. This 
-    makes it possible to draw the scale bar on inside or outside of the axes.
+    The scale bar is drawn on the shared overlay axes covering the entire 
+    figure. This makes it possible to draw the scale bar on inside or outside
+    of the axes.
 
     Args:
         ax: The axes to draw the scale bar for.
@@ -43,8 +44,8 @@ def draw_x_scale_bar(ax: Axes, length: float, label: str) -> None:
     x_rel = ax_bbox.x0 + offset_rel
     y_rel = ax_bbox.y0 - sep_rel
     
-    # Create overlay axes covering the entire figure
-    overlay_ax = create_full_figure_axes(fig)
+    # Get the shared overlay axes covering the entire figure
+    overlay_ax = get_overlay_axes(fig)
 
     # Draw scale bar
     overlay_ax.plot(
@@ -64,8 +65,9 @@ def draw_x_scale_bar(ax: Axes, length: float, label: str) -> None:
 def draw_y_scale_bar(ax: Axes, length: float, label: str) -> None:
     """Draws a vertical scale bar for the given axes.
 
-    The scale bar is drawn on a new axes covering the entire figure. This 
-    makes it possible to draw the scale bar on inside or outside of the axes.
+    The scale bar is drawn on the shared overlay axes covering the entire 
+    figure. This makes it possible to draw the scale bar on inside or outside
+    of the axes.
 
     Args:
         ax: The axes to draw the scale bar for.
@@ -103,8 +105,8 @@ def draw_y_scale_bar(ax: Axes, length: float, label: str) -> None:
     x_rel = ax_bbox.x0 - sep_rel
     y_rel = ax_bbox.y0 + offset_rel
     
-    # Create overlay axes covering the entire figure
-    overlay_ax = create_full_figure_axes(fig)
+    # Get the shared overlay axes covering the entire figure
+    overlay_ax = get_overlay_axes(fig)
 
     # Draw scale bar
     overlay_ax.plot(
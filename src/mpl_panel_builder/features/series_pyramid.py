@@ -0,0 +1,230 @@
+"""Out-of-core time series backed by memory-mapped min/max pyramids."""
+
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.lines import Line2D
+from numpy.typing import NDArray
+
+from ..config import get_config
+from ..helpers.mpl import axes_size_px
+from .decimate import decimate_minmax
+
+
+class MinMaxPyramid:
+    """Min/max level-of-detail pyramid of a memory-mapped 1D series.
+
+    Level k of the pyramid stores the minimum and maximum of each block of
+    `factor**k` consecutive samples. The levels are built once, streaming
+    over the series in chunks, and stored as `.npy` files in a sidecar
+    directory next to the series, where later instances reuse them. Reads
+    select the coarsest level that still resolves every output pixel, so the
+    amount of data read and held in memory depends on the output resolution
+    and not on the file size.
+
+    Attributes:
+        data: The memory-mapped series.
+        factor: The number of blocks of one level merged into a block of the
+            next level.
+        levels: The memory-mapped pyramid levels, where `levels[k - 1]` is an
+            array of shape (n_blocks, 2) holding the min and max per block of
+            `factor**k` samples.
+    """
+
+    def __init__(
+        self,
+        source: str | Path | np.memmap[Any, Any],
+        factor: int = 8,
+        sidecar: str | Path | None = None,
+        chunk_size: int = 2**24,
+    ) -> None:
+        """Open the series and open or build its pyramid sidecar.
+
+        Args:
+            source: Path to a 1D `.npy` file, or a 1D `np.memmap`.
+            factor: The block size ratio between consecutive levels, at
+                least 2. Defaults to 8.
+            sidecar: Directory to store the pyramid in. Defaults to the source
+                path with a `.pyramid` suffix appended.
+            chunk_size: Number of samples to process at a time when building
+                the pyramid. Defaults to 2**24.
+
+        Raises:
+            ValueError: If the series is not 1D, factor is smaller than 2, or
+                no sidecar directory can be derived from the source.
+        """
+        if factor < 2:
+            raise ValueError(f"factor must be at least 2, got {factor}")
+
+        if isinstance(source, np.memmap):
+            self.data: NDArray[Any] = source
+            source_path = Path(source.filename) if source.filename else None
+        else:
+            source_path = Path(source)
+            self.data = np.load(source_path, mmap_mode="r")
+        if self.data.ndim != 1:
+            raise ValueError(f"Series must be 1D, got shape {self.data.shape}")
+
+        if sidecar is None:
+            if source_path is None:
+                raise ValueError("sidecar must be given for anonymous memmaps")
+            sidecar = source_path.with_name(source_path.name + ".pyramid")
+        self.sidecar = Path(sidecar)
+        self.factor = factor
+
+        metadata = self._metadata(source_path)
+        metadata_path = self.sidecar / "pyramid.json"
+        if (
+            not metadata_path.exists()
+            or json.loads(metadata_path.read_text()) != metadata
+        ):
+            self._build(chunk_size)
+            metadata_path.write_text(json.dumps(metadata))
+        self.levels = [
+            np.load(self.sidecar / f"level_{k}.npy", mmap_mode="r")
+            for k in range(1, metadata["n_levels"] + 1)
+        ]
+
+    def __len__(self) -> int:
+        """Return the number of samples in the series."""
+        return len(self.data)
+
+    def read(
+        self, start: int, stop: int, n_px: int
+    ) -> tuple[NDArray[np.float64], NDArray[Any]]:
+        """Read the samples in [start, stop) reduced to n_px pixel columns.
+
+        Args:
+            start: Index of the first sample.
+            stop: Index after the last sample.
+            n_px: The number of pixel columns to resolve.
+
+        Returns:
+            Tuple of (sample positions, values) with the min and max of each
+            pixel column, at most 2 * n_px + 4 points.
+        """
+        start, stop = max(start, 0), min(stop, len(self.data))
+        if stop <= start:
+            return np.empty(0), np.empty(0, dtype=self.data.dtype)
+
+        samples_per_px = (stop - start) / max(n_px, 1)
+        level = min(
+            int(math.log(max(samples_per_px, 1), self.factor)), len(self.levels)
+        )
+        if level == 0:
+            positions = np.arange(start, stop, dtype=float)
+            values = np.asarray(self.data[start:stop])
+        else:
+            block = self.factor**level
+            blocks = np.asarray(
+                self.levels[level - 1][start // block:-(-stop // block)]
+            )
+            # Show the min and max of each block at the block center
+            centers = (start // block + np.arange(len(blocks)) + 0.5) * block
+            positions = np.repeat(np.minimum(centers, len(self.data) - 1), 2)
+            values = blocks.ravel()
+        return decimate_minmax(positions, values, n_px)
+
+    def _metadata(self, source_path: Path | None) -> dict[str, Any]:
+        """Return the metadata identifying the series the pyramid belongs to."""
+        n_levels = 0
+        n_blocks = len(self.data)
+        while n_blocks > 256:
+            n_blocks = -(-n_blocks // self.factor)
+            n_levels += 1
+        metadata: dict[str, Any] = {
+            "length": len(self.data),
+            "dtype": str(self.data.dtype),
+            "factor": self.factor,
+            "n_levels": n_levels,
+        }
+        if source_path is not None and source_path.exists():
+            stat = source_path.stat()
+            metadata["source_size"] = stat.st_size
+            metadata["source_mtime_ns"] = stat.st_mtime_ns
+        return metadata
+
+    def _build(self, chunk_size: int) -> None:
+        """Build all pyramid levels, streaming over the previous level."""
+        self.sidecar.mkdir(parents=True, exist_ok=True)
+        n_levels = self._metadata(None)["n_levels"]
+        chunk_size = max(chunk_size // self.factor, 1) * self.factor
+
+        previous: NDArray[Any] = self.data
+        for k in range(1, n_levels + 1):
+            n_blocks = -(-len(previous) // self.factor)
+            level = np.lib.format.open_memmap(
+                self.sidecar / f"level_{k}.npy",
+                mode="w+",
+                dtype=self.data.dtype,
+                shape=(n_blocks, 2),
+            )
+            for start in range(0, len(previous), chunk_size):
+                chunk = np.asarray(previous[start:start + chunk_size])
+                if chunk.ndim == 1:
+                    chunk = np.column_stack((chunk, chunk))
+                # Pad the last block with its final sample
+                n_chunk_blocks = -(-len(chunk) // self.factor)
+                pad = n_chunk_blocks * self.factor - len(chunk)
+                chunk = np.pad(chunk, ((0, pad), (0, 0)), mode="edge")
+                chunk = chunk.reshape(n_chunk_blocks, self.factor, 2)
+                block_start = start // self.factor
+                block_stop = block_start + n_chunk_blocks
+                level[block_start:block_stop, 0] = np.fmin.reduce(
+                    chunk[:, :, 0], axis=1
+                )
+                level[block_start:block_stop, 1] = np.fmax.reduce(
+                    chunk[:, :, 1], axis=1
+                )
+            level.flush()
+            previous = level
+
+
+def plot_pyramid(
+    ax: Axes,
+    pyramid: MinMaxPyramid,
+    fs: float = 1.0,
+    t0: float = 0.0,
+    **kwargs: Any,
+) -> Line2D:
+    """Plot a pyramid-backed series, reading only what the axes can show.
+
+    Sample i is plotted at time `t0 + i / fs`. Whenever the x limits change,
+    only the pyramid level matching the axes width in output pixels (from
+    the cm layout and `output.dpi`) is read for the visible range. The x data
+    units are kept, so `draw_x_scale_bar` works as for any other line.
+
+    Args:
+        ax: The axes to plot in.
+        pyramid: The pyramid of the series to plot.
+        fs: The sampling rate in samples per x unit. Defaults to 1.
+        t0: The time of the first sample. Defaults to 0.
+        **kwargs: Additional keyword arguments passed to `ax.plot`.
+
+    Returns:
+        The line showing the series.
+    """
+    config = get_config()
+    n_px = axes_size_px(ax, config['output']['dpi'])[0]
+
+    def _read(x0: float, x1: float) -> tuple[NDArray[Any], NDArray[Any]]:
+        """Read the visible range, keeping one sample beyond each side."""
+        start = math.floor((x0 - t0) * fs) - 1
+        stop = math.ceil((x1 - t0) * fs) + 2
+        positions, values = pyramid.read(start, stop, n_px)
+        return t0 + positions / fs, values
+
+    t1 = t0 + (len(pyramid) - 1) / fs
+    (line,) = ax.plot(*_read(t0, t1), **kwargs)
+    ax.set_xlim(t0, t1)
+
+    def _on_xlim_changed(changed_ax: Axes) -> None:
+        """Read the pyramid level matching the new x limits."""
+        line.set_data(*_read(*sorted(changed_ax.get_xlim())))
+
+    ax.callbacks.connect("xlim_changed", _on_xlim_changed)
+    return line
@@ -0,0 +1,145 @@
+"""Bulk trace plotting functionality."""
+
+from typing import Any
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.typing import ColorType
+from numpy.typing import ArrayLike, NDArray
+
+from ..helpers.mpl import get_default_colors
+
+
+def plot_traces(
+    ax: Axes,
+    data: ArrayLike,
+    x: ArrayLike | None = None,
+    offsets: ArrayLike | None = None,
+    spacing: float | None = None,
+    colors: ColorType | ArrayLike | None = None,
+    linewidths: float | ArrayLike | None = None,
+    alpha: float | ArrayLike | None = None,
+    **kwargs: Any,
+) -> LineCollection:
+    """Plot many traces as a single line collection.
+
+    Drawing all traces as one collection avoids creating one Line2D per trace,
+    which dominates creation and draw time and file size for hundreds or more
+    traces. Traces are given either as a 2D array with one trace per row, or
+    as ragged traces concatenated into a flat array with CSR-style offsets.
+
+    When stacking traces vertically via `spacing`, the y data units are kept,
+    so `draw_y_scale_bar` shows the scale of the individual traces.
+
+    Args:
+        ax: The axes to plot the traces in.
+        data: 2D array of shape (n_traces, n_samples), or a flat array with
+            all ragged traces concatenated if `offsets` is given.
+        x: The x values. A 1D array shared by all traces or an array with the
+            same shape as data. Defaults to the sample index of each trace.
+        offsets: Start index of each ragged trace in the flat data plus the
+            total length, i.e. an array of n_traces + 1 increasing integers
+            starting at 0. Defaults to None, i.e. data is 2D.
+        spacing: Vertical distance between consecutive traces in data units.
+            Trace i is shifted by i * spacing. Defaults to None (no stacking).
+        colors: A single color or one color per trace. Defaults to the first
+            color of the property cycle.
+        linewidths: A single line width or one line width per trace, in
+            points. Defaults to rcParams["lines.linewidth"].
+        alpha: A single alpha value or one alpha value per trace.
+        **kwargs: Additional keyword arguments passed to `LineCollection`.
+
+    Returns:
+        The line collection holding all traces.
+
+    Raises:
+        ValueError: If the shapes of data, x and offsets do not match.
+    """
+    y = np.asarray(data, dtype=float)
+    if offsets is None:
+        segments = _dense_segments(y, x, spacing)
+    else:
+        segments = _ragged_segments(
+            y, x, np.asarray(offsets, dtype=np.intp), spacing
+        )
+    n_traces = len(segments)
+
+    if colors is None:
+        colors = get_default_colors()[0]
+    if linewidths is None:
+        linewidths = mpl.rcParams["lines.linewidth"]
+    rgba = to_rgba_array(colors)
+    if alpha is not None:
+        rgba = np.broadcast_to(rgba, (n_traces, 4)).copy()
+        rgba[:, 3] = alpha
+
+    collection = LineCollection(
+        segments,
+        colors=rgba,
+        linewidths=np.broadcast_to(np.asarray(linewidths, dtype=float), n_traces),
+        **kwargs,
+    )
+    ax.add_collection(collection, autolim=True)
+    ax.autoscale_view()
+    return collection
+
+
+def _dense_segments(
+    y: NDArray[np.float64], x: ArrayLike | None, spacing: float | None
+) -> list[NDArray[np.float64]]:
+    """Return one (n_samples, 2) segment per row of 2D trace data."""
+    if y.ndim != 2:
+        raise ValueError(
+            f"Data must be 2D when no offsets are given, got shape {y.shape}"
+        )
+    n_traces, n_samples = y.shape
+    x_arr = np.arange(n_samples, dtype=float) if x is None else np.asarray(x, float)
+    if x_arr.shape not in [(n_samples,), y.shape]:
+        raise ValueError(
+            f"x must have shape ({n_samples},) or {y.shape}, got {x_arr.shape}"
+        )
+
+    xy = np.empty((n_traces, n_samples, 2))
+    xy[:, :, 0] = x_arr
+    xy[:, :, 1] = y
+    if spacing is not None:
+        xy[:, :, 1] += spacing * np.arange(n_traces)[:, np.newaxis]
+    return list(xy)
+
+
+def _ragged_segments(
+    y: NDArray[np.float64],
+    x: ArrayLike | None,
+    offsets: NDArray[np.intp],
+    spacing: float | None,
+) -> list[NDArray[np.float64]]:
+    """Return one (n_samples_i, 2) segment per ragged trace."""
+    if y.ndim != 1:
+        raise ValueError(f"Data must be 1D when offsets are given, got {y.shape}")
+    if (
+        offsets.ndim != 1 or len(offsets) < 1 or offsets[0] != 0
+        or offsets[-1] != len(y) or np.any(np.diff(offsets) < 0)
+    ):
+        raise ValueError(
+            "offsets must be increasing integers starting at 0 and ending at "
+            f"the data length {len(y)}"
+        )
+
+    lengths = np.diff(offsets)
+    if x is None:
+        # Sample index within each trace
+        x_arr = np.arange(len(y), dtype=float) - np.repeat(offsets[:-1], lengths)
+    else:
+        x_arr = np.asarray(x, dtype=float)
+        if x_arr.shape != y.shape:
+            raise ValueError(
+                f"x must have the same shape as data {y.shape}, got {x_arr.shape}"
+            )
+
+    xy = np.column_stack((x_arr, y))
+    if spacing is not None:
+        xy[:, 1] += np.repeat(spacing * np.arange(len(lengths)), lengths)
+    return np.split(xy, offsets[1:-1])
@@ -7,12 +7,14 @@ Example utilities are available in the .examples submodule but not exposed here.
 # Core matplotlib helpers (used internally by the library)
 from .mpl import (
     adjust_axes_size,
+    axes_size_px,
     cm_to_axes_rel,
     cm_to_fig_rel,
     cm_to_inches,
     cm_to_pt,
     create_full_figure_axes,
     get_default_colors,
+    get_overlay_axes,
     get_pastel_colors,
     inches_to_cm,
     pt_to_cm,
@@ -21,12 +23,14 @@ from .mpl import (
 __all__ = [
     # MPL utilities (primarily for internal use)
     "adjust_axes_size",
+    "axes_size_px",
     "cm_to_axes_rel",
     "cm_to_fig_rel",
     "cm_to_inches",
     "cm_to_pt",
     "create_full_figure_axes",
     "get_default_colors",
+    "get_overlay_axes",
     "get_pastel_colors",
     "inches_to_cm",
     "pt_to_cm",
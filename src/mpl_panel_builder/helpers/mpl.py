@@ -13,6 +13,9 @@ from matplotlib.axes import Axes
 from matplotlib.figure import Figure, SubFigure
 from numpy.typing import NDArray
 
+# Label used to identify the shared overlay axes of a figure
+OVERLAY_AXES_LABEL = "mpl_panel_builder_overlay"
+
 
 def cm_to_inches(cm: float) -> float:
     """Convert centimeters to inches.
@@ -175,6 +178,28 @@ def cm_to_axes_rel(
     elif dim == "height":
         return float(fig_rel / ax_pos.height)
 
+def axes_size_px(ax: Axes, dpi: float) -> tuple[int, int]:
+    """Return the size of an axes in output pixels.
+
+    The size follows from the axes' physical size in the figure and the dpi 
+    the figure will be saved at, e.g. the configured output dpi.
+
+    Args:
+        ax: The matplotlib Axes object to get the size of.
+        dpi: The resolution in dots per inch.
+
+    Returns:
+        Tuple of (width, height) in pixels, each at least 1.
+    """
+    fig = ax.get_figure()
+    if fig is None:
+        raise ValueError("Axes must be attached to a figure")
+
+    ax_pos = ax.get_position()
+    width_in = cm_to_inches(fig_rel_to_cm(fig, ax_pos.width, "width"))
+    height_in = cm_to_inches(fig_rel_to_cm(fig, ax_pos.height, "height"))
+    return max(1, round(width_in * dpi)), max(1, round(height_in * dpi))
+
 def get_default_colors() -> list[str]:
     """Return the default Matplotlib colors in hex or named format.
 
@@ -218,6 +243,27 @@ def create_full_figure_axes(fig: Figure | SubFigure) -> Axes:
     ax.set(xlim=[0, 1], ylim=[0, 1])
     return ax
 
+def get_overlay_axes(fig: Figure | SubFigure) -> Axes:
+    """Return the shared overlay axes of a figure, creating it if needed.
+
+    The overlay is a full figure axes (see `create_full_figure_axes`) that is
+    shared by all features drawing in figure coordinates, so that the figure
+    does not accumulate one invisible axes per scale bar or debug element.
+
+    Args:
+        fig: Figure or SubFigure to get the overlay axes for.
+
+    Returns:
+        The shared overlay axes.
+    """
+    for ax in fig.axes:
+        if ax.get_label() == OVERLAY_AXES_LABEL:
+            return ax
+
+    ax = create_full_figure_axes(fig)
+    ax.set_label(OVERLAY_AXES_LABEL)
+    return ax
+
 def move_yaxis_right(ax: Axes) -> None:
     """Move the y-axis of the given Axes object to the right side.
 
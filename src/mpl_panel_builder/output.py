@@ -0,0 +1,860 @@
+"""Save-time processing of panels and reporting on what was saved."""
+
+import math
+import os
+import re
+import threading
+import uuid
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, BinaryIO, TypedDict, cast
+
+import matplotlib as mpl
+import matplotlib.colors as mcolors
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import Collection, QuadMesh
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+from matplotlib.spines import Spine
+from matplotlib.transforms import Bbox
+from matplotlib.typing import RcKeyType
+from numpy.typing import NDArray
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+# Raster formats encoded from a shared Agg render, with their PIL names
+RASTER_FORMATS = {
+    "png": "PNG",
+    "jpg": "JPEG",
+    "jpeg": "JPEG",
+    "tif": "TIFF",
+    "tiff": "TIFF",
+    "webp": "WEBP",
+}
+
+
+class ImageReport(TypedDict):
+    label: str
+    shape_before: tuple[int, ...]
+    shape_after: tuple[int, ...]
+    bytes_before: int
+    bytes_after: int
+
+
+# Rough size of one vertex or element in vector output: two coordinates
+# of about eight characters each, before compression
+VECTOR_BYTES_PER_ELEMENT = 16
+
+# Millimeters per point, the unit of vector output
+MM_PER_POINT = 25.4 / 72
+
+# SVG attributes holding coordinates in points
+_SVG_COORDINATE_ATTRIBUTES = re.compile(
+    rb'(\s(?:d|points|x|y|x1|y1|x2|y2|width|height)=")([^"]*)(")'
+)
+_SVG_NUMBER = re.compile(rb"-?\d+\.\d+")
+
+# Definitions that matplotlib references from <use> elements and clip paths
+_SVG_DEFINITIONS = [
+    re.compile(rb'\s*<path id="([^"]+)"( d="[^"]*"(?: style="[^"]*")?)\s*/>'),
+    re.compile(rb'\s*<clipPath id="([^"]+)">(.*?)</clipPath>', re.DOTALL),
+]
+
+# Metadata keys holding the time of saving, per vector format
+DATE_METADATA = {"pdf": "CreationDate", "svg": "Date"}
+
+# Images with more colors than this are not quantized to a palette, as they
+# are not line art and quantizing them is slow
+_NEAR_PALETTE_COLORS = 65536
+
+# Held while slimmed_vectors sets the global path simplification rcParams
+_SIMPLIFY_LOCK = threading.Lock()
+
+# SVG ids that matplotlib derives from a random salt unless svg.hashsalt is
+# set: a prefix for the kind of definition and 10 hex digits of a hash
+_SVG_HASHED_ID = re.compile(
+    rb' id="((?:[hpm]|image|Im_image|C[0-9a-f]+_[0-9a-f]+_)[0-9a-f]{10})"'
+)
+
+
+class RasterReport(TypedDict):
+    label: str
+    elements: int
+    pixels: int
+    vector_bytes_estimate: int
+
+
+class SaveReport(TypedDict):
+    files: list[str]
+    images: list[ImageReport]
+    rasterized: list[RasterReport]
+    timings: dict[str, float]
+    unchanged: list[str]
+
+
+def get_target_paths(path: Path, formats: Sequence[str]) -> list[Path]:
+    """Return the path of the file written for each format.
+
+    A single format keeps the path as given if it has an extension,
+    otherwise the extension is set, or replaced, by each format.
+
+    Args:
+        path: The path given to `save_panel`.
+        formats: The format of each file.
+
+    Returns:
+        One path per format.
+    """
+    if len(formats) == 1 and path.suffix != '':
+        return [path]
+    return [path.with_suffix(f'.{fmt}') for fmt in formats]
+
+
+def render_rgba(fig: Figure, dpi: float) -> NDArray[np.uint8]:
+    """Render a figure with Agg and return its RGBA buffer without copying.
+
+    The figure is rendered by `savefig` on a temporary Agg canvas at the
+    given dpi, so the `savefig.*` rcParams (facecolor, edgecolor,
+    transparent, bbox and pad_inches) apply as when saving a raster file.
+    The figure's own canvas is restored afterwards. The returned array is a
+    view of the buffer of the temporary renderer, which it keeps alive, so
+    later renders do not overwrite it.
+
+    Args:
+        fig: The figure to render.
+        dpi: The resolution in dots per inch.
+
+    Returns:
+        Array of shape (height, width, 4).
+    """
+    original_canvas = fig.canvas
+    FigureCanvasAgg(fig)
+    capture = _BufferCapture()
+    try:
+        fig.savefig(cast(BinaryIO, capture), format="rgba", dpi=dpi)
+    finally:
+        fig.set_canvas(original_canvas)
+    assert capture.buffer is not None
+    return np.asarray(capture.buffer)
+
+
+class _BufferCapture:
+    """File-like target of `savefig` that keeps the Agg buffer it is given.
+
+    The rgba format writes the renderer's buffer as a single memoryview of
+    shape (height, width, 4), which is kept instead of copied.
+    """
+
+    def __init__(self) -> None:
+        self.buffer: memoryview | None = None
+
+    def write(self, data: memoryview) -> None:
+        self.buffer = data
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return 0
+
+
+def encode_raster(
+    rgba: NDArray[np.uint8],
+    path: Path | BinaryIO,
+    fmt: str,
+    dpi: float,
+    *,
+    alpha: bool = True,
+    palette_max_colors: int = 256,
+    palette_max_error: int = 0,
+    compress_level: int = 6,
+    optimize: bool = False,
+    webp_lossless: bool = False,
+    quality: int = 75,
+    metadata: dict[str, str | None] | None = None,
+) -> None:
+    """Encode an RGBA buffer to a raster image file with Pillow.
+
+    The buffer is encoded as is, without an intermediate file. Formats
+    without alpha channel (JPEG), and all formats if alpha is False, are
+    composited onto white and saved as RGB, as matplotlib does. PNGs carry the
+    same text metadata as PNGs saved by matplotlib. PNGs with at most
+    `palette_max_colors` distinct colors are saved losslessly as palette
+    images with one byte per pixel. If `palette_max_error` is above 0, PNGs
+    near such a palette, as line art with antialiased edges and text
+    usually is, are also quantized to it, if that changes no pixel by more
+    than `palette_max_error` levels per channel; this is lossy and off by
+    default.
+
+    Args:
+        rgba: Array of shape (height, width, 4).
+        path: The file, or binary file object, to write.
+        fmt: One of the keys of `RASTER_FORMATS`.
+        dpi: The resolution stored in the file.
+        alpha: Whether to keep the alpha channel. Defaults to True.
+        palette_max_colors: Number of colors, at most 256, of the palette
+            of PNGs, or 0 to never use a palette. Defaults to 256.
+        palette_max_error: Largest change of any channel of any pixel, from
+            0 to 255, allowed when quantizing PNGs to a palette, or 0 to
+            use only exact palettes. Defaults to 0.
+        compress_level: zlib compression level of PNGs, from 0 (none) to 9
+            (smallest). Defaults to 6.
+        optimize: Whether to let Pillow search for the smallest PNG
+            encoding, which is slower. Defaults to False.
+        webp_lossless: Whether to save WebP losslessly. Defaults to False.
+        quality: Quality of lossy JPEG and WebP, from 0 to 100, or the
+            effort of lossless WebP. Defaults to 75.
+        metadata: PNG text entries added to, or with None values removed
+            from, matplotlib's "Software" entry. Other formats ignore it.
+            Defaults to None.
+    """
+    image = Image.fromarray(rgba, "RGBA")
+    pil_format = RASTER_FORMATS[fmt]
+    if not alpha or pil_format == "JPEG":
+        background = Image.new("RGBA", image.size, "white")
+        image = Image.alpha_composite(background, image)
+
+    params: dict[str, Any] = {"dpi": (dpi, dpi)}
+    if pil_format == "PNG":
+        params.update(compress_level=compress_level, optimize=optimize)
+        params["pnginfo"] = PngInfo()
+        for key, value in png_text(metadata).items():
+            params["pnginfo"].add_text(key, value)
+        palette_image = _palette_image(
+            image, min(palette_max_colors, 256), palette_max_error
+        )
+        if palette_image is not None:
+            image, transparency = palette_image
+            if alpha and transparency is not None:
+                params["transparency"] = transparency
+    elif pil_format == "WEBP":
+        params.update(lossless=webp_lossless, quality=quality)
+    elif pil_format == "JPEG":
+        params.update(quality=quality)
+    if image.mode == "RGBA" and (not alpha or pil_format == "JPEG"):
+        image = image.convert("RGB")
+    image.save(path, format=pil_format, **params)
+
+
+def png_text(metadata: dict[str, str | None] | None = None) -> dict[str, str]:
+    """Return the text entries of a PNG, as matplotlib writes them.
+
+    Args:
+        metadata: Entries added to, or with None values removed from,
+            matplotlib's "Software" entry. Defaults to None.
+
+    Returns:
+        The entries by key.
+    """
+    text = {
+        "Software": (
+            f"Matplotlib version{mpl.__version__}, https://matplotlib.org/"
+        ),
+        **(metadata or {}),
+    }
+    return {key: value for key, value in text.items() if value is not None}
+
+
+def _palette_image(
+    image: Image.Image, max_colors: int, max_error: int
+) -> tuple[Image.Image, bytes | None] | None:
+    """Return a palette version of an RGBA image and its alphas.
+
+    Images with at most max_colors colors are converted exactly. Images
+    with up to `_NEAR_PALETTE_COLORS` colors, such as antialiased line art,
+    are quantized to max_colors colors without dithering, if no channel of
+    any pixel then deviates by more than max_error levels. Returns None
+    otherwise. The alphas are None if the image is opaque.
+    """
+    if max_colors <= 0:
+        return None
+    colors = image.getcolors(max_colors)
+    if colors is None:
+        if max_error <= 0 or image.getcolors(_NEAR_PALETTE_COLORS) is None:
+            return None
+        return _quantized_image(image, max_colors, max_error)
+    palette = np.array([color for _, color in colors], dtype=np.uint8)
+    # Pack each RGBA pixel into one integer to look up its palette index
+    packed_palette = palette.view(np.uint32).ravel()
+    order = np.argsort(packed_palette)
+    pixels = np.asarray(image).view(np.uint32)[..., 0]
+    indices = order[np.searchsorted(packed_palette[order], pixels)]
+    palette_image = Image.fromarray(indices.astype(np.uint8), "P")
+    palette_image.putpalette(palette[:, :3].tobytes(), rawmode="RGB")
+    alphas = palette[:, 3]
+    return palette_image, None if alphas.min() == 255 else alphas.tobytes()
+
+
+def _quantized_image(
+    image: Image.Image, max_colors: int, max_error: int
+) -> tuple[Image.Image, bytes | None] | None:
+    """Return a quantized palette version of an RGBA image and its alphas.
+
+    See `_palette_image`. Opaque images are quantized as RGB by maximum
+    coverage, which keeps the colors of thin lines; Pillow quantizes images
+    with transparency by octree only.
+    """
+    opaque = image.getchannel("A").getextrema()[0] == 255
+    source = image.convert("RGB") if opaque else image
+    quantized = source.quantize(
+        max_colors,
+        method=(
+            Image.Quantize.MAXCOVERAGE if opaque else Image.Quantize.FASTOCTREE
+        ),
+        dither=Image.Dither.NONE,
+    )
+    error = np.abs(
+        np.asarray(quantized.convert(source.mode), dtype=np.int16)
+        - np.asarray(source)
+    ).max()
+    if error > max_error:
+        return None
+    if opaque:
+        return quantized, None
+    palette = np.frombuffer(
+        bytes(quantized.getpalette("RGBA") or []), dtype=np.uint8
+    ).reshape(-1, 4)
+    quantized.putpalette(palette[:, :3].tobytes(), rawmode="RGB")
+    return quantized, palette[:, 3].tobytes()
+
+
+def deterministic_metadata(
+    fmt: str, metadata: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Return savefig metadata without the time of saving.
+
+    Matplotlib writes the current time into PDF and SVG files unless
+    SOURCE_DATE_EPOCH is set, in which case that time is used and kept.
+
+    Args:
+        fmt: The vector format to save.
+        metadata: Metadata given by the user, which takes precedence.
+            Defaults to None.
+
+    Returns:
+        Metadata to pass to `savefig`.
+    """
+    metadata = dict(metadata or {})
+    if os.getenv("SOURCE_DATE_EPOCH") is None and fmt in DATE_METADATA:
+        metadata.setdefault(DATE_METADATA[fmt], None)
+    return metadata
+
+
+def fix_ps_date(data: bytes) -> bytes:
+    """Replace the creation date of PostScript output by a fixed date.
+
+    The PostScript backend has no metadata entry for its creation date, so
+    without SOURCE_DATE_EPOCH the date comment is set to the Unix epoch.
+
+    Args:
+        data: The PostScript or EPS file contents.
+
+    Returns:
+        The contents with a fixed creation date.
+    """
+    if os.getenv("SOURCE_DATE_EPOCH") is not None:
+        return data
+    return re.sub(
+        rb"^%%CreationDate: .*$", b"%%CreationDate: Thu Jan 01 00:00:00 1970",
+        data, count=1, flags=re.MULTILINE,
+    )
+
+
+def deterministic_svg_ids(data: bytes) -> bytes:
+    """Replace the randomly salted ids of SVG output by numbered ids.
+
+    Without `svg.hashsalt`, matplotlib hashes the ids of markers, clip
+    paths, hatches and images with a random salt. Each such id is replaced,
+    together with its references, by its prefix and the order of its first
+    appearance, which keeps the ids unique without setting the global
+    rcParam while saving.
+
+    Args:
+        data: The SVG file contents.
+
+    Returns:
+        The contents with numbered ids.
+    """
+    ids: dict[bytes, bytes] = {}
+    for match in _SVG_HASHED_ID.finditer(data):
+        oid = match.group(1)
+        ids.setdefault(oid, oid[:-10] + b"%010x" % len(ids))
+    if not ids:
+        return data
+    pattern = re.compile(
+        rb'(?<=["#])(' + b"|".join(map(re.escape, ids)) + rb')(?=[")])'
+    )
+    return pattern.sub(lambda match: ids[match.group(1)], data)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write data to a file unless the file already holds exactly that data.
+
+    Leaving unchanged files untouched keeps their modification time, so
+    incremental builds depending on them are not triggered. Changed files
+    are written to a temporary file and moved into place.
+
+    Args:
+        path: The file to write.
+        data: The new file contents.
+
+    Returns:
+        Whether the file was written.
+    """
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "xb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+@contextmanager
+def resampled_images(
+    fig: Figure, dpi: float, method: str = "area"
+) -> Generator[list[ImageReport], None, None]:
+    """Temporarily resample all axes images to their on-page pixel size.
+
+    Each `AxesImage` is cropped to the visible part of the axes and reduced
+    to the number of pixels its on-page size spans at `dpi`. Images that
+    already have at most that many pixels are left as is. The original data,
+    extent and axes limits are restored on exit. Other rasterized artists
+    need no resampling, as they are already rendered at the savefig dpi.
+
+    Args:
+        fig: The figure whose images to resample.
+        dpi: The output resolution in dots per inch.
+        method: "area" to average all pixels covered by an output pixel, or
+            "nearest" to pick the pixel at its center. Defaults to "area".
+
+    Yields:
+        A list with a report for each resampled image.
+
+    Raises:
+        ValueError: If method is not "area" or "nearest".
+    """
+    valid_methods = ["area", "nearest"]
+    if method not in valid_methods:
+        raise ValueError(
+            f"Invalid method: {method!r}. Must be one of: {valid_methods!r}."
+        )
+
+    reports: list[ImageReport] = []
+    originals: list[tuple[AxesImage, Any, tuple[float, float, float, float]]] = []
+    axes_states: dict[Any, tuple[Any, ...]] = {}
+    try:
+        for ax in fig.axes:
+            for image in ax.get_images():
+                # Subclasses such as NonUniformImage have no regular pixel grid
+                if type(image) is not AxesImage or not image.get_visible():
+                    continue
+                resampled = _resample_image(image, dpi / fig.dpi, method)
+                if resampled is None:
+                    continue
+                data, extent = resampled
+                if ax not in axes_states:
+                    axes_states[ax] = (
+                        ax.get_xlim(), ax.get_ylim(),
+                        ax.get_autoscalex_on(), ax.get_autoscaley_on(),
+                    )
+                    ax.set_autoscale_on(False)
+                original = cast(NDArray[Any], image.get_array())
+                originals.append((image, original, image.get_extent()))
+                image.set_data(data)
+                image.set_extent(extent)
+                reports.append({
+                    "label": str(image.get_label()),
+                    "shape_before": original.shape,
+                    "shape_after": data.shape,
+                    "bytes_before": int(original.nbytes),
+                    "bytes_after": int(data.nbytes),
+                })
+        yield reports
+    finally:
+        for image, original, extent in reversed(originals):
+            image.set_data(original)
+            image.set_extent(extent)
+        for ax, (xlim, ylim, autoscalex, autoscaley) in axes_states.items():
+            ax.set_xlim(xlim)
+            ax.set_ylim(ylim)
+            ax.set_autoscalex_on(autoscalex)
+            ax.set_autoscaley_on(autoscaley)
+
+
+@contextmanager
+def rasterized_dense_artists(
+    fig: Figure, dpi: float, threshold: int
+) -> Generator[list[RasterReport], None, None]:
+    """Temporarily rasterize the dense data artists of a figure.
+
+    The vector complexity of every line, collection and patch in the axes is
+    estimated as its number of vertices or elements, e.g. points of a line
+    or markers of a scatter plot. Artists with more than `threshold`
+    elements are marked `rasterized=True`, so that vector backends embed
+    them as an image at the savefig dpi. Axes, spines, text, scale bars,
+    labels and images are not affected, and neither is raster output. The
+    previous rasterization settings are restored on exit.
+
+    The report gives the elements and rasterized pixels of each artist, and
+    estimates the size its vector output would have taken as the elements at
+    `VECTOR_BYTES_PER_ELEMENT` each. The file shrinks by roughly this much,
+    minus the compressed size of the embedded image.
+
+    Args:
+        fig: The figure whose artists to rasterize.
+        dpi: The output resolution in dots per inch.
+        threshold: Elements above which an artist is rasterized.
+
+    Yields:
+        A list with a report for each rasterized artist.
+    """
+    reports: list[RasterReport] = []
+    rasterized: list[Artist] = []
+    try:
+        for ax in fig.axes:
+            for artist in ax.get_children():
+                if artist.get_rasterized() or not artist.get_visible():
+                    continue
+                elements = _vector_elements(artist)
+                if elements <= threshold:
+                    continue
+                artist.set_rasterized(True)
+                rasterized.append(artist)
+                extent = Bbox.intersection(
+                    artist.get_window_extent(), ax.bbox
+                )
+                pixels = 0 if extent is None else int(
+                    extent.width * extent.height * (dpi / fig.dpi) ** 2
+                )
+                reports.append({
+                    "label": f"{type(artist).__name__}({artist.get_label()})",
+                    "elements": elements,
+                    "pixels": pixels,
+                    "vector_bytes_estimate": (
+                        elements * VECTOR_BYTES_PER_ELEMENT
+                    ),
+                })
+        yield reports
+    finally:
+        for artist in rasterized:
+            artist.set_rasterized(False)
+
+
+@contextmanager
+def slimmed_vectors(
+    fig: Figure, tolerance_mm: float
+) -> Generator[None, None, None]:
+    """Temporarily simplify paths and merge lines within a tolerance.
+
+    Paths are simplified by matplotlib with `path.simplify_threshold` set to
+    the tolerance in points, the unit of vector output, at most the one
+    point matplotlib allows. Only `path.simplify` and
+    `path.simplify_threshold` are set, and restored on exit unless changed
+    meanwhile, so other rcParams set by other threads are left alone; saves
+    that slim at the same time take turns. Lines of an axes with the same
+    style that are drawn one after another, e.g. the lines of scale bars
+    whose labels are drawn above them, are drawn as one line, with NaN
+    separating their data, so that vector output holds one path instead of
+    one per line. Lines with transparency are not merged, as their overlaps
+    would blend differently. The line data is restored on exit.
+
+    Args:
+        fig: The figure to slim.
+        tolerance_mm: The tolerated deviation on the page in millimeters.
+
+    Yields:
+        None.
+    """
+    threshold = min(tolerance_mm / MM_PER_POINT, 1.0)
+    merged: list[tuple[Line2D, Any, Any, list[Line2D]]] = []
+    simplify: dict[RcKeyType, Any] = {
+        'path.simplify': True, 'path.simplify_threshold': threshold,
+    }
+    with _SIMPLIFY_LOCK:
+        previous: dict[RcKeyType, Any] = {
+            key: mpl.rcParams[key] for key in simplify
+        }
+        try:
+            mpl.rcParams.update(simplify)
+            for ax in fig.axes:
+                for run in _same_style_runs(ax.get_children()):
+                    first = run[0]
+                    merged.append((
+                        first, first.get_xdata(orig=True),
+                        first.get_ydata(orig=True), run[1:],
+                    ))
+                    first.set_data(
+                        _nan_joined([line.get_xdata(orig=False) for line in run]),
+                        _nan_joined([line.get_ydata(orig=False) for line in run]),
+                    )
+                    for line in run[1:]:
+                        line.set_visible(False)
+            yield
+        finally:
+            for key, value in previous.items():
+                if mpl.rcParams[key] == simplify[key]:
+                    mpl.rcParams[key] = value
+            for first, xdata, ydata, others in reversed(merged):
+                first.set_data(xdata, ydata)
+                for line in others:
+                    line.set_visible(True)
+
+
+def _nan_joined(arrays: Sequence[Any]) -> NDArray[np.float64]:
+    """Concatenate arrays with a NaN between each, which breaks a line."""
+    parts: list[NDArray[np.float64]] = []
+    for array in arrays:
+        parts += [np.array([np.nan]), np.asarray(array, dtype=float)]
+    return np.concatenate(parts[1:])
+
+
+def _same_style_runs(artists: Sequence[Artist]) -> list[list[Line2D]]:
+    """Return the runs of lines with the same style drawn one after another.
+
+    Axes draw their children sorted by zorder, so runs are taken in that
+    order. Artists at another zorder, such as the labels of scale bars, are
+    drawn before or after all lines of a run and do not break it, and
+    hidden artists draw nothing. Other artists in between do, as the lines
+    merged around them would change what is drawn on top.
+    """
+    runs: list[list[Line2D]] = []
+    run: list[Line2D] = []
+    run_key: tuple[Any, ...] | None = None
+    in_draw_order = sorted(artists, key=attrgetter('zorder'))
+    for artist in [*in_draw_order, None]:
+        if artist is not None and not artist.get_visible():
+            continue
+        key = None
+        if (
+            isinstance(artist, Line2D)
+            and artist.get_alpha() in (None, 1)
+            and not artist.get_path_effects()
+            and artist.get_markevery() is None
+        ):
+            key = _line_style_key(artist)
+        if key is not None and key == run_key:
+            run.append(cast(Line2D, artist))
+            continue
+        if len(run) > 1:
+            runs.append(run)
+        run = [cast(Line2D, artist)] if key is not None else []
+        run_key = key
+    return runs
+
+
+def _line_style_key(line: Line2D) -> tuple[Any, ...]:
+    """Return a hashable description of everything but the data of a line."""
+    return (
+        mcolors.to_rgba(line.get_color()), line.get_linewidth(),
+        line.get_linestyle(), line.get_drawstyle(), line.get_marker(),
+        line.get_markersize(), mcolors.to_rgba(line.get_markerfacecolor()),
+        mcolors.to_rgba(line.get_markeredgecolor()),
+        line.get_markeredgewidth(), line.get_zorder(),
+        line.get_solid_capstyle(), line.get_solid_joinstyle(),
+        line.get_dash_capstyle(), line.get_dash_joinstyle(),
+        line.get_antialiased(), line.get_rasterized(), line.get_snap(),
+        line.get_gid(), line.get_url(), line.get_clip_on(),
+        id(line.get_transform()), id(line.get_clip_path()),
+        # Each line has its own clip box object, so compare their bounds
+        None if (clip_box := line.get_clip_box()) is None else clip_box.bounds,
+    )
+
+
+def slim_svg(data: bytes, decimals: int) -> bytes:
+    """Round SVG coordinates and merge identical definitions.
+
+    Coordinates of paths, uses and shapes are rounded to the given number
+    of decimals, in points. Definitions of markers, glyphs and clip paths
+    that are identical after rounding are merged into one and the
+    references to them updated. Matplotlib already shares definitions that
+    are exactly equal.
+
+    Args:
+        data: The SVG file contents.
+        decimals: Decimals to keep.
+
+    Returns:
+        The slimmed SVG file contents.
+    """
+    def round_number(match: re.Match[bytes]) -> bytes:
+        text = f"{float(match.group()):.{decimals}f}"
+        if "." in text:
+            text = text.rstrip("0").rstrip(".")
+        return b"0" if text == "-0" else text.encode()
+
+    data = _SVG_COORDINATE_ATTRIBUTES.sub(
+        lambda match: match.group(1)
+        + _SVG_NUMBER.sub(round_number, match.group(2))
+        + match.group(3),
+        data,
+    )
+
+    replacements: dict[bytes, bytes] = {}
+    for pattern in _SVG_DEFINITIONS:
+        first_ids: dict[bytes, bytes] = {}
+        for match in pattern.finditer(data):
+            def_id, content = match.group(1), match.group(2)
+            first_id = first_ids.setdefault(content, def_id)
+            if first_id != def_id:
+                replacements[def_id] = first_id
+
+        def drop_duplicate(match: re.Match[bytes]) -> bytes:
+            return b"" if match.group(1) in replacements else match.group()
+
+        data = pattern.sub(drop_duplicate, data)
+    if replacements:
+        ids = b"|".join(re.escape(def_id) for def_id in replacements)
+        data = re.sub(
+            rb'(href="#|url\(#)(' + ids + rb')(?=[")])',
+            lambda match: match.group(1) + replacements[match.group(2)],
+            data,
+        )
+    return data
+
+
+def svg_decimals(tolerance_mm: float) -> int:
+    """Return the decimals of points that keep rounding within a tolerance.
+
+    Args:
+        tolerance_mm: The tolerated deviation on the page in millimeters.
+
+    Returns:
+        The number of decimals, rounding by at most the tolerance.
+    """
+    return max(0, math.ceil(-math.log10(2 * tolerance_mm / MM_PER_POINT)))
+
+
+def _vector_elements(artist: Artist) -> int:
+    """Return the number of vertices or elements an artist draws as vectors.
+
+    Artists other than lines, collections and data patches count as zero.
+    """
+    if isinstance(artist, Line2D):
+        return np.shape(artist.get_xydata())[0]
+    if isinstance(artist, QuadMesh):
+        coordinates = artist.get_coordinates()
+        return (coordinates.shape[0] - 1) * (coordinates.shape[1] - 1)
+    if isinstance(artist, Collection):
+        # Markers reused at many offsets are written once and referenced
+        n_offsets = np.shape(artist.get_offsets())[0]
+        paths = artist.get_paths()
+        if n_offsets > len(paths):
+            return n_offsets
+        return sum(np.shape(path.vertices)[0] for path in paths)
+    if isinstance(artist, Patch) and not isinstance(artist, Spine):
+        return np.shape(artist.get_path().vertices)[0]
+    return 0
+
+
+def resample_array(
+    array: NDArray[Any], shape: tuple[int, int], method: str = "area"
+) -> NDArray[Any]:
+    """Reduce the first two dimensions of an image array to a smaller shape.
+
+    With "area", each output pixel is the mean of the input pixels it covers.
+    NaN and masked pixels are ignored, and output pixels covering only such
+    pixels are masked. Integer arrays, e.g. RGB(A) uint8 images, are rounded
+    back to their dtype.
+
+    Args:
+        array: Array of shape (rows, columns) or (rows, columns, channels).
+        shape: The output (rows, columns), at most the input size.
+        method: "area" or "nearest". Defaults to "area".
+
+    Returns:
+        The resampled array, masked if the input is masked or has NaNs.
+    """
+    n_rows, n_cols = array.shape[:2]
+    if method == "nearest":
+        rows = ((np.arange(shape[0]) + 0.5) * n_rows / shape[0]).astype(np.intp)
+        cols = ((np.arange(shape[1]) + 0.5) * n_cols / shape[1]).astype(np.intp)
+        return array[rows][:, cols]
+
+    row_edges = np.linspace(0, n_rows, shape[0] + 1).astype(np.intp)[:-1]
+    col_edges = np.linspace(0, n_cols, shape[1] + 1).astype(np.intp)[:-1]
+    masked = np.ma.masked_invalid(array.astype(np.float64, copy=False))
+    valid = (~np.ma.getmaskarray(masked)).astype(np.float64)
+    values = masked.filled(0.0)
+
+    def _block_sums(a: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Sum the pixels of each output pixel via reduceat on both axes."""
+        return np.add.reduceat(np.add.reduceat(a, row_edges, axis=0), col_edges, axis=1)
+
+    counts = _block_sums(valid)
+    empty = counts == 0
+    means = _block_sums(values) / np.maximum(counts, 1)
+    if np.issubdtype(array.dtype, np.integer):
+        means = np.rint(means)
+    result = means.astype(array.dtype)
+    if np.ma.is_masked(masked):
+        return np.ma.masked_array(result, mask=empty)
+    return result
+
+
+def _resample_image(
+    image: AxesImage, scale: float, method: str
+) -> tuple[NDArray[Any], tuple[float, float, float, float]] | None:
+    """Return the visible part of an image at its on-page size, if smaller.
+
+    Args:
+        image: The image to resample.
+        scale: The number of output pixels per display pixel.
+        method: "area" or "nearest".
+
+    Returns:
+        Tuple of (data, extent), or None if no resampling is needed.
+    """
+    ax = image.axes
+    array = image.get_array()
+    if array is None or np.ndim(array) not in [2, 3]:
+        return None
+    n_rows, n_cols = np.shape(array)[:2]
+    left, right, bottom, top = image.get_extent()
+    # Row 0 is at the top of the extent for origin "upper", else at the bottom
+    y_first, y_last = (top, bottom) if image.origin == "upper" else (bottom, top)
+
+    def _x(col: float) -> float:
+        """Return the x coordinate of a column edge."""
+        return left + (right - left) * col / n_cols
+
+    def _y(row: float) -> float:
+        """Return the y coordinate of a row edge."""
+        return y_first + (y_last - y_first) * row / n_rows
+
+    def _index_range(
+        lim: tuple[float, float], first: float, last: float, n: int
+    ) -> tuple[int, int]:
+        """Return the index range of the pixels visible within the limits."""
+        i0, i1 = sorted((value - first) / (last - first) * n for value in lim)
+        return max(math.floor(i0), 0), min(math.ceil(i1), n)
+
+    c0, c1 = _index_range(ax.get_xlim(), left, right, n_cols)
+    r0, r1 = _index_range(ax.get_ylim(), y_first, y_last, n_rows)
+    if c1 <= c0 or r1 <= r0:
+        return None
+
+    # On-page size of the visible part in output pixels
+    corners = ax.transData.transform([[_x(c0), _y(r0)], [_x(c1), _y(r1)]])
+    width_px, height_px = np.abs(corners[1] - corners[0]) * scale
+    shape = (
+        min(max(math.ceil(height_px), 1), r1 - r0),
+        min(max(math.ceil(width_px), 1), c1 - c0),
+    )
+    if shape == (n_rows, n_cols):
+        return None
+
+    data = resample_array(np.ma.asarray(array)[r0:r1, c0:c1], shape, method)
+    if image.origin == "upper":
+        return data, (_x(c0), _x(c1), _y(r1), _y(r0))
+    return data, (_x(c0), _x(c1), _y(r0), _y(r1))
@@ -1,25 +1,75 @@
 """Core panel creation and management functions."""
 
+import atexit
+import copy
+import io
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, Literal
 
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.axes import Axes
+from matplotlib.backend_bases import FigureCanvasBase
 from matplotlib.figure import Figure
+from numpy.typing import NDArray
 
-from .config import get_config
+from .config import Config, RasterConfig, get_config, use_config
+from .features.gridlines import debug_visibility
 from .helpers.mpl import cm_to_inches
+from .output import (
+    RASTER_FORMATS,
+    SaveReport,
+    deterministic_metadata,
+    deterministic_svg_ids,
+    encode_raster,
+    fix_ps_date,
+    get_target_paths,
+    rasterized_dense_artists,
+    render_rgba,
+    resampled_images,
+    slim_svg,
+    slimmed_vectors,
+    svg_decimals,
+    write_if_changed,
+)
+from .tiled import TILED_FORMATS, save_tiled
 
 
-def create_panel(rows: int = 1, cols: int = 1) -> tuple[Figure, list[list[Axes]]]:
+def create_panel(
+    rows: int = 1,
+    cols: int = 1,
+    colorbar: Literal["left", "right", "bottom", "top"] | None = None,
+) -> tuple[Figure, list[list[Axes]]]:
     """Creates figure and axes grid using global config.
     
     Args:
         rows: Number of rows in axes grid
         cols: Number of columns in axes grid
+        colorbar: Side of the axes grid on which to reserve space for shared 
+            colorbars (see `features.add_shared_colorbar`). The reserved space 
+            equals the configured colorbar width plus separation. Defaults to 
+            None, i.e. no space is reserved.
         
     Returns:
         Tuple of (figure, axes_grid)
+        
+    Raises:
+        ValueError: If colorbar is not None or one of "left", "right", 
+            "bottom", "top".
     """
+    valid_positions = ["left", "right", "bottom", "top"]
+    if colorbar is not None and colorbar not in valid_positions:
+        raise ValueError(
+            f"Invalid colorbar position: {colorbar!r}. "
+            f"Must be None or one of: {valid_positions!r}."
+        )
+    
     config = get_config()
     
     # Get dimensions from config
@@ -44,6 +94,21 @@ def create_panel(rows: int = 1, cols: int = 1) -> tuple[Figure, list[list[Axes]]
         panel_dims['height_cm'] - margins['top_cm'] - margins['bottom_cm']
     ) / panel_dims['height_cm']
     
+    # Reserve space for shared colorbars next to the axes grid
+    if colorbar is not None:
+        colorbar_config = config['features']['colorbar']
+        colorbar_cm = colorbar_config['width_cm'] + colorbar_config['separation_cm']
+        if colorbar in ["left", "right"]:
+            colorbar_rel = colorbar_cm / panel_dims['width_cm']
+            plot_width_rel -= colorbar_rel
+            if colorbar == "left":
+                plot_left_rel += colorbar_rel
+        else:
+            colorbar_rel = colorbar_cm / panel_dims['height_cm']
+            plot_height_rel -= colorbar_rel
+            if colorbar == "bottom":
+                plot_bottom_rel += colorbar_rel
+    
     # Convert separation to relative coordinates
     sep_x_rel = axes_sep['x_cm'] / panel_dims['width_cm']
     sep_y_rel = axes_sep['y_cm'] / panel_dims['height_cm']
@@ -69,7 +134,9 @@ def create_panel(rows: int = 1, cols: int = 1) -> tuple[Figure, list[list[Axes]]
     return fig, axs
 
 def create_stacked_panel(
-    rows: int = 1, cols: int = 1
+    rows: int = 1,
+    cols: int = 1,
+    colorbar: Literal["left", "right", "bottom", "top"] | None = None,
 ) -> tuple[Figure, list[list[Axes]]]:
     """Creates figure and axes grid with stacked spacing using global config.
     
@@ -80,6 +147,8 @@ def create_stacked_panel(
     Args:
         rows: Number of rows in axes grid
         cols: Number of columns in axes grid
+        colorbar: Side of the axes grid on which to reserve space for shared 
+            colorbars. Defaults to None, i.e. no space is reserved.
         
     Returns:
         Tuple of (figure, axes_grid)
@@ -100,25 +169,288 @@ def create_stacked_panel(
     
     try:
         # Use existing create_panel function
-        return create_panel(rows, cols)
+        return create_panel(rows, cols, colorbar)
     finally:
         # Restore original axes_separation
         config['panel']['axes_separation'] = original_axes_sep
 
-def save_panel(fig: Figure, filepath: str) -> None:
+def save_panel(
+    fig: Figure,
+    filepath: str | BinaryIO,
+    debug: bool | None = None,
+    formats: Sequence[str | tuple[str, float]] | None = None,
+    profile: str | None = None,
+    metadata: dict[str, Any] | None = None,
+) -> SaveReport:
     """Saves panel using global config.
     
+    By default, one file is written in `output.format` at `output.dpi`. 
+    Several files can be written in one call by giving `formats`, or the name 
+    of a profile in `output.profiles`, which is a list of 
+    `{'format': ..., 'dpi': ...}` entries. The work shared by all formats is 
+    then done once: debug gridlines and image resampling are applied once, 
+    raster formats (PNG, JPEG, TIFF, WebP) with the same dpi share a single 
+    Agg render by `savefig`, which applies the `savefig.*` rcParams, and 
+    their encoders run in background threads while vector formats are 
+    written.
+    
+    If `output.resample_images` is "area" or "nearest", every axes image is
+    temporarily reduced to the pixel size of its on-page extent at the 
+    (highest) output dpi while saving, which keeps vector files small when 
+    large arrays are shown in small axes.
+    
+    If `output.rasterize_threshold` is above 0, lines, collections and 
+    patches with more vertices or elements than the threshold are 
+    rasterized at the output dpi in vector formats, while axes, text, scale 
+    bars and labels stay vector, which keeps files with dense data small.
+    
+    If `output.vector_tolerance_mm` is above 0, vector formats are slimmed 
+    within that tolerance on the page: paths are simplified accordingly, 
+    consecutive lines with the same style, such as scale bars, are merged 
+    into one path, and SVG coordinates are rounded and identical SVG 
+    definitions shared.
+    
+    If `output.deterministic` is True, the same figure gives the same bytes 
+    on every run: the time of saving is left out of PDF and SVG metadata and 
+    fixed in PostScript (unless SOURCE_DATE_EPOCH is set, whose time is then 
+    used), and SVG ids are numbered unless `svg.hashsalt` is set. Files 
+    that already hold exactly the new bytes are not rewritten, so their 
+    modification time is kept.
+    
+    If `output.tile_height_px` is above 0, PNG and TIFF are rendered in 
+    strips of that many rows by `output.tile_workers` worker processes (0 
+    for one per CPU) and streamed into the file, so poster-size panels never 
+    need a buffer of the full image. The figure must then be picklable; see 
+    `tiled.save_tiled`.
+    
+    Instead of a path, a binary file object, e.g. `io.BytesIO` or an HTTP 
+    response stream, can be given to write a single format to it without 
+    touching the filesystem; see also `render_panel`.
+    
     Args:
         fig: Matplotlib figure to save
-        filepath: Full path including filename and extension
+        filepath: Full path including filename and extension, or a binary 
+            file object. When saving several formats to a path, the 
+            extension is replaced by each format.
+        debug: Whether to include the debug gridlines in the saved file. True
+            shows them (drawing them if needed), False hides them, and None
+            saves the figure as is. The figure itself is left unchanged.
+        formats: Formats to save, each a format name using `output.dpi` or a 
+            (format, dpi) tuple. Defaults to None, i.e. `output.format`.
+        profile: Name of a profile in `output.profiles` to save instead of 
+            formats. Defaults to None.
+        metadata: Metadata passed to `savefig` for vector formats, and 
+            written as text entries into PNGs, e.g. {'Title': ...}. Other 
+            raster formats ignore it. Defaults to None.
+        
+    Returns:
+        Report with the saved files, the resampled images including their 
+        array size in bytes before and after resampling, the rasterized 
+        artists with an estimate of their vector size, and the time in 
+        seconds spent on each file. Raster timings include the full Agg 
+        render they share with other formats at the same dpi. Files left 
+        untouched as their contents were unchanged are listed as unchanged.
         
     Raises:
-        ValueError: If filepath contains parent directory references (..)
+        ValueError: If filepath contains parent directory references (..), 
+            if both formats and profile are given or the profile is unknown, 
+            or if several formats are saved to a file object
         OSError: If file or directory operations fail
     """
     config = get_config()
     output_config = config['output']
+    targets = _get_save_targets(formats, profile)
+    
+    target_paths: list[Path | BinaryIO]
+    if isinstance(filepath, str):
+        target_paths = list(_prepare_save_path(filepath, targets))
+    elif len(targets) == 1:
+        target_paths = [filepath]
+    else:
+        raise ValueError("Only one format can be saved to a file object")
+    
+    resample_method = output_config['resample_images']
+    valid_methods = ["none", "area", "nearest"]
+    if resample_method not in valid_methods:
+        raise ValueError(
+            f"Invalid output.resample_images: {resample_method!r}. "
+            f"Must be one of: {valid_methods!r}."
+        )
+    
+    # Raster formats are grouped by dpi to render each dpi once
+    raster_groups: dict[float, list[int]] = {}
+    vector_targets: list[int] = []
+    for i, (fmt, dpi) in enumerate(targets):
+        if fmt in RASTER_FORMATS:
+            raster_groups.setdefault(dpi, []).append(i)
+        else:
+            vector_targets.append(i)
     
+    # Save the figure
+    deterministic = output_config['deterministic']
+    raster_options = output_config['raster']
+    tile_height = output_config['tile_height_px']
+    report: SaveReport = {
+        'files': [], 'images': [], 'rasterized': [], 'timings': {}, 
+        'unchanged': [],
+    }
+    current_path = target_paths[0]
+    encoders: list[tuple[Path | BinaryIO, float, Future[tuple[bool, float]]]] = []
+    written: dict[Path | BinaryIO, bool] = {}
+    try:
+        resampling = (
+            nullcontext(report['images']) if resample_method == "none"
+            else resampled_images(
+                fig, max(dpi for _, dpi in targets), resample_method
+            )
+        )
+        tolerance_mm = output_config['vector_tolerance_mm']
+        slimming = (
+            slimmed_vectors(fig, tolerance_mm) if tolerance_mm > 0 
+            else nullcontext()
+        )
+        decimals = svg_decimals(tolerance_mm) if tolerance_mm > 0 else None
+        threshold = output_config['rasterize_threshold']
+        rasterizing = (
+            rasterized_dense_artists(
+                fig, max(targets[i][1] for i in vector_targets), threshold
+            )
+            if threshold > 0 and vector_targets 
+            else nullcontext(report['rasterized'])
+        )
+        with (
+            debug_visibility(fig, debug),
+            resampling as images,
+            rasterizing as rasterized,
+            ThreadPoolExecutor() as executor,
+        ):
+            for dpi, indices in raster_groups.items():
+                tiled = [
+                    i for i in indices 
+                    if tile_height > 0 and targets[i][0] in TILED_FORMATS
+                ]
+                for i in tiled:
+                    current_path = target_paths[i]
+                    written[current_path], seconds = _timed(
+                        save_tiled, fig, current_path, targets[i][0], dpi, 
+                        tile_height_px=tile_height, 
+                        workers=output_config['tile_workers'] or None,
+                        alpha=raster_options['alpha'], 
+                        compress_level=raster_options['compress_level'],
+                        deterministic=deterministic, metadata=metadata,
+                    )
+                    report['timings'][_target_name(current_path)] = seconds
+                indices = [i for i in indices if i not in tiled]
+                if not indices:
+                    continue
+                current_path = target_paths[indices[0]]
+                start = time.perf_counter()
+                rgba = render_rgba(fig, dpi)
+                render_time = time.perf_counter() - start
+                for i in indices:
+                    encoders.append((
+                        target_paths[i],
+                        render_time,
+                        executor.submit(
+                            _timed, _write_raster, rgba, target_paths[i], 
+                            targets[i][0], dpi, deterministic, raster_options,
+                            metadata,
+                        ),
+                    ))
+            with slimming:
+                for i in vector_targets:
+                    current_path = target_paths[i]
+                    fmt, dpi = targets[i]
+                    written[current_path], seconds = _timed(
+                        _write_vector, fig, current_path, fmt, dpi, metadata, 
+                        deterministic, decimals
+                    )
+                    report['timings'][_target_name(current_path)] = seconds
+            for current_path, render_time, encoder in encoders:
+                written[current_path], seconds = encoder.result()
+                report['timings'][_target_name(current_path)] = (
+                    render_time + seconds
+                )
+        report['images'] = images
+        report['rasterized'] = rasterized
+    except Exception as e:
+        raise OSError(
+            f"Could not save figure to {_target_name(current_path)}: {e}"
+        ) from e
+    
+    report['files'] = [_target_name(target) for target in target_paths]
+    report['unchanged'] = [
+        _target_name(target) for target in target_paths if not written[target]
+    ]
+    return report
+
+def render_panel(
+    fig: Figure,
+    format: str | None = None,  # noqa: A002, as in savefig
+    dpi: float | None = None,
+    debug: bool | None = None,
+) -> bytes:
+    """Renders panel to the bytes of a file using global config.
+    
+    The panel is saved as by `save_panel`, including image resampling and 
+    deterministic output, but into memory instead of a file, e.g. to send it 
+    from a web service without a filesystem round trip.
+    
+    Args:
+        fig: Matplotlib figure to render
+        format: File format, e.g. "png" or "svg". Defaults to None, i.e. 
+            `output.format`.
+        dpi: Resolution in dots per inch. Defaults to None, i.e. 
+            `output.dpi`.
+        debug: Whether to include the debug gridlines, as for `save_panel`.
+        
+    Returns:
+        The file contents.
+        
+    Raises:
+        OSError: If rendering fails
+    """
+    output_config = get_config()['output']
+    target = (
+        format or output_config['format'], 
+        dpi if dpi is not None else output_config['dpi'],
+    )
+    buffer = io.BytesIO()
+    save_panel(fig, buffer, debug=debug, formats=[target])
+    return buffer.getvalue()
+
+def render_panel_rgba(
+    fig: Figure, dpi: float | None = None, debug: bool | None = None
+) -> NDArray[np.uint8]:
+    """Renders panel with Agg and returns its pixels without copying.
+    
+    The returned array is a view of the buffer of a renderer created for 
+    this call, so it is not overwritten by later renders of the figure and 
+    can be passed to image pipelines as is. Copy it before modifying it.
+    
+    Args:
+        fig: Matplotlib figure to render
+        dpi: Resolution in dots per inch. Defaults to None, i.e. 
+            `output.dpi`.
+        debug: Whether to include the debug gridlines, as for `save_panel`.
+        
+    Returns:
+        Array of shape (height, width, 4) with RGBA values.
+    """
+    if dpi is None:
+        dpi = get_config()['output']['dpi']
+    with debug_visibility(fig, debug):
+        return render_rgba(fig, dpi)
+
+def _prepare_save_path(
+    filepath: str, targets: list[tuple[str, float]]
+) -> list[Path]:
+    """Checks a save path, creates its directory and returns the file paths.
+    
+    Raises:
+        ValueError: If filepath contains parent directory references (..)
+        OSError: If the directory cannot be created
+    """
     # Check for parent directory references for security
     if '..' in filepath:
         raise ValueError(
@@ -137,20 +469,325 @@ def save_panel(fig: Figure, filepath: str) -> None:
     except (OSError, PermissionError) as e:
         raise OSError(f"Could not create directory {path.parent}: {e}") from e
     
-    # Add extension if not provided
-    final_path = path
-    if path.suffix == '':
-        final_path = path.with_suffix(f'.{output_config["format"]}')
+    # Add extension if not provided, or one extension per format
+    return get_target_paths(path, [fmt for fmt, _ in targets])
+
+def _target_name(target: Path | BinaryIO) -> str:
+    """Returns the path of a save target, or the name of a file object."""
+    if isinstance(target, Path):
+        return str(target)
+    return str(getattr(target, 'name', '<file object>'))
+
+class PanelWriter:
+    """Bounded background writer that saves panels while the next is built.
+
+    Figures are saved with `save_panel` in background threads, so that 
+    data preparation and plotting of the next panel overlap with rendering, 
+    compression and I/O of the previous ones. At most `max_pending` saves 
+    are queued or running; `submit` blocks until a slot is free, which 
+    bounds the memory held by figures waiting to be saved.
+
+    A figure must not be changed after it has been submitted. It is closed 
+    in pyplot by `submit`, on the calling thread, and saved with a copy of 
+    the configuration at that time, so the configuration can be changed 
+    for the next panel while the previous ones are saved.
+
+    Example:
+        with mpb.PanelWriter() as writer:
+            for name, data in datasets.items():
+                fig, axs = mpb.create_panel()
+                axs[0][0].plot(data)
+                writer.submit(fig, f"panels/{name}")
+    """
+
+    def __init__(self, max_workers: int = 1, max_pending: int = 4) -> None:
+        """Starts the writer.
+
+        Args:
+            max_workers: Number of figures saved at the same time. Defaults 
+                to 1.
+            max_pending: Maximum number of figures queued or being saved. 
+                Defaults to 4.
+
+        Raises:
+            ValueError: If max_workers or max_pending is smaller than 1
+        """
+        if max_workers < 1 or max_pending < 1:
+            raise ValueError("max_workers and max_pending must be at least 1")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mpb-writer"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending: set[Future[SaveReport]] = set()
+        self._errors: list[BaseException] = []
+        self._closed = False
+
+    def __enter__(self) -> "PanelWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def submit(
+        self,
+        fig: Figure,
+        filepath: str,
+        debug: bool | None = None,
+        formats: Sequence[str | tuple[str, float]] | None = None,
+        profile: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Future[SaveReport]:
+        """Closes a figure and queues it to be saved with `save_panel`.
+
+        Blocks while `max_pending` saves are queued or running. The 
+        arguments are those of `save_panel`.
+
+        Returns:
+            Future of the save report. Its `result()` raises the errors 
+            `save_panel` would raise, e.g. OSError if writing fails.
+
+        Raises:
+            ValueError: If the writer is closed, or if both formats and 
+                profile are given or the profile is unknown
+        """
+        if self._closed:
+            raise ValueError("Cannot submit figures to a closed writer")
+        targets = _get_save_targets(formats, profile)
+        config = copy.deepcopy(get_config())
+        self._slots.acquire()
+        try:
+            # pyplot is not thread-safe, so the figure leaves it here
+            plt.close(fig)
+            FigureCanvasBase(fig)
+            future = self._executor.submit(
+                self._save, fig, filepath, debug, targets, metadata, config
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def flush(self) -> None:
+        """Waits until all submitted figures are saved.
+
+        Raises:
+            OSError: The first error of the saves finished since the last 
+                flush, e.g. if a file could not be written.
+        """
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+            if not pending:
+                break
+            for future in pending:
+                future.exception()
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self) -> None:
+        """Saves all submitted figures and stops the background threads.
+
+        Raises:
+            OSError: As for `flush`.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def _save(
+        fig: Figure,
+        filepath: str,
+        debug: bool | None,
+        targets: list[tuple[str, float]],
+        metadata: dict[str, Any] | None,
+        config: Config,
+    ) -> SaveReport:
+        """Saves a figure with the configuration it was submitted with."""
+        with use_config(config):
+            return save_panel(
+                fig, filepath, debug=debug, formats=targets, metadata=metadata
+            )
+
+    def _done(self, future: Future[SaveReport]) -> None:
+        """Releases the slot of a finished save and records its error."""
+        self._slots.release()
+        with self._lock:
+            self._pending.discard(future)
+            error = None if future.cancelled() else future.exception()
+            if error is not None:
+                self._errors.append(error)
+
+_default_writer: PanelWriter | None = None
+
+def save_panel_async(
+    fig: Figure,
+    filepath: str,
+    debug: bool | None = None,
+    formats: Sequence[str | tuple[str, float]] | None = None,
+    profile: str | None = None,
+    metadata: dict[str, Any] | None = None,
+) -> Future[SaveReport]:
+    """Saves panel in the background using global config.
     
-    # Save the figure
-    try:
-        fig.savefig(
-            str(final_path), 
-            dpi=output_config['dpi'], 
-            format=output_config['format']
+    Like `save_panel`, but the figure is queued on a shared `PanelWriter` 
+    and the call returns at once, unless the writer already holds its 
+    maximum number of pending figures. The figure is closed by this call, 
+    must not be changed after it, and is saved with the configuration at 
+    the time of the call. Pending saves are completed when 
+    `flush_async_saves` is called and when the interpreter exits.
+    
+    Args:
+        fig: Matplotlib figure to save
+        filepath: Full path including filename and extension, as for 
+            `save_panel`.
+        debug: Whether to include the debug gridlines, as for `save_panel`.
+        formats: Formats to save, as for `save_panel`.
+        profile: Name of a profile in `output.profiles`, as for `save_panel`.
+        metadata: Metadata of the saved files, as for `save_panel`.
+        
+    Returns:
+        Future of the save report. Its `result()` raises the errors 
+        `save_panel` would raise, e.g. OSError if writing fails.
+        
+    Raises:
+        ValueError: If both formats and profile are given or the profile is 
+            unknown
+    """
+    global _default_writer
+    if _default_writer is None:
+        _default_writer = PanelWriter()
+        atexit.register(_default_writer.close)
+    return _default_writer.submit(
+        fig, filepath, debug, formats, profile, metadata
+    )
+
+def flush_async_saves() -> None:
+    """Waits until all figures queued by `save_panel_async` are saved.
+    
+    Raises:
+        OSError: The first error of the saves finished since the last flush.
+    """
+    if _default_writer is not None:
+        _default_writer.flush()
+
+def _get_save_targets(
+    formats: Sequence[str | tuple[str, float]] | None,
+    profile: str | None,
+) -> list[tuple[str, float]]:
+    """Returns the (format, dpi) pairs to save from formats or a profile.
+    
+    Raises:
+        ValueError: If both formats and profile are given, or the profile 
+            is not in `output.profiles`.
+    """
+    output_config = get_config()['output']
+    if formats is not None and profile is not None:
+        raise ValueError("Only one of formats and profile can be given")
+    if profile is not None:
+        profiles = output_config['profiles']
+        if profile not in profiles:
+            raise ValueError(
+                f"Unknown output profile: {profile!r}. "
+                f"Available profiles: {sorted(profiles)!r}."
+            )
+        formats = [
+            (entry['format'], entry.get('dpi', output_config['dpi']))
+            for entry in profiles[profile]
+        ]
+    if formats is None:
+        formats = [output_config['format']]
+    
+    targets: list[tuple[str, float]] = []
+    for target in formats:
+        if isinstance(target, str):
+            targets.append((target.lower(), output_config['dpi']))
+        else:
+            targets.append((target[0].lower(), target[1]))
+    if not targets:
+        raise ValueError("At least one format must be given")
+    return targets
+
+def _timed(
+    func: Callable[..., Any], *args: Any, **kwargs: Any
+) -> tuple[Any, float]:
+    """Calls func with args and returns its result and the elapsed seconds."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def _write_vector(
+    fig: Figure, 
+    path: Path | BinaryIO, 
+    fmt: str, 
+    dpi: float, 
+    metadata: dict[str, Any] | None, 
+    deterministic: bool,
+    decimals: int | None,
+) -> bool:
+    """Saves a vector format and returns whether the file was written."""
+    slim = fmt == "svg" and decimals is not None
+    if not deterministic and not slim:
+        target = str(path) if isinstance(path, Path) else path
+        fig.savefig(target, dpi=dpi, format=fmt, metadata=metadata)
+        return True
+    if deterministic:
+        metadata = deterministic_metadata(fmt, metadata)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, dpi=dpi, format=fmt, metadata=metadata)
+    data = buffer.getvalue()
+    if deterministic and fmt in ("ps", "eps"):
+        data = fix_ps_date(data)
+    if slim and decimals is not None:
+        data = slim_svg(data, decimals)
+    if deterministic and fmt == "svg" and plt.rcParams['svg.hashsalt'] is None:
+        data = deterministic_svg_ids(data)
+    return _write_bytes(path, data)
+
+def _write_raster(
+    rgba: NDArray[np.uint8], 
+    path: Path | BinaryIO, 
+    fmt: str, 
+    dpi: float, 
+    deterministic: bool,
+    options: RasterConfig,
+    metadata: dict[str, Any] | None,
+) -> bool:
+    """Encodes a raster format and returns whether the file was written."""
+    if not deterministic:
+        encode_raster(
+            rgba, path, fmt, dpi, metadata=metadata, 
+            **options
         )
-    except Exception as e:
-        raise OSError(f"Could not save figure to {final_path}: {e}") from e
+        return True
+    buffer = io.BytesIO()
+    encode_raster(
+        rgba, buffer, fmt, dpi, metadata=metadata, 
+        **options
+    )
+    return _write_bytes(path, buffer.getvalue())
+
+def _write_bytes(path: Path | BinaryIO, data: bytes) -> bool:
+    """Writes data to a file unless unchanged, or to a file object."""
+    if isinstance(path, Path):
+        return write_if_changed(path, data)
+    path.write(data)
+    return True
 
 def set_rc_style() -> None:
     """Sets matplotlib rcParams globally from configuration.
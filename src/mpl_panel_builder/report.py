@@ -0,0 +1,261 @@
+"""Streaming multi-page PDF reports of panels."""
+
+import inspect
+from contextlib import nullcontext
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfFile, PdfPages
+from matplotlib.figure import Figure
+
+from .config import get_config
+from .features.gridlines import debug_visibility
+from .output import (
+    deterministic_metadata,
+    rasterized_dense_artists,
+    resampled_images,
+    slimmed_vectors,
+)
+
+# Matplotlib versions (major, minor) whose private PdfFile and PdfPages
+# internals the streaming writer has been checked against. Other versions
+# use plain PdfPages, which keeps all images until the report is closed
+_STREAMING_MATPLOTLIB_VERSIONS = ((3, 10), (3, 11))
+
+# Length of the entries of PdfFile.paths, the path collection templates
+_PATH_TEMPLATE_FIELDS = 9
+
+
+def _streaming_supported() -> bool:
+    """Return whether the PdfFile internals used for streaming are as known.
+
+    Besides the matplotlib version, the private methods and attributes that
+    `_StreamingPdfFile` and `_StreamingPdfPages` rely on are checked, so
+    that a patched or unusual matplotlib falls back to plain PdfPages.
+    """
+    version = tuple(
+        int(part) for part in matplotlib.__version__.split(".")[:2]
+        if part.isdigit()
+    )
+    if version not in _STREAMING_MATPLOTLIB_VERSIONS:
+        return False
+    write_image = getattr(PdfFile, "_writeImg", None)
+    if not callable(write_image):
+        return False
+    try:
+        parameters = list(inspect.signature(write_image).parameters)
+    except (TypeError, ValueError):
+        return False
+    return (
+        parameters == ["self", "data", "id", "smask"]
+        and callable(getattr(PdfFile, "_unpack", None))
+        and callable(getattr(PdfFile, "writePathCollectionTemplates", None))
+        and callable(getattr(PdfPages, "_ensure_file", None))
+    )
+
+
+class _StreamingPdfFile(PdfFile):
+    """PDF file that writes the images and templates of each page early.
+
+    Matplotlib's `PdfFile` keeps every image and path collection template
+    until the file is finalized, so memory grows with the number of pages.
+    Here, `flush` writes them after each page and keeps only their object
+    references, which `finalize` still lists as shared XObjects. Fonts stay
+    shared by all pages and are written once at the end.
+    """
+
+    def flush(self) -> None:
+        """Write the images and templates of the finished pages.
+
+        Entries whose layout differs from the one known to this class are
+        left for `finalize` to write, as in a plain `PdfFile`.
+        """
+        self.endStream()
+        if all(
+            isinstance(entry, tuple) and len(entry) == 3
+            for entry in self._images.values()
+        ):
+            self.writeImages()
+        if all(
+            isinstance(entry, tuple) and len(entry) == _PATH_TEMPLATE_FIELDS
+            for entry in self.paths
+        ):
+            self.writePathCollectionTemplates()
+
+    def writeImages(self) -> None:  # noqa: N802
+        """Write pending images and release their data."""
+        for key, (image, name, ob) in list(self._images.items()):
+            if image is None:
+                continue
+            data, adata = self._unpack(image)
+            if adata is not None:
+                smask_object = self.reserveObject("smask")
+                self._writeImg(adata, smask_object.id)
+            else:
+                smask_object = None
+            self._writeImg(data, ob.id, smask_object)
+            # Re-key the entry, as a new image may reuse the freed id
+            del self._images[key]
+            self._images[("written", name)] = (None, name, ob)
+
+    def writePathCollectionTemplates(self) -> None:  # noqa: N802
+        """Write pending path collection templates and release their paths."""
+        pending = [entry for entry in self.paths if entry[1] is not None]
+        written = [entry for entry in self.paths if entry[1] is None]
+        self.paths = pending
+        super().writePathCollectionTemplates()
+        self.paths = written + [
+            (name, None, None, ob, *rest)
+            for name, _, _, ob, *rest in pending
+        ]
+
+
+class _StreamingPdfPages(PdfPages):
+    """PdfPages writing to a `_StreamingPdfFile`."""
+
+    _file: PdfFile | None
+
+    def _ensure_file(self) -> PdfFile:
+        if self._file is None:
+            self._file = _StreamingPdfFile(self._filename, metadata=self._metadata)
+        return self._file
+
+    def flush(self) -> None:
+        """Write the images and templates of the pages saved so far."""
+        file = self._ensure_file()
+        if isinstance(file, _StreamingPdfFile):
+            file.flush()
+
+
+class PanelReport:
+    """Multi-page PDF report that writes each panel as soon as it is added.
+
+    Each added figure becomes one page, is written immediately and is then
+    closed, so the figures do not need to be kept alive. Images and path
+    templates are written with their page, and only fonts, which are shared
+    by all pages, are kept until the report is closed, so memory stays flat
+    in the number of pages.
+
+    Streaming relies on private matplotlib internals and is used with the
+    matplotlib versions it has been checked against. With other versions
+    the report is written by plain `PdfPages`, with the same pages but with
+    all images kept in memory until the report is closed.
+
+    If `output.deterministic` is True when the report is opened, the time
+    of saving is left out of its metadata (unless SOURCE_DATE_EPOCH is
+    set), so the same pages give the same bytes, as in `save_panel`.
+
+    Example:
+        with mpb.PanelReport("qc.pdf") as report:
+            for recording in recordings:
+                fig, axs = mpb.create_panel()
+                ...
+                report.add(fig)
+    """
+
+    def __init__(
+        self, filepath: str | Path, metadata: dict[str, Any] | None = None
+    ) -> None:
+        """Opens the report file.
+
+        Args:
+            filepath: Path of the PDF file to write.
+            metadata: PDF metadata, as for `PdfPages`. Defaults to None.
+
+        Raises:
+            ValueError: If filepath contains parent directory references (..)
+            OSError: If the directory cannot be created
+        """
+        if '..' in str(filepath):
+            raise ValueError(
+                "Path contains parent directory references ('..'): "
+                f"{filepath}. This could be unsafe."
+            )
+        self.path = Path(filepath)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise OSError(
+                f"Could not create directory {self.path.parent}: {e}"
+            ) from e
+        if get_config()['output']['deterministic']:
+            metadata = deterministic_metadata("pdf", metadata)
+        pages_class = (
+            _StreamingPdfPages if _streaming_supported() else PdfPages
+        )
+        self._pages: PdfPages | None = pages_class(self.path, metadata=metadata)
+        self.n_pages = 0
+
+    def __enter__(self) -> "PanelReport":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def add(self, fig: Figure, debug: bool | None = None) -> None:
+        """Writes a figure as the next page and closes it.
+
+        The page is saved at `output.dpi`, with the debug gridlines, image
+        resampling, rasterization of dense artists and vector slimming
+        handled as in `save_panel`.
+
+        Args:
+            fig: The figure to add.
+            debug: Whether to include the debug gridlines, as in `save_panel`.
+
+        Raises:
+            ValueError: If the report is already closed, or if
+                output.resample_images is not a valid method.
+            OSError: If the page cannot be written.
+        """
+        if self._pages is None:
+            raise ValueError("Cannot add pages to a closed report")
+        output_config = get_config()['output']
+        dpi = output_config['dpi']
+        resample_method = output_config['resample_images']
+        valid_methods = ["none", "area", "nearest"]
+        if resample_method not in valid_methods:
+            raise ValueError(
+                f"Invalid output.resample_images: {resample_method!r}. "
+                f"Must be one of: {valid_methods!r}."
+            )
+        resampling = (
+            nullcontext() if resample_method == "none"
+            else resampled_images(fig, dpi, resample_method)
+        )
+        threshold = output_config['rasterize_threshold']
+        rasterizing = (
+            nullcontext() if threshold <= 0
+            else rasterized_dense_artists(fig, dpi, threshold)
+        )
+        tolerance_mm = output_config['vector_tolerance_mm']
+        slimming = (
+            nullcontext() if tolerance_mm <= 0
+            else slimmed_vectors(fig, tolerance_mm)
+        )
+        try:
+            with (
+                debug_visibility(fig, debug), resampling, rasterizing, slimming
+            ):
+                self._pages.savefig(fig, dpi=dpi)
+            if isinstance(self._pages, _StreamingPdfPages):
+                self._pages.flush()
+        except Exception as e:
+            raise OSError(f"Could not add page to {self.path}: {e}") from e
+        finally:
+            plt.close(fig)
+        self.n_pages += 1
+
+    def close(self) -> None:
+        """Writes the shared resources and closes the file."""
+        if self._pages is not None:
+            self._pages.close()
+            self._pages = None
@@ -0,0 +1,485 @@
+"""Tiled raster export of panels too large to render in one buffer."""
+
+import io
+import os
+import pickle
+import struct
+import uuid
+import zlib
+from collections import deque
+from collections.abc import Generator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from matplotlib.transforms import Bbox, BboxBase
+from numpy.typing import NDArray
+
+from .output import png_text
+
+TILED_FORMATS = {"png", "tif", "tiff"}
+
+# Rows rendered above and below each strip and then cropped, so that markers
+# and line caps whose center lies in a neighbouring strip are still drawn
+_OVERLAP_PX = 64
+
+# Slack added to the strip size in inches, so that its size in pixels is not
+# truncated by float rounding
+_SIZE_EPSILON_PX = 1e-6
+
+_ADLER_BASE = 65521
+_TIFF_MAX_BYTES = 2**32
+
+# The figure of the current worker process, set by _init_worker
+_worker_figure: Figure | None = None
+
+
+def tiled_size(fig: Figure, dpi: float) -> tuple[int, int]:
+    """Return the (height, width) in pixels of a figure rendered at dpi.
+
+    This is the size of the full Agg render, which tiles add up to.
+    """
+    width_in, height_in = fig.get_size_inches()
+    return int(height_in * dpi), int(width_in * dpi)
+
+
+def save_tiled(
+    fig: Figure,
+    path: Path | BinaryIO,
+    fmt: str,
+    dpi: float,
+    *,
+    tile_height_px: int = 512,
+    workers: int | None = None,
+    alpha: bool = True,
+    compress_level: int = 6,
+    deterministic: bool = False,
+    metadata: dict[str, str | None] | None = None,
+) -> bool:
+    """Render a figure in horizontal strips and stream them into a PNG or TIFF.
+
+    The figure is pickled once and sent to worker processes. Each worker
+    renders strips of `tile_height_px` rows with Agg, cropped from the same
+    cm layout, and filters and compresses them. The strips are written in
+    order as they arrive, and only a few strips per worker are pending at a
+    time, so the full image is never held in memory. The result matches a
+    full render up to small antialiasing differences along paths clipped at
+    strip edges.
+
+    As for `savefig`, the `savefig.facecolor`, `savefig.edgecolor` and
+    `savefig.transparent` rcParams of the calling process apply, while
+    `savefig.bbox` does not, since the strips cover the whole figure. PNGs
+    carry the same text metadata as those of `output.encode_raster`.
+
+    PNG strips are deflated independently and joined into one zlib stream,
+    so compression runs in parallel too. TIFF strips are stored as Deflate
+    compressed TIFF strips, and files larger than 4 GB are not supported.
+
+    On platforms that start worker processes by spawning, e.g. Windows and
+    macOS, the calling script must guard its code with
+    `if __name__ == "__main__":`.
+
+    Args:
+        fig: The figure to render. It must be picklable.
+        path: The file, or seekable binary file object, to write.
+        fmt: One of `TILED_FORMATS`.
+        dpi: The resolution in dots per inch.
+        tile_height_px: Rows per strip. Defaults to 512.
+        workers: Number of worker processes. Defaults to None, i.e. the
+            number of CPUs.
+        alpha: Whether to keep the alpha channel, otherwise the strips are
+            composited onto white. Defaults to True.
+        compress_level: zlib compression level, from 0 (none) to 9
+            (smallest). Defaults to 6.
+        deterministic: Whether to keep an existing file with the same bytes
+            untouched. Defaults to False.
+        metadata: PNG text entries, as for `output.encode_raster`. TIFFs
+            ignore it. Defaults to None.
+
+    Returns:
+        Whether the file was written.
+
+    Raises:
+        ValueError: If the format is not tiled or tile_height_px is not
+            positive
+    """
+    if fmt not in TILED_FORMATS:
+        raise ValueError(
+            f"Tiled export supports {sorted(TILED_FORMATS)!r}, not {fmt!r}"
+        )
+    if tile_height_px <= 0:
+        raise ValueError(f"tile_height_px must be positive: {tile_height_px}")
+    if not isinstance(path, Path):
+        _write_tiled(
+            fig, path, fmt, dpi, tile_height_px, workers, alpha,
+            compress_level, metadata,
+        )
+        return True
+
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "xb") as file:
+            _write_tiled(
+                fig, file, fmt, dpi, tile_height_px, workers, alpha,
+                compress_level, metadata,
+            )
+        if deterministic and _same_contents(tmp, path):
+            tmp.unlink()
+            return False
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def _write_tiled(
+    fig: Figure,
+    file: BinaryIO,
+    fmt: str,
+    dpi: float,
+    tile_height_px: int,
+    workers: int | None,
+    alpha: bool,
+    compress_level: int,
+    metadata: dict[str, str | None] | None,
+) -> None:
+    """Render the strips of a figure in worker processes and write them."""
+    height, width = tiled_size(fig, dpi)
+    workers = workers or os.cpu_count() or 1
+    writer = (
+        _PngWriter(file, height, width, dpi, alpha, png_text(metadata))
+        if fmt == "png"
+        else _TiffWriter(file, height, width, dpi, alpha, tile_height_px)
+    )
+    colors = _savefig_colors()
+    starts = range(0, height, tile_height_px)
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(pickle.dumps(fig),)
+    ) as executor:
+        pending: deque[Future[tuple[bytes, int, int]]] = deque()
+        for start in starts:
+            pending.append(executor.submit(
+                _render_strip, start, min(start + tile_height_px, height),
+                height, width, dpi, fmt, alpha, compress_level,
+                start == starts[-1], colors,
+            ))
+            # Bound the strips held in memory while the writer catches up
+            if len(pending) >= 2 * workers:
+                writer.write(*pending.popleft().result())
+        while pending:
+            writer.write(*pending.popleft().result())
+    writer.close()
+
+
+def _init_worker(fig_data: bytes) -> None:
+    """Unpickle the figure once per worker process."""
+    global _worker_figure
+    _worker_figure = pickle.loads(fig_data)
+
+
+def _render_strip(
+    start: int,
+    stop: int,
+    height: int,
+    width: int,
+    dpi: float,
+    fmt: str,
+    alpha: bool,
+    compress_level: int,
+    last: bool,
+    colors: dict[str, Any],
+) -> tuple[bytes, int, int]:
+    """Render and compress rows start to stop of the worker's figure.
+
+    Returns:
+        The compressed strip, and for PNG the Adler-32 checksum and length
+        of the filtered rows, which make up the checksum of the zlib stream.
+    """
+    assert _worker_figure is not None
+    rgba = _render_rows(
+        _worker_figure, max(start - _OVERLAP_PX, 0),
+        min(stop + _OVERLAP_PX, height), height, width, dpi, colors,
+    )
+    first = start - max(start - _OVERLAP_PX, 0)
+    pixels = rgba if alpha else _on_white(rgba)
+    rows = pixels[first:first + stop - start]
+    if fmt != "png":
+        return zlib.compress(np.ascontiguousarray(rows), compress_level), 0, 0
+
+    # The Up filter stores each row as its difference to the row above. The
+    # first row of a strip is stored as is, since the row above was written
+    # by another strip and may differ from its render in the overlap
+    filtered = np.empty((rows.shape[0], 1 + rows[0].size), dtype=np.uint8)
+    filtered[0, 0] = 0
+    filtered[0, 1:] = rows[0].ravel()
+    filtered[1:, 0] = 2
+    filtered[1:, 1:] = (rows[1:] - rows[:-1]).reshape(
+        rows.shape[0] - 1, rows[0].size
+    )
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(filtered) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+    return compressed, zlib.adler32(filtered), filtered.nbytes
+
+
+def _savefig_colors() -> dict[str, Any]:
+    """Return the savefig colors and transparency set by the rcParams.
+
+    Worker processes do not share the rcParams of the calling process, so
+    these are resolved here and passed to the `savefig` of each strip.
+    """
+    if mpl.rcParams["savefig.transparent"]:
+        # savefig then makes the figure and axes backgrounds transparent
+        return {"transparent": True}
+    return {
+        "transparent": False,
+        "facecolor": mpl.rcParams["savefig.facecolor"],
+        "edgecolor": mpl.rcParams["savefig.edgecolor"],
+    }
+
+
+def _render_rows(
+    fig: Figure,
+    start: int,
+    stop: int,
+    height: int,
+    width: int,
+    dpi: float,
+    colors: dict[str, Any],
+) -> NDArray[np.uint8]:
+    """Render rows start to stop of a figure, counted from the top, as RGBA.
+
+    The rows are cropped with `bbox_inches`, so the figure is laid out as
+    for a full render and only the strip's buffer is allocated. The colors
+    are those of `_savefig_colors`.
+    """
+    bbox = Bbox.from_extents(
+        0,
+        (height - stop) / dpi,
+        (width + _SIZE_EPSILON_PX) / dpi,
+        (height - start + _SIZE_EPSILON_PX) / dpi,
+    )
+    buffer = io.BytesIO()
+    with _images_clipped(fig, dpi, height - stop, height - start):
+        fig.savefig(
+            buffer, format="rgba", dpi=dpi, bbox_inches=bbox, pad_inches=0,
+            **colors,
+        )
+    return np.frombuffer(buffer.getbuffer(), dtype=np.uint8).reshape(
+        stop - start, width, 4
+    )
+
+
+@contextmanager
+def _images_clipped(
+    fig: Figure, dpi: float, bottom: float, top: float
+) -> Generator[None, None, None]:
+    """Clip the images of a figure to a strip while rendering it.
+
+    Images are resampled for their whole clip box, by default their axes,
+    whatever part of it is on the canvas. Clipping them to the strip, given
+    in pixels from the bottom of the full render, and hiding those outside
+    it keeps each strip from resampling every image of the figure.
+    """
+    originals: list[tuple[AxesImage, BboxBase | None, bool]] = []
+    original_dpi = fig.dpi
+    fig.dpi = dpi
+    try:
+        for image in fig.findobj(AxesImage):
+            if not image.get_clip_on():
+                continue
+            clip_box = image.get_clip_box()
+            extent = (clip_box or image.axes.bbox).frozen()
+            originals.append((image, clip_box, image.get_visible()))
+            strip = Bbox.intersection(
+                extent, Bbox.from_extents(extent.x0, bottom, extent.x1, top)
+            )
+            if strip is None:
+                image.set_visible(False)
+            else:
+                # The strip's pixels start at its bottom once cropped
+                image.set_clip_box(Bbox.from_extents(
+                    strip.x0, strip.y0 - bottom, strip.x1, strip.y1 - bottom
+                ))
+    finally:
+        fig.dpi = original_dpi
+    try:
+        yield
+    finally:
+        for image, clip_box, visible in originals:
+            image.set_clip_box(clip_box)
+            image.set_visible(visible)
+
+
+def _on_white(rgba: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    """Composite RGBA pixels onto white and return RGB pixels."""
+    alpha = rgba[..., 3:].astype(np.uint16)
+    rgb = rgba[..., :3] * alpha + 255 * (255 - alpha) + 127
+    return (rgb // 255).astype(np.uint8)
+
+
+def _adler32_combine(adler1: int, adler2: int, length2: int) -> int:
+    """Return the Adler-32 of two joined byte strings from their checksums."""
+    remainder = length2 % _ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = (remainder * sum1 + (adler1 >> 16) + (adler2 >> 16) - remainder)
+    sum1 += (adler2 & 0xFFFF) - 1
+    return (sum1 % _ADLER_BASE) | (sum2 % _ADLER_BASE) << 16
+
+
+def _same_contents(path1: Path, path2: Path) -> bool:
+    """Return whether two files hold the same bytes, reading in chunks."""
+    try:
+        if path1.stat().st_size != path2.stat().st_size:
+            return False
+        with open(path1, "rb") as file1, open(path2, "rb") as file2:
+            while chunk := file1.read(1 << 20):
+                if chunk != file2.read(1 << 20):
+                    return False
+    except OSError:
+        return False
+    return True
+
+
+class _PngWriter:
+    """Writes deflated strips of filtered rows as the IDAT chunks of a PNG."""
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        height: int,
+        width: int,
+        dpi: float,
+        alpha: bool,
+        text: dict[str, str],
+    ) -> None:
+        self._file = file
+        self._adler = 1
+        # The zlib header precedes the first strip
+        self._prefix = b"\x78\x9c"
+        file.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(
+            ">IIBBBBB", width, height, 8, 6 if alpha else 2, 0, 0, 0
+        ))
+        pixels_per_meter = round(dpi / 0.0254)
+        self._chunk(
+            b"pHYs", struct.pack(">IIB", pixels_per_meter, pixels_per_meter, 1)
+        )
+        # As Pillow writes them: Latin-1 text as tEXt, other text as iTXt
+        for key, value in text.items():
+            try:
+                self._chunk(
+                    b"tEXt", key.encode("latin-1") + b"\0" + value.encode("latin-1")
+                )
+            except UnicodeEncodeError:
+                self._chunk(
+                    b"iTXt",
+                    key.encode("latin-1") + b"\0\0\0\0\0" + value.encode(),
+                )
+
+    def write(self, data: bytes, adler: int, length: int) -> None:
+        """Write a strip returned by _render_strip."""
+        self._adler = _adler32_combine(self._adler, adler, length)
+        self._chunk(b"IDAT", self._prefix + data)
+        self._prefix = b""
+
+    def close(self) -> None:
+        """Write the checksum of the zlib stream and the end of the PNG."""
+        self._chunk(b"IDAT", struct.pack(">I", self._adler))
+        self._chunk(b"IEND", b"")
+
+    def _chunk(self, kind: bytes, data: bytes) -> None:
+        self._file.write(struct.pack(">I", len(data)) + kind + data)
+        self._file.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+
+class _TiffWriter:
+    """Writes compressed strips and then the directory of a baseline TIFF."""
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        height: int,
+        width: int,
+        dpi: float,
+        alpha: bool,
+        rows_per_strip: int,
+    ) -> None:
+        self._file = file
+        self._start = file.tell()
+        self._height = height
+        self._width = width
+        self._dpi = dpi
+        self._alpha = alpha
+        self._rows_per_strip = rows_per_strip
+        self._offsets: list[int] = []
+        self._counts: list[int] = []
+        self._position = 8
+        # Little-endian header, the directory offset is set by close
+        file.write(b"II*\x00\x00\x00\x00\x00")
+
+    def write(self, data: bytes, *_: int) -> None:
+        """Write a strip returned by _render_strip."""
+        self._offsets.append(self._position)
+        self._counts.append(len(data))
+        self._append(data)
+
+    def close(self) -> None:
+        """Write the image file directory and point the header to it."""
+        samples = 4 if self._alpha else 3
+        dpi = (round(self._dpi * 1000), 1000)
+        # (tag, type, values), where type 3 is SHORT, 4 LONG and 5 RATIONAL
+        entries: list[tuple[int, int, Sequence[int]]] = [
+            (256, 4, [self._width]),
+            (257, 4, [self._height]),
+            (258, 3, [8] * samples),
+            (259, 3, [8]),  # Adobe Deflate
+            (262, 3, [2]),  # RGB
+            (273, 4, self._offsets),
+            (277, 3, [samples]),
+            (278, 4, [self._rows_per_strip]),
+            (279, 4, self._counts),
+            (282, 5, dpi),
+            (283, 5, dpi),
+            (284, 3, [1]),  # Chunky
+            (296, 3, [2]),  # Inch
+        ]
+        if self._alpha:
+            entries.append((338, 3, [2]))  # Unassociated alpha
+
+        fields: list[bytes] = []
+        for tag, kind, values in entries:
+            value = struct.pack(f"<{len(values)}{'HII'[kind - 3]}", *values)
+            count = len(values) // 2 if kind == 5 else len(values)
+            if len(value) <= 4:
+                value = value.ljust(4, b"\x00")
+            else:
+                # Longer values are stored before the directory
+                self._append(b"\x00" * (self._position % 2))
+                position = self._position
+                self._append(value)
+                value = struct.pack("<I", position)
+            fields.append(struct.pack("<HHI", tag, kind, count) + value)
+
+        self._append(b"\x00" * (self._position % 2))
+        directory = self._position
+        self._append(
+            struct.pack("<H", len(fields)) + b"".join(fields) + b"\x00" * 4
+        )
+        end = self._file.tell()
+        self._file.seek(self._start + 4)
+        self._file.write(struct.pack("<I", directory))
+        self._file.seek(end)
+
+    def _append(self, data: bytes) -> None:
+        self._position += len(data)
+        if self._position >= _TIFF_MAX_BYTES:
+            raise ValueError("Tiled TIFF exports are limited to 4 GB")
+        self._file.write(data)
@@ -0,0 +1,101 @@
+"""Tests for colorbar feature."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.colors import BoundaryNorm, Normalize
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import add_colorbar, add_shared_colorbar
+from mpl_panel_builder.features.colorbar import deduplicate_mappables
+
+
+def test_create_panel_reserves_colorbar_space() -> None:
+    """Test that create_panel reserves space for a shared colorbar."""
+    mpb.reset_config()
+    mpb.configure({"features": {"colorbar": {"width_cm": 0.3, "separation_cm": 0.2}}})
+
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    fig_cbar, axs_cbar = mpb.create_panel(rows=1, cols=1, colorbar="right")
+
+    width_cm = axs[0][0].get_position().width * mpb.get_config()[
+        "panel"]["dimensions"]["width_cm"]
+    width_cbar_cm = axs_cbar[0][0].get_position().width * mpb.get_config()[
+        "panel"]["dimensions"]["width_cm"]
+    assert width_cm - width_cbar_cm == pytest.approx(0.5)
+
+    with pytest.raises(ValueError, match="Invalid colorbar position"):
+        mpb.create_panel(rows=1, cols=1, colorbar="diagonal")  # type: ignore[arg-type]
+
+    plt.close(fig)
+    plt.close(fig_cbar)
+
+
+def test_add_shared_colorbar_spans_row() -> None:
+    """Test that a shared colorbar spans all axes without resizing them."""
+    mpb.reset_config()
+
+    fig, axs = mpb.create_panel(rows=2, cols=3, colorbar="right")
+    norm = Normalize(vmin=0, vmax=1)
+    for row in axs:
+        for ax in row:
+            ax.imshow(np.random.rand(4, 4), norm=norm)
+    positions = [ax.get_position().bounds for row in axs for ax in row]
+
+    cbar = add_shared_colorbar(axs[0], "right")
+
+    # Host axes are left untouched
+    assert [ax.get_position().bounds for row in axs for ax in row] == positions
+    # The colorbar spans the row and is placed to the right of it
+    cbar_pos = cbar.ax.get_position()
+    assert cbar_pos.y0 == pytest.approx(axs[0][0].get_position().y0)
+    assert cbar_pos.y1 == pytest.approx(axs[0][-1].get_position().y1)
+    assert cbar_pos.x0 > axs[0][-1].get_position().x1
+
+    plt.close(fig)
+
+
+def test_deduplicate_mappables() -> None:
+    """Test that mappables with identical cmap and norm are deduplicated."""
+    fig, ax = plt.subplots()
+    data = np.random.rand(4, 4)
+    im_a = ax.imshow(data, cmap="viridis", vmin=0, vmax=1)
+    im_b = ax.imshow(data, cmap="viridis", norm=Normalize(vmin=0, vmax=1))
+    im_c = ax.imshow(data, cmap="magma", vmin=0, vmax=1)
+    im_d = ax.imshow(data, cmap="viridis", vmin=0, vmax=2)
+
+    assert deduplicate_mappables([im_a, im_b]) == [im_a]
+    assert deduplicate_mappables([im_a, im_b, im_c, im_d]) == [im_a, im_c, im_d]
+
+    with pytest.raises(ValueError, match="same colormap and norm"):
+        add_shared_colorbar([ax], "right", [im_a, im_c])
+
+    plt.close(fig)
+
+
+def test_colorbar_raster_solids() -> None:
+    """Test rasterized solids from the config and exact discrete solids."""
+    mpb.reset_config()
+    mpb.configure({"features": {"colorbar": {"raster_solids": True}}})
+    fig, axs = mpb.create_panel(rows=1, cols=2)
+    continuous = axs[0][0].imshow(
+        np.random.rand(4, 4), cmap=plt.get_cmap("viridis", 10)
+    )
+    discrete = axs[0][1].imshow(
+        np.random.rand(4, 4), norm=BoundaryNorm(np.linspace(0, 1, 60), 256)
+    )
+
+    cbar = add_colorbar(axs[0][0], continuous, position="right")
+    assert cbar.solids is not None and cbar.solids.get_rasterized()
+    assert not cbar.outline.get_rasterized()
+    continuous.set_clim(0.2, 0.8)
+    assert cbar.solids is not None and cbar.solids.get_rasterized()
+
+    cbar = add_colorbar(axs[0][1], discrete, position="right")
+    assert cbar.solids is not None and not cbar.solids.get_rasterized()
+
+    cbar = add_colorbar(
+        axs[0][1], discrete, position="left", raster_solids=False
+    )
+    assert cbar.solids is not None and cbar.solids.get_rasterized()
+    plt.close(fig)
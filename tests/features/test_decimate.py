@@ -0,0 +1,62 @@
+"""Tests for decimate feature."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import plot_decimated
+from mpl_panel_builder.features.decimate import decimate_lttb, decimate_minmax
+from mpl_panel_builder.helpers import axes_size_px
+
+
+def test_decimate_minmax_keeps_extremes() -> None:
+    """Test that min-max decimation keeps the extremes of every bin."""
+    rng = np.random.default_rng(0)
+    x = np.arange(1005, dtype=float)
+    y = rng.standard_normal(1005)
+
+    x_dec, y_dec = decimate_minmax(x, y, n_bins=10)
+
+    assert len(x_dec) <= 2 * 10 + 2 + 2
+    assert np.all(np.diff(x_dec) > 0)
+    assert (x_dec[0], x_dec[-1]) == (0, 1004)
+    assert y_dec.min() == y.min()
+    assert y_dec.max() == y.max()
+
+
+def test_decimate_lttb() -> None:
+    """Test that LTTB keeps the requested number of samples and endpoints."""
+    x = np.linspace(0, 10, 1000)
+    y = np.sin(x)
+
+    x_dec, y_dec = decimate_lttb(x, y, n_out=50)
+
+    assert len(x_dec) == 50
+    assert np.all(np.diff(x_dec) > 0)
+    assert (x_dec[0], x_dec[-1]) == (x[0], x[-1])
+    assert y_dec.max() == pytest.approx(1, abs=1e-3)
+
+
+def test_plot_decimated_redecimates_on_xlim_change() -> None:
+    """Test the pixel budget and re-decimation after set_xlim."""
+    mpb.reset_config()
+    mpb.configure({"output": {"dpi": 100}})
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    ax = axs[0][0]
+
+    x = np.arange(1_000_000, dtype=float)
+    y = np.sin(x / 1000)
+    line = plot_decimated(ax, x, y)
+    n_px = axes_size_px(ax, 100)[0]
+    assert np.asarray(line.get_xdata()).size <= 2 * n_px + 4
+
+    ax.set_xlim(1000, 2000)
+    x_visible = np.asarray(line.get_xdata())
+    assert x_visible.min() >= 999
+    assert x_visible.max() <= 2001
+
+    with pytest.raises(ValueError, match="Invalid method"):
+        plot_decimated(ax, x, y, method="mean")  # type: ignore[arg-type]
+
+    plt.close(fig)
@@ -0,0 +1,47 @@
+"""Tests for density feature."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import PathCollection
+from matplotlib.image import AxesImage
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import add_colorbar, plot_density_scatter
+from mpl_panel_builder.features.density import bin_points
+from mpl_panel_builder.helpers import axes_size_px
+
+
+def test_bin_points() -> None:
+    """Test chunked binning of points to a grid."""
+    x = np.array([0.0, 0.1, 0.9, 1.0, 2.0, np.nan])
+    y = np.array([0.0, 0.1, 0.9, 1.0, 0.5, 0.5])
+
+    counts = bin_points(x, y, (0, 1), (0, 1), (2, 2), chunk_size=2)
+
+    # Points outside the limits and NaN are ignored, upper limits are included
+    assert counts.tolist() == [[2, 0], [0, 2]]
+
+
+def test_plot_density_scatter_image_and_fallback() -> None:
+    """Test the density image above and exact points below the threshold."""
+    mpb.reset_config()
+    mpb.configure({"output": {"dpi": 100}})
+    fig, axs = mpb.create_panel(rows=1, cols=2)
+
+    rng = np.random.default_rng(0)
+    x, y = rng.standard_normal((2, 1000))
+
+    image = plot_density_scatter(axs[0][0], x, y, threshold=500)
+    assert isinstance(image, AxesImage)
+    counts = image.get_array()
+    assert counts is not None
+    assert counts.sum() == 1000
+    # One image pixel per output pixel of the axes
+    width_px, height_px = axes_size_px(axs[0][0], 100)
+    assert counts.shape == (height_px, width_px)
+    add_colorbar(axs[0][0], image, "right")
+
+    scatter = plot_density_scatter(axs[0][1], x, y, threshold=5000)
+    assert isinstance(scatter, PathCollection)
+
+    plt.close(fig)
@@ -0,0 +1,77 @@
+"""Tests for gridlines feature."""
+
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.text import Text
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import draw_gridlines
+from mpl_panel_builder.features.gridlines import get_debug_artists
+
+
+def test_draw_gridlines_single_collection() -> None:
+    """Test that gridlines are one collection on the shared overlay axes."""
+    mpb.reset_config()
+    mpb.configure({"panel": {"dimensions": {"width_cm": 4, "height_cm": 3}}})
+
+    fig, _ = mpb.create_panel(rows=1, cols=1)
+    n_axes = len(fig.axes)
+    draw_gridlines(fig)
+
+    # Only the shared overlay axes is added
+    assert len(fig.axes) == n_axes + 1
+    debug_artists = get_debug_artists(fig)
+    assert len(debug_artists) == 1
+    gridlines = debug_artists[0]
+    assert isinstance(gridlines, LineCollection)
+    # 8 vertical (0, 0.5, ..., 3.5) and 6 horizontal (0, 0.5, ..., 2.5) lines
+    assert len(gridlines.get_segments()) == 14
+
+    plt.close(fig)
+
+
+def test_draw_gridlines_with_ruler() -> None:
+    """Test that the ruler adds tick marks and cm labels."""
+    mpb.reset_config()
+    mpb.configure({
+        "panel": {"dimensions": {"width_cm": 4, "height_cm": 3}},
+        "features": {"gridlines": {"ruler": True, "ruler_major_cm": 1.0}},
+    })
+
+    fig, _ = mpb.create_panel(rows=1, cols=1)
+    draw_gridlines(fig)
+
+    labels = [
+        artist.get_text() for artist in get_debug_artists(fig)
+        if isinstance(artist, Text)
+    ]
+    assert labels == ["0", "1", "2", "3", "0", "1", "2"]
+
+    plt.close(fig)
+
+
+def test_save_panel_debug_toggle(tmp_path: Path) -> None:
+    """Test that debug gridlines can be toggled at save time."""
+    mpb.reset_config()
+    mpb.configure({"output": {"format": "png", "dpi": 100}})
+
+    fig, _ = mpb.create_panel(rows=1, cols=1)
+
+    # debug=True draws the gridlines temporarily, including their axes
+    n_axes = len(fig.axes)
+    mpb.save_panel(fig, str(tmp_path / "with_grid"), debug=True)
+    assert get_debug_artists(fig) == []
+    assert len(fig.axes) == n_axes
+
+    # debug=False hides existing gridlines and restores them afterwards
+    draw_gridlines(fig)
+    mpb.save_panel(fig, str(tmp_path / "without_grid"), debug=False)
+    assert all(artist.get_visible() for artist in get_debug_artists(fig))
+
+    with_grid = (tmp_path / "with_grid.png").read_bytes()
+    without_grid = (tmp_path / "without_grid.png").read_bytes()
+    assert with_grid != without_grid
+
+    plt.close(fig)
@@ -0,0 +1,56 @@
+"""Tests for histogram feature."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import plot_histograms
+from mpl_panel_builder.features.histogram import histogram_groups
+
+
+def test_histogram_groups_matches_numpy() -> None:
+    """Test that batched counts match np.histogram per group."""
+    rng = np.random.default_rng(0)
+    groups = [rng.standard_normal(n) for n in [100, 0, 37, 500]]
+    data = np.concatenate(groups)
+    offsets = np.cumsum([0] + [len(g) for g in groups])
+    weights = rng.random(len(data))
+
+    counts, edges = histogram_groups(data, offsets, bins=20)
+    assert counts.shape == (4, 20)
+    for group, group_counts in zip(groups, counts, strict=True):
+        expected, _ = np.histogram(group, bins=edges)
+        np.testing.assert_array_equal(group_counts, expected)
+
+    counts, edges = histogram_groups(
+        data, offsets, bins=20, weights=weights, density=True
+    )
+    expected, _ = np.histogram(
+        groups[2], bins=edges, weights=weights[100:137], density=True
+    )
+    np.testing.assert_allclose(counts[2], expected)
+    np.testing.assert_array_equal(counts[1], 0)
+
+    with pytest.raises(ValueError, match="offsets"):
+        histogram_groups(data, [0, 10])
+
+
+def test_plot_histograms_grid() -> None:
+    """Test one step patch per axes and shared y limits."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel(rows=2, cols=2)
+    rng = np.random.default_rng(1)
+    data = np.concatenate([rng.normal(size=100), rng.normal(size=1000)])
+
+    patches = plot_histograms(axs, data, [0, 100, 1100], bins=10, fill=True)
+
+    assert len(patches) == 2
+    assert len(axs[0][0].patches) == 1
+    assert len(axs[0][1].patches) == 1
+    assert axs[0][0].get_ylim() == axs[0][1].get_ylim()
+    assert axs[0][1].get_ylim()[1] >= np.asarray(patches[1].get_data().values).max()
+
+    with pytest.raises(ValueError, match="axes"):
+        plot_histograms(axs[0][:1], data, [0, 100, 1100])
+    plt.close(fig)
@@ -0,0 +1,64 @@
+"""Tests for image feature."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.colors import LogNorm, Normalize
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import add_colorbar, add_lut_image
+from mpl_panel_builder.features.image import get_lut_colormap, quantize_to_uint8
+
+
+def test_quantize_to_uint8() -> None:
+    """Test quantization of data into lookup table indices."""
+    data = np.array([[0.0, 0.5, 1.0], [-1.0, 2.0, np.nan]])
+    indices = quantize_to_uint8(data, Normalize(vmin=0, vmax=1), chunk_rows=1)
+
+    assert indices.dtype == np.uint8
+    assert indices[0].tolist() == [0, 128, 255]
+    # Out of range values are clipped and NaN values are masked
+    assert indices[1, :2].tolist() == [0, 255]
+    assert np.ma.getmaskarray(indices).tolist() == [
+        [False, False, False], [False, False, True]
+    ]
+
+    # Values a LogNorm cannot map are masked as well
+    indices = quantize_to_uint8(np.array([[-1.0, 1.0, 10.0]]), LogNorm())
+    assert np.ma.getmaskarray(indices).tolist() == [[True, False, False]]
+
+    # A small range on a large offset keeps its resolution
+    offset = np.array([[0.0, 0.5, 1.0]]) + 1e8
+    indices = quantize_to_uint8(offset, Normalize())
+    assert indices.tolist() == [[0, 128, 255]]
+
+    with pytest.raises(ValueError, match="Data must be 2D"):
+        quantize_to_uint8(np.zeros(3), Normalize())
+
+
+def test_get_lut_colormap_is_cached() -> None:
+    """Test that named lookup table colormaps are cached."""
+    lut_cmap = get_lut_colormap("viridis")
+    assert lut_cmap is get_lut_colormap("viridis")
+    assert lut_cmap.N == 256
+
+
+def test_add_lut_image_with_colorbar() -> None:
+    """Test that the returned mappable works with add_colorbar."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    ax = axs[0][0]
+
+    data = np.linspace(2, 4, 20).reshape(4, 5)
+    image, mappable = add_lut_image(ax, data, cmap="magma")
+
+    array = image.get_array()
+    assert array is not None
+    assert array.dtype == np.uint8
+    assert mappable.norm.vmin == pytest.approx(2)
+    assert mappable.norm.vmax == pytest.approx(4)
+
+    cbar = add_colorbar(ax, mappable, "right")
+    assert cbar.mappable is mappable
+
+    plt.close(fig)
@@ -0,0 +1,65 @@
+"""Tests for image pyramid feature."""
+
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import ImagePyramid, show_image_pyramid
+from mpl_panel_builder.helpers import axes_size_px
+
+
+def test_image_pyramid_levels_and_read(tmp_path: Path) -> None:
+    """Test the pooled levels and that reads match the output resolution."""
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 256, size=(1001, 1500, 3), dtype=np.uint8)
+    path = tmp_path / "image.npy"
+    np.save(path, data)
+
+    pyramid = ImagePyramid(path, tile_size=128, min_size=128)
+    assert [level.shape[:2] for level in pyramid.levels[:3]] == [
+        (1001, 1500), (501, 750), (251, 375)
+    ]
+    expected = np.rint(data[:2, :2].astype(np.float32).mean(axis=(0, 1)))
+    np.testing.assert_array_equal(pyramid.levels[1][0, 0], expected)
+
+    pixels, bounds = pyramid.read((0, 1001), (0, 1500), (100, 150))
+    assert pixels.shape == pyramid.levels[3].shape == (126, 188, 3)
+    assert bounds == (0, 1001, 0, 1500)
+
+    pixels, bounds = pyramid.read((100, 200), (300, 400), (100, 100))
+    assert bounds == (0, 256, 256, 512)
+    np.testing.assert_array_equal(pixels, data[:256, 256:512])
+
+
+def test_show_image_pyramid_updates_on_zoom(tmp_path: Path) -> None:
+    """Test that zooming reads a window at a finer level."""
+    mpb.reset_config()
+    mpb.configure({"output": {"dpi": 100}})
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    ax = axs[0][0]
+
+    data = np.lib.format.open_memmap(
+        tmp_path / "image.npy", mode="w+", dtype=np.float32, shape=(4000, 4000)
+    )
+    data[:] = np.arange(4000, dtype=np.float32)
+    data.flush()
+    image = show_image_pyramid(
+        ax, ImagePyramid(data, tile_size=256), pixel_size=0.5
+    )
+    width_px = axes_size_px(ax, 100)[0]
+    full_shape = np.asarray(image.get_array()).shape
+    assert full_shape[1] < 4000
+    assert full_shape[1] >= width_px
+    assert list(image.get_extent()) == [0, 2000, 2000, 0]
+
+    ax.set_xlim(100, 150)
+    ax.set_ylim(150, 100)
+    left, right, bottom, top = image.get_extent()
+    assert left <= 100 and right >= 150
+    assert top <= 100 and bottom >= 150
+    assert np.asarray(image.get_array()).shape[1] <= 2 * 256
+
+    fig.canvas.draw()
+    plt.close(fig)
@@ -0,0 +1,51 @@
+"""Tests for legend feature."""
+
+import matplotlib.pyplot as plt
+import pytest
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import add_shared_legend
+from mpl_panel_builder.helpers.mpl import fig_rel_to_cm
+
+
+def test_add_shared_legend_deduplicates() -> None:
+    """Test that entries are deduplicated by label and style."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel(rows=2, cols=2)
+    for row in axs:
+        for ax in row:
+            ax.plot([0, 1], color="C0", label="data")
+            ax.plot([1, 0], color="C1", label="model")
+            ax.legend()
+    axs[1][1].plot([0, 0], color="C2", label="data")
+
+    legend = add_shared_legend(axs, position="right")
+
+    assert [t.get_text() for t in legend.get_texts()] == ["data", "model", "data"]
+    assert all(ax.get_legend() is None for row in axs for ax in row)
+    assert fig.legends == [legend]
+    plt.close(fig)
+
+
+def test_add_shared_legend_position() -> None:
+    """Test margin centering and cm positions."""
+    mpb.reset_config()
+    mpb.configure({"panel": {"margins": {"right_cm": 2.0}}})
+    fig, axs = mpb.create_panel()
+    axs[0][0].plot([0, 1], label="a")
+
+    legend = add_shared_legend(axs, position="right")
+    fig.canvas.draw()
+    bbox = legend.get_window_extent().transformed(fig.transFigure.inverted())
+    width_cm = mpb.get_config()["panel"]["dimensions"]["width_cm"]
+    center_cm = fig_rel_to_cm(fig, (bbox.x0 + bbox.x1) / 2, "width")
+    assert center_cm == pytest.approx(width_cm - 1.0, abs=0.01)
+
+    legend = add_shared_legend(axs, position=(1.0, 0.5))
+    fig.canvas.draw()
+    bbox = legend.get_window_extent().transformed(fig.transFigure.inverted())
+    assert fig_rel_to_cm(fig, bbox.x0, "width") == pytest.approx(1.0, abs=0.01)
+
+    with pytest.raises(ValueError, match="Invalid position"):
+        add_shared_legend(axs, position="center")  # type: ignore[arg-type]
+    plt.close(fig)
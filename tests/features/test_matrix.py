@@ -0,0 +1,70 @@
+"""Tests for matrix feature."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import annotate_matrix
+
+
+def test_annotate_matrix_stamps_glyphs() -> None:
+    """Test one collection per character, stamped at the cell centers."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel()
+    ax = axs[0][0]
+    values = np.array([[0.5, 1.0, np.nan], [1.0, 0.5, 1.0]])
+    ax.imshow(values)
+
+    collections = annotate_matrix(ax, values, fmt="%.1f", color="w")
+
+    # "0.5" and "1.0" share the glyphs "0" and "."
+    assert len(collections) == 4
+    assert len(ax.texts) == 0
+    counts = sorted(len(np.asarray(c.get_offsets())) for c in collections)
+    assert counts == [2, 3, 5, 5]
+    offsets = {
+        tuple(map(tuple, np.asarray(c.get_offsets()).tolist()))
+        for c in collections
+        if len(np.asarray(c.get_offsets())) == 2
+    }
+    assert offsets == {((0.0, 0.0), (1.0, 1.0))}
+    np.testing.assert_array_equal(collections[0].get_facecolor(), [[1, 1, 1, 1]])
+    fig.canvas.draw()
+
+    with pytest.raises(ValueError, match="2D"):
+        annotate_matrix(ax, np.zeros(3))
+    plt.close(fig)
+
+
+def test_annotate_matrix_many_values() -> None:
+    """Test that distinct values do not add artists, and glyph placement."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel()
+    ax = axs[0][0]
+    values = np.random.default_rng(0).uniform(-1, 1, (20, 20))
+    ax.imshow(values)
+    collections = annotate_matrix(ax, values, fmt="%.2f")
+    # Digits, sign and decimal point
+    assert len(collections) <= 12
+    assert sum(len(np.asarray(c.get_offsets())) for c in collections) == sum(
+        len(f"{value:.2f}") for value in values.ravel()
+    )
+
+    plt.close(fig)
+
+    # Glyphs are stamped left to right from their left edges, with the two
+    # equally wide digits of "10" meeting at the cell center
+    fig, axs = mpb.create_panel()
+    ax = axs[0][0]
+    ax.imshow(np.zeros((1, 1)))
+    one, zero = annotate_matrix(ax, np.array([[10.0]]), fmt="%.0f")
+    fig.canvas.draw()
+    x_one, x_zero = (
+        c.get_offset_transform().transform(np.asarray(c.get_offsets()))[0, 0]
+        for c in (one, zero)
+    )
+    x_center = ax.transData.transform((0, 0))[0]
+    assert x_one < x_center
+    assert x_zero == pytest.approx(x_center)
+    plt.close(fig)
@@ -0,0 +1,63 @@
+"""Tests for raster feature."""
+
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import plot_raster
+
+
+def test_plot_raster_without_decimation() -> None:
+    """Test that every event becomes one tick in its row."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    ax = axs[0][0]
+
+    events = np.array([0.1, 0.5, 0.2, 0.3, 0.9])
+    collection = plot_raster(ax, events, offsets=[0, 2, 2, 5], decimate=False)
+
+    segments = collection.get_segments()
+    assert len(segments) == 5
+    assert [segment[0, 0] for segment in segments] == events.tolist()
+    assert [segment[:, 1].mean() for segment in segments] == [0, 0, 2, 2, 2]
+    assert ax.get_xlim() == (0.1, 0.9)
+    assert ax.get_ylim() == (-0.5, 2.5)
+
+    with pytest.raises(ValueError, match="offsets must be increasing"):
+        plot_raster(ax, events, offsets=[0, 2, 4])
+
+    plt.close(fig)
+
+
+def test_plot_raster_decimates_to_output_pixels(tmp_path: Path) -> None:
+    """Test that events within one output pixel are merged, also from memmaps."""
+    mpb.reset_config()
+    mpb.configure({
+        "panel": {
+            "dimensions": {"width_cm": 2.54 + 1.5 + 0.5},
+            "margins": {"left_cm": 1.5, "right_cm": 0.5},
+        },
+        "output": {"dpi": 100},
+    })
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    ax = axs[0][0]  # 1 inch wide, i.e. 100 pixels at 100 dpi
+
+    # Row 0: 1000 events in [0, 1), row 1: 10 events in separate pixels
+    events = np.concatenate([np.linspace(0, 1, 1000, endpoint=False),
+                             np.linspace(0.005, 0.905, 10)])
+    path = tmp_path / "events.npy"
+    np.save(path, events)
+    events_mmap = np.load(path, mmap_mode="r")
+
+    collection = plot_raster(
+        ax, events_mmap, offsets=[0, 1000, 1010], xlim=(0, 1), chunk_size=333
+    )
+
+    rows = [segment[:, 1].mean() for segment in collection.get_segments()]
+    row_counts = np.bincount(np.rint(rows).astype(int))
+    assert row_counts.tolist() == [100, 10]
+
+    plt.close(fig)
@@ -0,0 +1,74 @@
+"""Tests for series pyramid feature."""
+
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import (
+    MinMaxPyramid,
+    draw_x_scale_bar,
+    plot_pyramid,
+)
+from mpl_panel_builder.helpers import axes_size_px
+
+
+def test_pyramid_builds_and_reuses_sidecar(tmp_path: Path) -> None:
+    """Test that the levels hold block extremes and are built only once."""
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal(100_003)
+    path = tmp_path / "series.npy"
+    np.save(path, data)
+
+    pyramid = MinMaxPyramid(path, factor=4, chunk_size=1000)
+    sidecar = tmp_path / "series.npy.pyramid"
+    assert (sidecar / "pyramid.json").exists()
+    assert len(pyramid.levels) > 1
+    level_1 = np.asarray(pyramid.levels[0])
+    assert level_1[0, 0] == data[:4].min()
+    assert level_1[0, 1] == data[:4].max()
+    assert level_1[-1, 0] == data[100_000:].min()
+    assert np.asarray(pyramid.levels[-1])[:, 0].min() == data.min()
+
+    mtime = (sidecar / "level_1.npy").stat().st_mtime_ns
+    MinMaxPyramid(path, factor=4)
+    assert (sidecar / "level_1.npy").stat().st_mtime_ns == mtime
+
+    positions, values = pyramid.read(0, len(data), n_px=100)
+    assert len(values) <= 2 * 100 + 4
+    assert values.min() == data.min()
+    assert values.max() == data.max()
+    assert positions.min() >= 0
+    assert positions.max() < len(data)
+
+    with pytest.raises(ValueError, match="factor"):
+        MinMaxPyramid(path, factor=1)
+
+
+def test_plot_pyramid_reads_visible_range(tmp_path: Path) -> None:
+    """Test plotting in panel axes, rereading on zoom, and scale bars."""
+    mpb.reset_config()
+    mpb.configure({"output": {"dpi": 100}})
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    ax = axs[0][0]
+
+    data = np.lib.format.open_memmap(
+        tmp_path / "series.npy", mode="w+", dtype=np.float32, shape=(1_000_000,)
+    )
+    data[:] = np.sin(np.arange(1_000_000) / 1000)
+    data.flush()
+    line = plot_pyramid(ax, MinMaxPyramid(data), fs=1000.0)
+    assert ax.get_xlim() == (0.0, 999.999)
+    assert np.asarray(line.get_xdata()).size < 1000
+
+    ax.set_xlim(100, 101)
+    x_visible = np.asarray(line.get_xdata())
+    assert x_visible.min() >= 99.99
+    assert x_visible.max() <= 101.01
+    assert x_visible.size >= 2 * axes_size_px(ax, 100)[0]
+
+    draw_x_scale_bar(ax, 0.5, "0.5 s")
+    fig.canvas.draw()
+    plt.close(fig)
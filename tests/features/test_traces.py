@@ -0,0 +1,57 @@
+"""Tests for traces feature."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import plot_traces
+
+
+def test_plot_traces_dense_stacked() -> None:
+    """Test plotting a 2D array of traces stacked with a spacing."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    ax = axs[0][0]
+
+    data = np.zeros((3, 5))
+    collection = plot_traces(
+        ax, data, x=np.linspace(0, 1, 5), spacing=2.0, colors=["r", "g", "b"],
+        linewidths=[1, 2, 3], alpha=0.5,
+    )
+
+    # All traces live in a single collection instead of one Line2D each
+    assert len(ax.lines) == 0
+    segments = collection.get_segments()
+    assert len(segments) == 3
+    assert [segment[0, 1] for segment in segments] == [0.0, 2.0, 4.0]
+    assert list(collection.get_linewidths()) == [1, 2, 3]
+    assert np.asarray(collection.get_colors())[:, 3].tolist() == [0.5, 0.5, 0.5]
+    # The axes is autoscaled to the stacked traces
+    ylim = ax.get_ylim()
+    assert ylim[0] <= 0.0 and ylim[1] >= 4.0
+
+    plt.close(fig)
+
+
+def test_plot_traces_ragged() -> None:
+    """Test plotting ragged traces given via CSR-style offsets."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    ax = axs[0][0]
+
+    data = np.arange(6, dtype=float)
+    collection = plot_traces(ax, data, offsets=[0, 2, 6])
+
+    segments = collection.get_segments()
+    assert [len(segment) for segment in segments] == [2, 4]
+    # x defaults to the sample index within each trace
+    assert segments[1][:, 0].tolist() == [0, 1, 2, 3]
+    assert segments[1][:, 1].tolist() == [2, 3, 4, 5]
+
+    with pytest.raises(ValueError, match="offsets must be increasing"):
+        plot_traces(ax, data, offsets=[0, 2, 5])
+    with pytest.raises(ValueError, match="Data must be 2D"):
+        plot_traces(ax, data)
+
+    plt.close(fig)
@@ -7,6 +7,7 @@ from matplotlib.axes import Axes
 
 from mpl_panel_builder.helpers.mpl import (
     adjust_axes_size,
+    axes_size_px,
     cm_to_axes_rel,
     cm_to_fig_rel,
     cm_to_inches,
@@ -120,6 +121,17 @@ def test_cm_to_axes_rel() -> None:
     plt.close(fig)
 
 
+def test_axes_size_px() -> None:
+    """Test axes size in output pixels."""
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_axes((0.2, 0.2, 0.6, 0.5))  # 6 x 4 inches
+    
+    assert axes_size_px(ax, 100) == (600, 400)
+    assert axes_size_px(ax, 600) == (3600, 2400)
+    
+    plt.close(fig)
+
+
 def test_get_default_colors() -> None:
     """Test that get_default_colors returns a list of valid color strings."""
     colors = get_default_colors()
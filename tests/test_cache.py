@@ -0,0 +1,118 @@
+"""Tests for cache module."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from matplotlib.figure import Figure
+from PIL import Image
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.cache import fingerprint
+
+calls: list[int] = []
+
+
+def _plot_trace(trace: np.ndarray, color: str = "k") -> Figure:
+    calls.append(1)
+    fig, axs = mpb.create_panel()
+    axs[0][0].plot(trace, color=color)
+    return fig
+
+
+def test_render_cache_hits_and_misses() -> None:
+    """Test that unchanged panels are copied and changed ones re-rendered."""
+    mpb.reset_config()
+    calls.clear()
+    trace = np.arange(10.0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = mpb.RenderCache(Path(tmp_dir) / "cache")
+        first = cache.save_panel(_plot_trace, str(Path(tmp_dir) / "a"), trace)
+        second = cache.save_panel(_plot_trace, str(Path(tmp_dir) / "b"), trace)
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert Path(second["files"][0]).read_bytes() == (
+            Path(first["files"][0]).read_bytes()
+        )
+        assert second["unchanged"] == []
+
+        # Restoring onto a file with the same contents leaves it untouched
+        mtime = os.stat(second["files"][0]).st_mtime_ns
+        third = cache.save_panel(_plot_trace, str(Path(tmp_dir) / "b"), trace)
+        assert third["unchanged"] == third["files"]
+        assert os.stat(third["files"][0]).st_mtime_ns == mtime
+
+        # Data, arguments, config and save formats are part of the key
+        cache.save_panel(_plot_trace, str(Path(tmp_dir) / "c"), trace + 1)
+        cache.save_panel(
+            _plot_trace, str(Path(tmp_dir) / "c"), trace, color="r"
+        )
+        mpb.configure({"style": {"rc_params": {"lines.linewidth": 3}}})
+        cache.save_panel(_plot_trace, str(Path(tmp_dir) / "c"), trace)
+        report = cache.save_panel(
+            _plot_trace, str(Path(tmp_dir) / "c"), trace, formats=["svg", "png"]
+        )
+        assert len(calls) == 5
+        assert report["files"] == [
+            str(Path(tmp_dir) / "c.svg"), str(Path(tmp_dir) / "c.png")
+        ]
+        report = cache.save_panel(
+            _plot_trace, str(Path(tmp_dir) / "d"), trace, formats=["svg", "png"]
+        )
+        assert len(calls) == 5
+        assert all(Path(file).exists() for file in report["files"])
+
+        # Saves differing only in metadata do not share an entry
+        report = cache.save_panel(
+            _plot_trace, str(Path(tmp_dir) / "d"), trace, formats=["png"],
+            metadata={"Title": "Trace"},
+        )
+        assert len(calls) == 6
+        with Image.open(report["files"][0]) as image:
+            assert image.text["Title"] == "Trace"
+
+        # Least recently used entries are evicted to fit the size limit
+        cache.max_size_mb = 0
+        cache.save_panel(_plot_trace, str(Path(tmp_dir) / "e"), trace + 2)
+        assert list((Path(tmp_dir) / "cache").iterdir()) == []
+    mpb.reset_config()
+
+
+def test_render_cache_old_and_invalid_entries() -> None:
+    """Test that old entries load and invalid ones are replaced."""
+    mpb.reset_config()
+    calls.clear()
+    trace = np.arange(10.0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = mpb.RenderCache(Path(tmp_dir) / "cache")
+        cache.save_panel(_plot_trace, str(Path(tmp_dir) / "a"), trace)
+        entry = Path(tmp_dir) / "cache" / cache.key(_plot_trace, [trace])
+
+        # Manifests written before rasterized was reported
+        manifest = json.loads((entry / "manifest.json").read_text())
+        del manifest["rasterized"]
+        (entry / "manifest.json").write_text(json.dumps(manifest))
+        report = cache.save_panel(_plot_trace, str(Path(tmp_dir) / "b"), trace)
+        assert report["rasterized"] == []
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        (entry / "manifest.json").unlink()
+        cache.save_panel(_plot_trace, str(Path(tmp_dir) / "c"), trace)
+        cache.save_panel(_plot_trace, str(Path(tmp_dir) / "d"), trace)
+        assert (cache.hits, cache.misses) == (2, 2)
+        assert len(calls) == 2
+    mpb.reset_config()
+
+
+def test_fingerprint() -> None:
+    """Test that fingerprints depend on values, dtype and shape."""
+    values = np.arange(6)
+    assert fingerprint(values) == fingerprint(np.arange(6))
+    assert fingerprint(values) != fingerprint(values.astype(float))
+    assert fingerprint(values) != fingerprint(values.reshape(2, 3))
+    assert fingerprint(values[::2]) == fingerprint(np.array([0, 2, 4]))
+    assert fingerprint({"a": 1, "b": [values]}) == (
+        fingerprint({"b": [np.arange(6)], "a": 1})
+    )
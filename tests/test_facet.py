@@ -0,0 +1,60 @@
+"""Tests for facet module."""
+
+from typing import Any
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.axes import Axes
+
+import mpl_panel_builder as mpb
+
+
+def test_facet_structured_array() -> None:
+    """Test grid size, cell contents and views for a structured array."""
+    mpb.reset_config()
+    data = np.zeros(
+        6, dtype=[("group", "U1"), ("day", int), ("value", float)]
+    )
+    data["group"] = ["b", "a", "b", "a", "a", "b"]
+    data["day"] = [1, 1, 2, 2, 1, 1]
+    data["value"] = np.arange(6)
+    cells: dict[tuple[Any, Any], list[float]] = {}
+
+    def _plot(ax: Axes, cell: Any, group: Any, day: Any) -> None:
+        assert cell.base is not None
+        cells[(group, day)] = cell["value"].tolist()
+        ax.plot(cell["value"])
+
+    fig, axs = mpb.facet(data, row="group", col="day", plot=_plot)
+
+    assert len(axs) == 2
+    assert len(axs[0]) == 2
+    assert cells == {
+        ("a", 1): [1.0, 4.0],
+        ("a", 2): [3.0],
+        ("b", 1): [0.0, 5.0],
+        ("b", 2): [2.0],
+    }
+    assert len(axs[1][0].lines) == 1
+    plt.close(fig)
+
+
+def test_facet_column_dict() -> None:
+    """Test faceting a dict of columns by a single key."""
+    mpb.reset_config()
+    data = {"cond": np.array([2, 0, 2, 2]), "x": np.arange(4)}
+    cells: dict[Any, list[int]] = {}
+
+    def _plot(ax: Axes, cell: Any, row: Any, cond: Any) -> None:
+        assert row is None
+        cells[cond] = cell["x"].tolist()
+
+    fig, axs = mpb.facet(data, col="cond", plot=_plot)
+
+    assert (len(axs), len(axs[0])) == (1, 2)
+    assert cells == {0: [1], 2: [0, 2, 3]}
+    plt.close(fig)
+
+    with pytest.raises(KeyError, match="missing"):
+        mpb.facet(data, row="missing")
@@ -0,0 +1,226 @@
+"""Tests for output module."""
+
+import io
+import tempfile
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from PIL import Image
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import draw_x_scale_bar, draw_y_scale_bar
+from mpl_panel_builder.helpers import get_overlay_axes
+from mpl_panel_builder.output import (
+    encode_raster,
+    resample_array,
+    resampled_images,
+    slim_svg,
+)
+
+
+def test_resample_array_area() -> None:
+    """Test area averaging, NaN handling and integer rounding."""
+    array = np.arange(16, dtype=float).reshape(4, 4)
+    np.testing.assert_array_equal(
+        resample_array(array, (2, 2)), [[2.5, 4.5], [10.5, 12.5]]
+    )
+
+    array[:2, :2] = np.nan
+    resampled = resample_array(array, (2, 2))
+    assert np.ma.is_masked(resampled)
+    assert bool(np.ma.getmaskarray(resampled)[0, 0])
+    assert resampled[1, 1] == 12.5
+
+    rgb = np.full((4, 4, 3), 7, dtype=np.uint8)
+    rgb[0, 0] = 10
+    resampled = resample_array(rgb, (2, 2))
+    assert resampled.dtype == np.uint8
+    np.testing.assert_array_equal(resampled[0, 0], [8, 8, 8])
+
+
+def test_resampled_images_restores_figure() -> None:
+    """Test that images are reduced to their on-page size and restored."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel()
+    ax = axs[0][0]
+    data = np.random.default_rng(0).standard_normal((2000, 1000))
+    image = ax.imshow(data, aspect="auto")
+    ax.set_xlim(-0.5, 499.5)
+    xlim, ylim = ax.get_xlim(), ax.get_ylim()
+
+    with resampled_images(fig, dpi=100) as reports:
+        width_px = ax.get_window_extent().width * 100 / fig.dpi
+        n_rows, n_cols = np.asarray(image.get_array()).shape
+        assert n_cols == pytest.approx(width_px, abs=2)
+        assert n_rows < 2000
+        assert reports[0]["shape_before"] == (2000, 1000)
+        assert reports[0]["bytes_after"] < reports[0]["bytes_before"]
+
+    np.testing.assert_array_equal(np.asarray(image.get_array()), data)
+    assert ax.get_xlim() == xlim
+    assert ax.get_ylim() == ylim
+
+    with pytest.raises(ValueError, match="Invalid method"), resampled_images(
+        fig, dpi=100, method="bicubic"
+    ):
+        pass
+    plt.close(fig)
+
+
+def test_save_panel_resample_images() -> None:
+    """Test that save_panel reports the resampled images."""
+    mpb.reset_config()
+    mpb.configure({"output": {"format": "pdf", "resample_images": "area"}})
+    fig, axs = mpb.create_panel()
+    axs[0][0].imshow(np.zeros((3000, 3000)), interpolation="none")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report = mpb.save_panel(fig, str(Path(tmp_dir) / "panel"))
+        assert report["files"] == [str(Path(tmp_dir) / "panel.pdf")]
+        assert len(report["images"]) == 1
+        assert report["images"][0]["shape_after"][0] < 3000
+
+    plt.close(fig)
+
+
+def test_save_panel_rasterize_threshold() -> None:
+    """Test that only dense artists are rasterized, and only while saving."""
+    mpb.reset_config()
+    mpb.configure({"output": {"dpi": 150, "rasterize_threshold": 10_000}})
+    fig, axs = mpb.create_panel()
+    ax = axs[0][0]
+    rng = np.random.default_rng(0)
+    dense = ax.scatter(rng.random(50_000), rng.random(50_000), s=1)
+    sparse = ax.plot([0, 1], [0, 1])[0]
+    ax.set_title("Title")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report = mpb.save_panel(
+            fig, str(Path(tmp_dir) / "panel"), formats=["pdf", "png"]
+        )
+        assert [entry["elements"] for entry in report["rasterized"]] == [50_000]
+        assert report["rasterized"][0]["pixels"] > 0
+        rasterized_size = Path(tmp_dir, "panel.pdf").stat().st_size
+        assert b"/Subtype /Image" in Path(tmp_dir, "panel.pdf").read_bytes()
+
+        mpb.configure({"output": {"rasterize_threshold": 0}})
+        report = mpb.save_panel(fig, str(Path(tmp_dir) / "vector.pdf"))
+        assert report["rasterized"] == []
+        assert Path(tmp_dir, "vector.pdf").stat().st_size > 5 * rasterized_size
+
+    assert not dense.get_rasterized()
+    assert not sparse.get_rasterized()
+    plt.close(fig)
+    mpb.reset_config()
+
+
+def test_slim_svg() -> None:
+    """Test coordinate rounding and merging of near-identical definitions."""
+    svg = (
+        b'<defs>\n <path id="m1" d="M 0.1234 -0.0001 L 1 2"/>\n'
+        b' <path id="m2" d="M 0.1231 0.0004 L 1 2"/>\n</defs>\n'
+        b'<use xlink:href="#m2" x="10.123456" y="3.5" '
+        b'style="stroke-width: 0.123456"/>\n'
+    )
+    slimmed = slim_svg(svg, 2)
+    assert b'd="M 0.12 0 L 1 2"' in slimmed
+    assert b'id="m2"' not in slimmed
+    assert b'xlink:href="#m1" x="10.12" y="3.5"' in slimmed
+    assert b"stroke-width: 0.123456" in slimmed
+
+
+def test_save_panel_vector_tolerance() -> None:
+    """Test that scale bar lines are merged in vector output only."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel(rows=1, cols=2)
+    for ax in axs[0]:
+        ax.plot([0, 1], [0, 1])
+        draw_x_scale_bar(ax, 0.5, "0.5 s")
+        draw_y_scale_bar(ax, 0.5, "0.5 mV")
+    lines = get_overlay_axes(fig).get_lines()
+    assert len(lines) == 4
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        mpb.save_panel(fig, str(Path(tmp_dir) / "full"), formats=["svg"])
+        mpb.configure({"output": {"vector_tolerance_mm": 0.01}})
+        mpb.save_panel(fig, str(Path(tmp_dir) / "slim"), formats=["svg"])
+        full = Path(tmp_dir, "full.svg").read_bytes()
+        slim = Path(tmp_dir, "slim.svg").read_bytes()
+    assert full.count(b'<g id="line2d_') - slim.count(b'<g id="line2d_') == 3
+    assert full.count(b'<g id="text_') == slim.count(b'<g id="text_')
+    assert len(slim) < len(full)
+
+    assert all(line.get_visible() for line in lines)
+    assert len(np.asarray(lines[0].get_xdata())) == 2
+    plt.close(fig)
+    mpb.reset_config()
+
+
+def test_encode_raster_options() -> None:
+    """Test exact palette PNGs and the RGB path."""
+    rgba = np.zeros((20, 30, 4), dtype=np.uint8)
+    rgba[..., 3] = 255
+    rgba[5:10, :, 0] = 200
+    rgba[12:, 10:, 3] = 0
+
+    buffer = io.BytesIO()
+    encode_raster(rgba, buffer, "png", 300, palette_max_colors=16)
+    image = Image.open(buffer)
+    assert image.mode == "P"
+    np.testing.assert_array_equal(np.asarray(image.convert("RGBA")), rgba)
+
+    buffer = io.BytesIO()
+    encode_raster(rgba, buffer, "png", 300, palette_max_colors=2)
+    assert Image.open(buffer).mode == "RGBA"
+
+    buffer = io.BytesIO()
+    encode_raster(
+        rgba, buffer, "png", 300, alpha=False, palette_max_colors=0,
+        compress_level=9,
+    )
+    image = Image.open(buffer)
+    assert image.mode == "RGB"
+    assert image.getpixel((20, 15)) == (255, 255, 255)
+
+    buffer = io.BytesIO()
+    encode_raster(rgba, buffer, "webp", 300, webp_lossless=True)
+    np.testing.assert_array_equal(
+        np.asarray(Image.open(buffer).convert("RGBA"))[..., 3], rgba[..., 3]
+    )
+
+
+def test_encode_raster_quantized_lines() -> None:
+    """Test that antialiased line panels can be quantized to a palette."""
+    mpb.reset_config()
+    rng = np.random.default_rng(0)
+    fig, axs = mpb.create_panel()
+    for _ in range(5):
+        axs[0][0].plot(np.cumsum(rng.standard_normal(300)))
+    axs[0][0].set_xlabel("Time (s)")
+    rgba = mpb.render_panel_rgba(fig, dpi=300)
+    plt.close(fig)
+    assert Image.fromarray(rgba).getcolors(256) is None
+
+    palette, truecolor = io.BytesIO(), io.BytesIO()
+    encode_raster(rgba, palette, "png", 300, palette_max_error=16)
+    encode_raster(rgba, truecolor, "png", 300, palette_max_colors=0)
+    with Image.open(palette) as image:
+        assert image.mode == "P"
+        error = np.abs(np.asarray(image.convert("RGBA"), dtype=int) - rgba)
+    assert error.max() <= 16
+    assert len(palette.getvalue()) < len(truecolor.getvalue()) / 2
+
+    # Too coarse a palette for the allowed error keeps all colors, and by
+    # default only exact palettes are used
+    buffer = io.BytesIO()
+    encode_raster(
+        rgba, buffer, "png", 300, palette_max_colors=4, palette_max_error=16
+    )
+    with Image.open(buffer) as image:
+        assert image.mode == "RGBA"
+    buffer = io.BytesIO()
+    encode_raster(rgba, buffer, "png", 300)
+    with Image.open(buffer) as image:
+        assert image.mode == "RGBA"
@@ -1,10 +1,16 @@
 """Tests for panel module."""
 
+import io
+import os
 import tempfile
 from pathlib import Path
+from typing import Any
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pytest
+from matplotlib.typing import RcKeyType
+from PIL import Image
 
 import mpl_panel_builder as mpb
 
@@ -44,6 +50,223 @@ def test_save_panel() -> None:
         assert saved_file.exists()
 
 
+def test_save_panel_multiple_formats() -> None:
+    """Test saving several formats and profiles in one call."""
+    mpb.reset_config()
+    mpb.configure({
+        "output": {
+            "dpi": 100,
+            "profiles": {"web": [{"format": "png", "dpi": 50}]},
+        }
+    })
+    fig, axs = mpb.create_panel(rows=1, cols=1)
+    axs[0][0].plot([1, 2, 3], [1, 2, 3])
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = str(Path(tmp_dir) / "test_panel.pdf")
+        report = mpb.save_panel(
+            fig, filepath, formats=["pdf", "png", ("jpg", 50), "svg"]
+        )
+        
+        expected = [
+            str(Path(tmp_dir) / f"test_panel.{fmt}") 
+            for fmt in ["pdf", "png", "jpg", "svg"]
+        ]
+        assert report["files"] == expected
+        assert sorted(report["timings"]) == sorted(expected)
+        assert all(Path(file).exists() for file in expected)
+        with Image.open(expected[1]) as png, Image.open(expected[2]) as jpg:
+            assert png.size == (2 * jpg.size[0], 2 * jpg.size[1])
+        
+        report = mpb.save_panel(fig, str(Path(tmp_dir) / "web"), profile="web")
+        assert report["files"] == [str(Path(tmp_dir) / "web.png")]
+        
+        with pytest.raises(ValueError, match="Unknown output profile"):
+            mpb.save_panel(fig, filepath, profile="print")
+    plt.close(fig)
+
+
+def test_save_panel_deterministic() -> None:
+    """Test that deterministic output leaves unchanged files untouched."""
+    mpb.reset_config()
+    mpb.configure({"output": {"deterministic": True}})
+    fig, axs = mpb.create_panel()
+    axs[0][0].plot([0, 1], [1, 0])
+    axs[0][0].set_clip_on(True)
+    formats = ["pdf", "svg", "eps", "png"]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = str(Path(tmp_dir) / "panel")
+        report = mpb.save_panel(fig, filepath, formats=formats)
+        assert report["unchanged"] == []
+        contents = {file: Path(file).read_bytes() for file in report["files"]}
+        assert b"CreationDate" not in contents[filepath + ".pdf"]
+        assert b"<dc:date>" not in contents[filepath + ".svg"]
+        mtimes = {file: os.stat(file).st_mtime_ns for file in report["files"]}
+
+        report = mpb.save_panel(fig, filepath, formats=formats)
+        assert report["unchanged"] == report["files"]
+        for file in report["files"]:
+            assert Path(file).read_bytes() == contents[file]
+            assert os.stat(file).st_mtime_ns == mtimes[file]
+
+        axs[0][0].plot([0, 1], [0, 1])
+        report = mpb.save_panel(fig, filepath, formats=formats)
+        assert report["unchanged"] == []
+    plt.close(fig)
+    mpb.reset_config()
+
+
+def test_render_panel() -> None:
+    """Test rendering to bytes, file objects and RGBA arrays."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel()
+    axs[0][0].plot([0, 1], [1, 0])
+
+    assert mpb.render_panel(fig, "png", dpi=50).startswith(b"\x89PNG")
+    assert b"<svg" in mpb.render_panel(fig, "svg")
+    assert mpb.render_panel(fig).startswith(b"%PDF")
+
+    buffer = io.BytesIO()
+    report = mpb.save_panel(fig, buffer, formats=[("png", 50)])
+    with Image.open(io.BytesIO(buffer.getvalue())) as image:
+        assert image.size == (
+            round(fig.get_figwidth() * 50), round(fig.get_figheight() * 50)
+        )
+    assert report["files"] == ["<file object>"]
+    with pytest.raises(ValueError, match="Only one format"):
+        mpb.save_panel(fig, io.BytesIO(), formats=["png", "pdf"])
+
+    rgba = mpb.render_panel_rgba(fig, dpi=50)
+    assert rgba.shape == (
+        round(fig.get_figheight() * 50), round(fig.get_figwidth() * 50), 4
+    )
+    assert not rgba.flags.owndata
+    assert fig.dpi != 50
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("rc", [
+    {"savefig.transparent": True},
+    {"savefig.facecolor": "black"},
+    {"savefig.bbox": "tight", "savefig.pad_inches": 0.2},
+])
+def test_save_panel_raster_savefig_rc(rc: dict[RcKeyType, Any]) -> None:
+    """Test that raster formats honour the savefig rcParams like savefig."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel()
+    axs[0][0].plot([0, 1], [1, 0])
+    fig.text(1.1, 0.5, "Outside")
+    with plt.rc_context(rc):
+        expected = io.BytesIO()
+        fig.savefig(expected, format="png", dpi=50)
+        actual = mpb.render_panel(fig, "png", dpi=50)
+    with (
+        Image.open(expected) as expected_image,
+        Image.open(io.BytesIO(actual)) as actual_image,
+    ):
+        assert actual_image.size == expected_image.size
+        assert actual_image.convert("RGBA").getpixel((0, 0)) == (
+            expected_image.convert("RGBA").getpixel((0, 0))
+        )
+        assert "Software" in actual_image.info
+    plt.close(fig)
+
+
+def test_save_panel_png_matches_savefig() -> None:
+    """Test that default PNGs have exactly the pixels of savefig."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel()
+    axs[0][0].plot([0, 1], [1, 0])
+    axs[0][0].plot([0, 1], [0, 1])
+    expected = io.BytesIO()
+    fig.savefig(expected, format="png", dpi=300)
+    actual = mpb.render_panel(fig, "png", dpi=300)
+    plt.close(fig)
+    with (
+        Image.open(expected) as expected_image,
+        Image.open(io.BytesIO(actual)) as actual_image,
+    ):
+        np.testing.assert_array_equal(
+            np.asarray(actual_image.convert("RGBA")),
+            np.asarray(expected_image.convert("RGBA")),
+        )
+
+
+def test_panel_writer() -> None:
+    """Test background saving, closing of figures and error reporting."""
+    mpb.reset_config()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with mpb.PanelWriter(max_pending=2) as writer:
+            figs = [mpb.create_panel()[0] for _ in range(3)]
+            futures = [
+                writer.submit(fig, str(Path(tmp_dir) / f"panel_{i}"))
+                for i, fig in enumerate(figs)
+            ]
+            writer.flush()
+            for i, (fig, future) in enumerate(zip(figs, futures, strict=True)):
+                assert future.result()["files"] == [
+                    str(Path(tmp_dir) / f"panel_{i}.pdf")
+                ]
+                assert not plt.fignum_exists(fig.number)
+
+            # Metadata is passed on to save_panel
+            fig, _ = mpb.create_panel()
+            future = writer.submit(
+                fig, str(Path(tmp_dir) / "titled"), formats=["png"],
+                metadata={"Title": "Panel"},
+            )
+            writer.flush()
+            with Image.open(future.result()["files"][0]) as image:
+                assert image.text["Title"] == "Panel"
+
+            # A file blocks the output directory, as errors in save_panel
+            blocker = Path(tmp_dir) / "blocker"
+            blocker.write_text("")
+            fig, _ = mpb.create_panel()
+            future = writer.submit(fig, str(blocker / "panel.pdf"))
+            with pytest.raises(OSError, match="Could not create directory"):
+                writer.flush()
+            assert isinstance(future.exception(), OSError)
+            assert not plt.fignum_exists(fig.number)
+
+        with pytest.raises(ValueError, match="closed writer"):
+            writer.submit(fig, str(Path(tmp_dir) / "panel"))
+
+
+def test_panel_writer_isolation() -> None:
+    """Test that background saves use the submitted configuration only."""
+    mpb.reset_config()
+    mpb.configure({"output": {
+        "format": "png", "dpi": 50,
+        "raster": {"alpha": False, "palette_max_colors": 0},
+        "deterministic": True, "vector_tolerance_mm": 0.1,
+    }})
+    threshold = plt.rcParams["path.simplify_threshold"]
+    with tempfile.TemporaryDirectory() as tmp_dir, plt.rc_context():
+        with mpb.PanelWriter(max_pending=4) as writer:
+            futures: list[Any] = []
+            for i in range(4):
+                fig, axs = mpb.create_panel()
+                axs[0][0].plot(range(200), marker="o")
+                futures.append(writer.submit(
+                    fig, str(Path(tmp_dir) / f"panel_{i}"),
+                    formats=["png", "svg"],
+                ))
+                assert not plt.fignum_exists(fig.number)
+            mpb.reset_config()
+            plt.rcParams["lines.linewidth"] = 7
+        assert plt.rcParams["lines.linewidth"] == 7
+        assert plt.rcParams["path.simplify_threshold"] == threshold
+        for future in futures:
+            png, svg = future.result()["files"]
+            with Image.open(png) as image:
+                assert image.mode == "RGB"
+            assert Path(svg).read_bytes() == Path(
+                futures[0].result()["files"][1]
+            ).read_bytes()
+    mpb.reset_config()
+
+
 def test_set_rc_style() -> None:
     """Test style RC parameters setting."""
     mpb.reset_config()
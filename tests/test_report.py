@@ -0,0 +1,95 @@
+"""Tests for report module."""
+
+import re
+import tempfile
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.features import annotate_matrix
+
+
+def test_panel_report_writes_pages() -> None:
+    """Test that each added figure becomes a page and is closed."""
+    mpb.reset_config()
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "report.pdf"
+        with mpb.PanelReport(path) as report:
+            for _ in range(3):
+                fig, axs = mpb.create_panel()
+                axs[0][0].imshow(rng.random((5, 5)))
+                annotate_matrix(axs[0][0], rng.random((5, 5)).round(1))
+                report.add(fig)
+                assert not plt.fignum_exists(fig.number)
+            # Images are written with their page, not when the file closes
+            assert path.read_bytes().count(b"/Subtype /Image") == 3
+        assert report.n_pages == 3
+
+        data = path.read_bytes()
+        assert len(re.findall(rb"/Type /Page\b", data)) == 3
+        # All images and templates are listed as resources of the pages
+        xobject_id = re.search(rb"/XObject (\d+) 0 R", data)
+        assert xobject_id is not None
+        xobjects = re.search(
+            rb"\n" + xobject_id.group(1) + rb" 0 obj\n(.*?)endobj", data, re.S
+        )
+        assert xobjects is not None
+        assert len(re.findall(rb"/I\d+ ", xobjects.group(1))) == 3
+        assert re.search(rb"/P\d+ ", xobjects.group(1))
+
+        with pytest.raises(ValueError, match="closed"):
+            report.add(plt.figure())
+        plt.close("all")
+
+
+def test_panel_report_invalid_resample_method() -> None:
+    """Test that an invalid resampling method is rejected before saving."""
+    mpb.reset_config()
+    mpb.configure({"output": {"resample_images": "bilinear"}})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with mpb.PanelReport(Path(tmp_dir) / "report.pdf") as report:
+            fig, _ = mpb.create_panel()
+            with pytest.raises(
+                ValueError, match=r"Invalid output\.resample_images: 'bilinear'"
+            ):
+                report.add(fig)
+            plt.close(fig)
+        assert report.n_pages == 0
+    mpb.reset_config()
+
+
+def test_panel_report_fallback_and_deterministic(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test plain PdfPages for unknown versions and reproducible reports."""
+    mpb.reset_config()
+    mpb.configure({"output": {"deterministic": True}})
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    rng = np.random.default_rng(0)
+    images = [rng.random((5, 5)) for _ in range(2)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        contents: list[bytes] = []
+        for streaming in [True, False]:
+            if not streaming:
+                monkeypatch.setattr(
+                    "mpl_panel_builder.report._STREAMING_MATPLOTLIB_VERSIONS",
+                    (),
+                )
+            for run in range(2):
+                path = Path(tmp_dir) / f"report_{streaming}_{run}.pdf"
+                with mpb.PanelReport(path) as report:
+                    for image in images:
+                        fig, axs = mpb.create_panel()
+                        axs[0][0].imshow(image)
+                        report.add(fig)
+                contents.append(path.read_bytes())
+    streamed, streamed_again, plain, plain_again = contents
+    assert streamed == streamed_again
+    assert plain == plain_again
+    assert b"CreationDate" not in streamed
+    assert len(re.findall(rb"/Type /Page\b", plain)) == 2
+    mpb.reset_config()
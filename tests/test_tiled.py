@@ -0,0 +1,123 @@
+"""Tests for tiled module."""
+
+import io
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.typing import RcKeyType
+from PIL import Image
+
+import mpl_panel_builder as mpb
+from mpl_panel_builder.output import render_rgba
+from mpl_panel_builder.tiled import save_tiled
+
+
+def test_save_tiled_png_stream() -> None:
+    """Test that the strips of a PNG form one zlib stream with its checksum."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel()
+    axs[0][0].plot([0, 1], [0, 1])
+    buffer = io.BytesIO()
+    save_tiled(fig, buffer, "png", 100, tile_height_px=10, workers=1)
+    plt.close(fig)
+
+    data = buffer.getvalue()
+    position, stream = 8, b""
+    while position < len(data):
+        (length,) = struct.unpack(">I", data[position:position + 4])
+        if data[position + 4:position + 8] == b"IDAT":
+            stream += data[position + 8:position + 8 + length]
+        position += length + 12
+    # Decompression verifies the Adler-32 checksum of the joined strips
+    rows = zlib.decompress(stream)
+    image = Image.open(buffer)
+    assert len(rows) == image.height * (1 + 4 * image.width)
+
+
+@pytest.mark.parametrize("fmt", ["png", "tiff"])
+def test_save_tiled_matches_full_render(fmt: str) -> None:
+    """Test that strips add up to the full render, images included."""
+    mpb.reset_config()
+    rng = np.random.default_rng(0)
+    fig, axs = mpb.create_panel(rows=2, cols=1)
+    axs[0][0].imshow(rng.random((50, 30)))
+    axs[1][0].plot([0, 1], [0, 1], marker="o")
+    full = render_rgba(fig, 150)
+
+    buffer = io.BytesIO()
+    save_tiled(fig, buffer, fmt, 150, tile_height_px=70, workers=1)
+    image = Image.open(buffer)
+    assert image.size == (full.shape[1], full.shape[0])
+    assert round(image.info["dpi"][0]) == 150
+    difference = np.abs(np.asarray(image).astype(int) - full)
+    assert difference.max() <= 16
+
+    buffer = io.BytesIO()
+    save_tiled(fig, buffer, fmt, 150, workers=1, alpha=False)
+    assert Image.open(buffer).mode == "RGB"
+    plt.close(fig)
+
+
+def test_save_panel_tiled() -> None:
+    """Test that save_panel tiles PNG and TIFF and renders other formats."""
+    mpb.reset_config()
+    mpb.configure({"output": {"tile_height_px": 100, "tile_workers": 1}})
+    fig, axs = mpb.create_panel()
+    axs[0][0].plot([0, 1], [0, 1])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report = mpb.save_panel(
+            fig, str(Path(tmp_dir) / "panel"), formats=["png", "tif", "jpg"]
+        )
+        sizes: set[tuple[int, int]] = set()
+        for file in report["files"]:
+            with Image.open(file) as image:
+                sizes.add(image.size)
+        assert len(sizes) == 1
+
+        mpb.configure({"output": {"deterministic": True}})
+        report = mpb.save_panel(
+            fig, str(Path(tmp_dir) / "panel"), formats=["png"]
+        )
+        assert report["unchanged"] == [str(Path(tmp_dir) / "panel.png")]
+    plt.close(fig)
+    mpb.reset_config()
+
+
+@pytest.mark.parametrize("rc", [
+    {"savefig.facecolor": "yellow", "savefig.edgecolor": "red"},
+    {"savefig.transparent": True},
+])
+def test_save_panel_tiled_savefig_rc(rc: dict[RcKeyType, Any]) -> None:
+    """Test that tiled PNGs match untiled ones under the savefig rcParams."""
+    mpb.reset_config()
+    fig, axs = mpb.create_panel()
+    axs[0][0].plot([0, 1], [0, 1])
+    metadata = {"Title": "Panel", "Author": "Jürgen"}
+    with tempfile.TemporaryDirectory() as tmp_dir, plt.rc_context(rc):
+        full = mpb.save_panel(
+            fig, str(Path(tmp_dir) / "full"), formats=[("png", 100)],
+            metadata=metadata,
+        )
+        mpb.configure({"output": {"tile_height_px": 40, "tile_workers": 1}})
+        tiled = mpb.save_panel(
+            fig, str(Path(tmp_dir) / "tiled"), formats=[("png", 100)],
+            metadata=metadata,
+        )
+        with (
+            Image.open(full["files"][0]) as full_image,
+            Image.open(tiled["files"][0]) as tiled_image,
+        ):
+            assert tiled_image.info == full_image.info
+            difference = np.abs(
+                np.asarray(tiled_image.convert("RGBA"), dtype=int)
+                - np.asarray(full_image.convert("RGBA"))
+            )
+    assert difference.max() <= 16
+    plt.close(fig)
+    mpb.reset_config()